@@ -1,17 +1,43 @@
 import os
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, g, current_app, has_app_context, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_swagger_ui import get_swaggerui_blueprint
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.security import safe_join
 from dotenv import load_dotenv
 
 # Ortam değişkenlerini yükle
 load_dotenv()
 
+class RoutingSession(Session):
+    """
+    Sorguları etkin veritabanına yönlendiren oturum
+    
+    Okuma kopyasına yönlendirilen isteklerde sorgular kopyaya gider (bkz. app/services/replica.py);
+    geri yüklemeyle birincil veritabanı değiştirildiyse varsayılan motor yerine yenisi kullanılır
+    (bkz. app/services/database_switch.py).
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        # Yazmalar (flush) her zaman birincil veritabanına gider
+        if bind is None and not self._flushing and has_request_context() and g.get('db_replica'):
+            engine = db.engines.get('replica')
+            if engine is not None:
+                return engine
+        
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if has_app_context():
+            switched = current_app.extensions.get('database_switch', {}).get('engine')
+            if switched is not None and engine is db.engines.get(None):
+                return switched
+        return engine
+
 # Veritabanı nesnesi
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 # Migrasyon nesnesi
 migrate = Migrate()
 # JWT nesnesi
@@ -21,6 +47,10 @@ def create_app(test_config=None):
     # Flask uygulaması oluştur
     app = Flask(__name__, static_folder='static')
     
+    # Yüklenen dosyaları geçici dosya yerine sınırlı bellek tamponunda tut
+    from app.services.photo_upload import UploadRequest
+    app.request_class = UploadRequest
+    
     # İzin verilen originler listesi - frontend uygulamanızın URL'sini buraya ekleyin
     allowed_origins = [
         'http://localhost:3000',  # Yerel geliştirme için
@@ -38,11 +68,6 @@ def create_app(test_config=None):
                  "origins": allowed_origins,
                  "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
                  "allow_headers": ["Content-Type", "Authorization", "Access-Control-Allow-Credentials"]
-             },
-             r"/api/admin/public-upgrade-db": {
-                 "origins": "*",  # Bu endpoint için tüm originlere izin ver
-                 "methods": ["GET", "POST", "OPTIONS"],
-                 "allow_headers": ["Content-Type", "Authorization", "Access-Control-Allow-Credentials"]
              }
          }, 
          supports_credentials=True)
@@ -57,40 +82,103 @@ def create_app(test_config=None):
             response.headers.set('Access-Control-Allow-Credentials', 'true')
             response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization, Access-Control-Allow-Credentials')
             response.headers.set('Access-Control-Allow-Methods', 'GET, PUT, POST, DELETE, OPTIONS')
-        # Eğer /api/admin/public-upgrade-db endpoint'i için istek geliyorsa, tüm originlere izin ver
-        elif request.path.startswith('/api/admin/public-upgrade-db'):
-            response.headers.set('Access-Control-Allow-Origin', '*')
-            response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization, Access-Control-Allow-Credentials')
-            response.headers.set('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         # Diğer durumlarda, varsayılan olarak ilk izin verilen origin'i kullan
         elif allowed_origins:
             response.headers.set('Access-Control-Allow-Origin', allowed_origins[0])
             response.headers.set('Access-Control-Allow-Credentials', 'true')
             response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization, Access-Control-Allow-Credentials')
             response.headers.set('Access-Control-Allow-Methods', 'GET, PUT, POST, DELETE, OPTIONS')
-            
+        
         return response
     
-    # Yapılandırma
-    if test_config is None:
-        # Varsayılan yapılandırma
-        app.config.from_mapping(
-            SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
-            SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URI', 'sqlite:///face_attendance.db'),
-            SQLALCHEMY_TRACK_MODIFICATIONS=False,
-            JWT_SECRET_KEY=os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key'),
-            JWT_ACCESS_TOKEN_EXPIRES=3600,  # 1 saat
-            JWT_REFRESH_TOKEN_EXPIRES=86400,  # 1 gün
-            UPLOAD_FOLDER=os.path.join(app.static_folder, 'faces')
-        )
-    else:
-        # Test yapılandırması
+    # Yapılandırma: ortam sınıfı (FLASK_CONFIG: development, testing, production; verilmemişse
+    # FLASK_DEBUG/FLASK_ENV'e göre geliştirme, aksi halde üretim), üzerine test ayarları
+    from app.config import config, config_name, engine_options, INSTANCE_PATHS
+    app.config.from_object(config[config_name()])
+    
+    if test_config is not None:
         app.config.from_mapping(test_config)
     
-    # Veritabanı başlatma
+    # Verilmemiş yollar instance klasörü altında tutulur
+    for key, name in INSTANCE_PATHS.items():
+        if not app.config.get(key):
+            app.config[key] = os.path.join(app.instance_path, name)
+    
+    # X-Accel-Redirect/X-Sendfile ile teslim edilen klasörler ve iç yolları
+    app.config.setdefault('FILE_DELIVERY_ACCEL_LOCATIONS', {
+        app.static_folder: '/_protected/static/',
+        os.path.join(app.root_path, 'backups'): '/_protected/backups/',
+        app.config['STORAGE_FOLDER']: '/_protected/storage/',
+        app.config['RESTORED_FACES_FOLDER']: '/_protected/restored_faces/'
+    })
+    
+    # İstek zamanlaması ve yavaş sorgu kaydı
+    from app.services.request_timing import init_request_timing
+    init_request_timing(app)
+    
+    # Prometheus metrikleri (/metrics); gunicorn altında PROMETHEUS_MULTIPROC_DIR ayarlanmalı
+    from app.services.metrics import init_metrics
+    init_metrics(app)
+    
+    # Admin isteklerinde istek bazlı profil
+    from app.services.profiler import init_profiling
+    init_profiling(app)
+    
+    # Yüz tanıma endpoint'lerinin eşzamanlılık sınırı ve süre bütçesi
+    from app.services.admission import init_admission
+    init_admission(app)
+    
+    # Yoğunlukta duygu analizini arka plana erteleme
+    from app.services.load_shedding import init_load_shedding
+    init_load_shedding(app)
+    
+    # Boyut sınırını aşan yüklemeleri gövde okunmadan reddet
+    @app.before_request
+    def reject_large_uploads():
+        max_length = app.config.get('MAX_CONTENT_LENGTH')
+        if max_length and request.content_length and request.content_length > max_length:
+            return jsonify(error=f"Dosya boyutu çok büyük. En fazla {max_length // 1024} KB yüklenebilir."), 413
+    
+    @app.errorhandler(RequestEntityTooLarge)
+    def request_entity_too_large(error):
+        return jsonify(error="Dosya boyutu çok büyük."), 413
+    
+    # Veritabanı başlatma (geri yüklenmiş bir veritabanı etkinse onunla)
+    from app.services.database_switch import DatabaseSwitch
+    pointer = DatabaseSwitch.read_pointer(app.config['DATABASE_POINTER_PATH'])
+    if pointer is not None:
+        app.config['SQLALCHEMY_DATABASE_URI'] = pointer['url']
+    
+    # Bağlantı havuzu ayarları (DB_POOL_*)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    
+    # Okuma kopyası (DATABASE_REPLICA_URL): salt okunur istekler gecikme denetimiyle kopyaya yönlendirilir
+    if app.config.get('DATABASE_REPLICA_URL'):
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault('replica', dict(
+            engine_options(app.config, app.config['DATABASE_REPLICA_URL']),
+            url=app.config['DATABASE_REPLICA_URL']
+        ))
+        app.config['SQLALCHEMY_BINDS'] = binds
+    
+    from app.services.replica import init_replica
+    init_replica(app, db)
+    
+    if pointer is not None and 'replica' in app.extensions:
+        app.extensions['replica'].disable("geri yüklenen veritabanı etkin")
+    
+    # SQLite bağlantı profili (SQLITE_*): WAL, PRAGMA'lar ve BEGIN IMMEDIATE ile sıralı yazma
+    from app.services.sqlite_profile import init_sqlite
+    init_sqlite(app)
+    
     db.init_app(app)
     migrate.init_app(app, db)
     
+    # Başka bir işçi geri yükleme yaptıysa bu işçi de yeni veritabanına geçer
+    @app.before_request
+    def sync_database():
+        DatabaseSwitch.sync(app)
+    
     # JWT başlatma
     jwt.init_app(app)
     
@@ -144,16 +232,40 @@ def create_app(test_config=None):
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
     # Modelleri içe aktar
-    from app.models import user, teacher, student, course, attendance
+    from app.models import user, teacher, student, course, attendance, system_state
     
     # Blueprint'leri kaydet
-    from app.routes import auth, teachers, students, courses, attendance, reports
+    from app.routes import auth, teachers, students, courses, attendance, reports, photos, admin
     app.register_blueprint(auth.bp)
     app.register_blueprint(teachers.bp)
     app.register_blueprint(students.bp)
     app.register_blueprint(courses.bp)
     app.register_blueprint(attendance.bp)
     app.register_blueprint(reports.bp)
+    app.register_blueprint(photos.bp)
+    app.register_blueprint(admin.bp)
+    
+    # CLI komutları
+    from app.cli import seed_synthetic_command, warm_up_command, backfill_emotions_command, prune_idempotency_command
+    app.cli.add_command(seed_synthetic_command)
+    app.cli.add_command(warm_up_command)
+    app.cli.add_command(backfill_emotions_command)
+    app.cli.add_command(prune_idempotency_command)
+    
+    # Statik dosyaları (ör. /static/faces/*) teslim katmanı üzerinden sun
+    from app.services.file_delivery import send_local_file
+    
+    def static_file(filename):
+        # Eski yüz fotoğrafları (/static/faces/*) geri yüklemeyle etkinleşen klasörden sunulur
+        folder = app.static_folder
+        if filename.startswith('faces/'):
+            folder, filename = DatabaseSwitch.faces_folder(app), filename[len('faces/'):]
+        path = safe_join(folder, filename)
+        if path is None or not os.path.isfile(path):
+            return jsonify(error="Dosya bulunamadı."), 404
+        return send_local_file(path, max_age=app.get_send_file_max_age(filename))
+    
+    app.view_functions['static'] = static_file
     
     @app.route('/')
     def index():
@@ -169,13 +281,10 @@ def create_app(test_config=None):
         # Eğer origin izin verilen listede ise, o origin'i header'a ekle
         if origin and origin in allowed_origins:
             response.headers.set('Access-Control-Allow-Origin', origin)
-        # Eğer /api/admin/public-upgrade-db endpoint'i için istek geliyorsa, tüm originlere izin ver
-        elif path.startswith('api/admin/public-upgrade-db') or request.path.startswith('/api/admin/public-upgrade-db'):
-            response.headers.set('Access-Control-Allow-Origin', '*')
         # Diğer durumlarda, varsayılan olarak ilk izin verilen origin'i kullan
         elif allowed_origins:
             response.headers.set('Access-Control-Allow-Origin', allowed_origins[0])
-            
+        
         response.headers.set('Access-Control-Allow-Credentials', 'true')
         response.headers.set('Access-Control-Allow-Headers', 'Content-Type, Authorization, Access-Control-Allow-Credentials')
         response.headers.set('Access-Control-Allow-Methods', 'GET, PUT, POST, DELETE, OPTIONS')
@@ -0,0 +1,73 @@
+import time
+import click
+from flask.cli import with_appcontext
+from app.services.synthetic_data import SyntheticDataService
+from app.utils.bulk import DEFAULT_BATCH_SIZE
+
+@click.command('seed-synthetic')
+@click.option('--seed', default=42, show_default=True, help="Rastgele sayı tohumu (aynı tohum aynı veriyi üretir)")
+@click.option('--teachers', default=50, show_default=True, help="Öğretmen sayısı")
+@click.option('--students', default=5000, show_default=True, help="Öğrenci sayısı")
+@click.option('--courses', default=200, show_default=True, help="Dönem başına ders sayısı")
+@click.option('--students-per-course', default=40, show_default=True, help="Ders başına öğrenci sayısı")
+@click.option('--lessons-per-week', default=2, show_default=True, help="Dersin haftalık saat sayısı")
+@click.option('--weeks', default=14, show_default=True, help="Dönem başına hafta sayısı")
+@click.option('--semesters', default=1, show_default=True, help="Dönem sayısı")
+@click.option('--encodings/--no-encodings', default=True, show_default=True, help="Öğrencilere rastgele yüz kodlaması ekle")
+@click.option('--password', default='password123', show_default=True, help="Tüm kullanıcıların şifresi")
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, help="Parti başına satır sayısı")
+@with_appcontext
+def seed_synthetic_command(**options):
+    """
+    Yük testi için büyük hacimli sentetik veri ekle
+    
+    Örnek (yaklaşık 1 milyon yoklama kaydı):
+        flask seed-synthetic --students 20000 --courses 600 --semesters 2 --students-per-course 42 --weeks 14
+    """
+    started = time.perf_counter()
+    counts = SyntheticDataService.seed(log=click.echo, **options)
+    click.echo(f"Toplam {sum(counts.values())} satır {time.perf_counter() - started:.1f} saniyede eklendi.")
+
+@click.command('warm-up')
+def warm_up_command():
+    """
+    Yüz tanıma modellerini yükle ve ısıt
+    
+    Dağıtımda modellerin yüklenebildiğini doğrulamak ve yükleme süresini görmek için kullanılır.
+    """
+    from app.services.face_engine import FaceEngine
+    click.echo(f"Yüz tanıma modelleri {FaceEngine.warm_up():.2f} saniyede yüklendi.")
+
+@click.command('backfill-emotions')
+@click.option('--limit', default=0, show_default=True, help="En fazla işlenecek yoklama sayısı (0: tümü)")
+@with_appcontext
+def backfill_emotions_command(limit):
+    """
+    Duygu analizi bekleyen yoklamaları işle
+    
+    Yoğunlukta ertelenen analizler işçi süreci yeniden başlarsa kuyrukta kaybolur;
+    bu komut bekleyen kayıtları fotoğrafları depodan okuyarak tamamlar.
+    """
+    from app.services.load_shedding import EmotionBackfill
+    pending = EmotionBackfill.pending_ids()
+    if limit:
+        pending = pending[:limit]
+    
+    counts = {'done': 0, 'failed': 0}
+    for attendance_id in pending:
+        status = EmotionBackfill.process(attendance_id)
+        if status in counts:
+            counts[status] += 1
+    click.echo(f"{len(pending)} yoklama işlendi: {counts['done']} başarılı, {counts['failed']} başarısız.")
+
+@click.command('prune-idempotency')
+@with_appcontext
+def prune_idempotency_command():
+    """
+    Süresi dolmuş Idempotency-Key kayıtlarını sil
+    
+    Kayıtlar yazılırken de IDEMPOTENCY_PRUNE_INTERVAL aralığıyla temizlenir; bu komut
+    yazma olmayan dönemlerde zamanlanmış görev olarak çalıştırılabilir.
+    """
+    from app.services.idempotency_service import IdempotencyService
+    click.echo(f"{IdempotencyService.prune()} süresi dolmuş kayıt silindi.")
@@ -58,15 +58,119 @@ class Config:
     if DATABASE_PUBLIC_URL:
         DATABASE_PUBLIC_URL = DATABASE_PUBLIC_URL.strip()
     
+    # Salt okunur istekler için okuma kopyası (yoksa tüm istekler birincil veritabanını kullanır)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    if DATABASE_REPLICA_URL:
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.strip()
+        if DATABASE_REPLICA_URL.startswith('postgres://'):
+            DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
+    
+    # 'decorator': yalnızca @replica_read ile işaretli GET endpoint'leri, 'method': tüm GET istekleri
+    REPLICA_ROUTING = os.environ.get('REPLICA_ROUTING', 'decorator')
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 10))  # Bu gecikmenin üstünde birincile dönülür (saniye)
+    REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 5))  # Gecikme ölçüm aralığı (saniye)
+    
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 saat
     JWT_REFRESH_TOKEN_EXPIRES = 86400  # 1 gün
-    UPLOAD_FOLDER = 'app/static/faces'
+    UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'faces')
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16 MB
+    
+    # Bağlantı havuzu (işçi süreci başına; SQLite'ta yalnızca DB_POOL_PRE_PING uygulanır)
+    # Havuz, işçinin iş parçacıkları ve arka plan işleri aynı anda bağlantı alabilecek büyüklükte olmalı
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))  # Havuzdan bağlantı bekleme süresi (saniye)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', -1))  # Bağlantı ömrü (saniye; -1: sınırsız)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '0') == '1'
+    
+    # SQLite bağlantı ayarları (her bağlantı açılışında PRAGMA olarak uygulanır)
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # Kilit bekleme süresi (ms)
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # Bayt
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -64000))  # Negatif: KiB (64 MB)
+    
+    # Yazma işlemleri ilk yazma ifadesinde BEGIN IMMEDIATE ile açılır; kilit alınamazsa
+    # SQLITE_WRITE_RETRIES kez artan beklemeyle (SQLITE_WRITE_BACKOFF saniyeden başlayarak) yeniden denenir
+    SQLITE_IMMEDIATE_WRITES = os.environ.get('SQLITE_IMMEDIATE_WRITES', '1') == '1'
+    SQLITE_WRITE_RETRIES = int(os.environ.get('SQLITE_WRITE_RETRIES', 3))
+    SQLITE_WRITE_BACKOFF = float(os.environ.get('SQLITE_WRITE_BACKOFF', 0.1))
+    
+    # Geri yüklemede etkinleştirilen veritabanını gösteren işaretçi (tüm işçiler okur; None: instance/database.json)
+    DATABASE_POINTER_PATH = os.environ.get('DATABASE_POINTER_PATH')
+    # Yedekten geri yüklenen eski yüz fotoğraflarının hazırlandığı klasör (None: instance/restored_faces)
+    RESTORED_FACES_FOLDER = os.environ.get('RESTORED_FACES_FOLDER')
+    
+    # Yüz analizi önbelleği ve idempotency ayarları (klasörler None ise instance altında)
+    FACE_MODEL_VERSION = os.environ.get('FACE_MODEL_VERSION', 'face_recognition-1.3.0:hog:upsample1:small')
+    ANALYSIS_CACHE_FOLDER = os.environ.get('ANALYSIS_CACHE_FOLDER')
+    ANALYSIS_CACHE_MEMORY_ITEMS = int(os.environ.get('ANALYSIS_CACHE_MEMORY_ITEMS', 64))
+    ANALYSIS_CACHE_DISK_ITEMS = int(os.environ.get('ANALYSIS_CACHE_DISK_ITEMS', 1024))
+    IDEMPOTENCY_FOLDER = os.environ.get('IDEMPOTENCY_FOLDER')
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 86400))  # 1 gün
+    IDEMPOTENCY_IN_FLIGHT_TTL = int(os.environ.get('IDEMPOTENCY_IN_FLIGHT_TTL', 180))  # İşaret bu süreden eskiyse istek yarıda kalmıştır (gunicorn zaman aşımından uzun olmalı)
+    IDEMPOTENCY_PRUNE_INTERVAL = int(os.environ.get('IDEMPOTENCY_PRUNE_INTERVAL', 3600))  # Süresi dolmuş kayıtların temizlenme aralığı (saniye)
+    GALLERY_SNAPSHOT_PATH = os.environ.get('GALLERY_SNAPSHOT_PATH')
+    FACE_DETECTION_MAX_SIDE = int(os.environ.get('FACE_DETECTION_MAX_SIDE', 2048))  # 0: küçültme yok
+    
+    # Fotoğraf depolama ayarları ('local' veya 's3'; S3 uyumlu depolar için uç nokta verilebilir)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'local')
+    STORAGE_FOLDER = os.environ.get('STORAGE_FOLDER')  # None: instance/storage
+    STORAGE_COPY_WORKERS = int(os.environ.get('STORAGE_COPY_WORKERS', 8))
+    S3_BUCKET = os.environ.get('S3_BUCKET')
+    S3_PREFIX = os.environ.get('S3_PREFIX', '')
+    S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')  # ör. MinIO: http://localhost:9000
+    S3_REGION = os.environ.get('S3_REGION')
+    S3_ACCESS_KEY_ID = os.environ.get('S3_ACCESS_KEY_ID')
+    S3_SECRET_ACCESS_KEY = os.environ.get('S3_SECRET_ACCESS_KEY')
+    S3_PRESIGN_EXPIRES = int(os.environ.get('S3_PRESIGN_EXPIRES', 3600))
+    PHOTO_CACHE_MAX_AGE = int(os.environ.get('PHOTO_CACHE_MAX_AGE', 31536000))  # 1 yıl
+    
+    # Dosya teslim ayarları ('app', 'x-accel' veya 'x-sendfile')
+    FILE_DELIVERY = os.environ.get('FILE_DELIVERY', 'app')
+    
+    # Büyük fotoğraflarda karolu paralel yüz tespiti ayarları
+    TILED_DETECTION_MIN_PIXELS = int(os.environ.get('TILED_DETECTION_MIN_PIXELS', 6000000))
+    TILED_DETECTION_TILE_SIZE = int(os.environ.get('TILED_DETECTION_TILE_SIZE', 1024))
+    TILED_DETECTION_OVERLAP = int(os.environ.get('TILED_DETECTION_OVERLAP', 200))
+    TILED_DETECTION_WORKERS = int(os.environ.get('TILED_DETECTION_WORKERS', 0)) or None  # None: CPU sayısı
+    
+    # İstek zamanlaması ve yavaş sorgu kaydı (SLOW_QUERY_MS: 0 ise kapalı)
+    REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED', '1') == '1'
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 200))
+    SLOW_QUERY_LOG_PARAMS = os.environ.get('SLOW_QUERY_LOG_PARAMS', '0') == '1'  # değerler maskelenir
+    
+    # Prometheus metrikleri (/metrics); gunicorn altında PROMETHEUS_MULTIPROC_DIR ayarlanmalı
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    
+    # Admin isteklerinde istek bazlı profil (?_profile=1 veya X-Profile: 1)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '1') == '1'
+    PROFILE_FOLDER = os.environ.get('PROFILE_FOLDER')  # None: instance/profiles
+    PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 100))
+    
+    # Yüz tanıma endpoint'lerinin işçi başına eşzamanlılık sınırı, bekleme sırası ve süre bütçesi
+    # (süre bütçesi gunicorn zaman aşımından kısa olmalı)
+    RECOGNITION_CONCURRENCY = int(os.environ.get('RECOGNITION_CONCURRENCY', 1))
+    RECOGNITION_QUEUE_SIZE = int(os.environ.get('RECOGNITION_QUEUE_SIZE', 2))
+    RECOGNITION_QUEUE_TIMEOUT = float(os.environ.get('RECOGNITION_QUEUE_TIMEOUT', 10))
+    RECOGNITION_DEADLINE = float(os.environ.get('RECOGNITION_DEADLINE', 90))
+    
+    # Duygu analizi: 'auto' yoğunlukta arka plana erteler, 'inline' hep istekte, 'deferred' hep arka planda.
+    # Yoğunluk eşikleri: yüz tanıma sırası, işçi iş parçacığı doluluğu ve son isteklerin p95 süresi (saniye)
+    EMOTION_ANALYSIS_MODE = os.environ.get('EMOTION_ANALYSIS_MODE', 'auto')
+    WORKER_THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+    LOAD_SHED_QUEUE_DEPTH = int(os.environ.get('LOAD_SHED_QUEUE_DEPTH', 1))
+    LOAD_SHED_UTILIZATION = float(os.environ.get('LOAD_SHED_UTILIZATION', 0.75))
+    LOAD_SHED_P95 = float(os.environ.get('LOAD_SHED_P95', 15))
+    EMOTION_BACKFILL_MAX_DELAY = float(os.environ.get('EMOTION_BACKFILL_MAX_DELAY', 300))
 
 class DevelopmentConfig(Config):
     """Geliştirme ortamı yapılandırması"""
     DEBUG = True
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 2))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 3))
 
 class TestingConfig(Config):
     """Test ortamı yapılandırması"""
@@ -77,6 +181,68 @@ class ProductionConfig(Config):
     """Üretim ortamı yapılandırması"""
     DEBUG = False
     TESTING = False
+    
+    # İşçi başına gunicorn iş parçacığı sayısı kadar kalıcı bağlantı; yoğunlukta kısa süreli taşma.
+    # Havuz dolduğunda istek gunicorn zaman aşımına kadar asılı kalmasın diye bekleme kısa tutulur;
+    # sunucu/ağ geçidi boştaki bağlantıları kapattığı için bağlantılar yenilenir ve kullanmadan önce denenir
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', os.environ.get('GUNICORN_THREADS', 4)))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 4))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+
+def engine_options(app_config, url=None):
+    """
+    Havuz ayarlarından SQLAlchemy motor seçeneklerini oluştur
+    
+    SQLite'ta Flask-SQLAlchemy kendi havuzunu seçtiği için (bellek içi veritabanında
+    StaticPool) boyut ayarları uygulanmaz.
+    
+    Args:
+        app_config (dict): Uygulama yapılandırması
+        url (str): Veritabanı adresi (None ise SQLALCHEMY_DATABASE_URI)
+        
+    Returns:
+        dict: SQLALCHEMY_ENGINE_OPTIONS değeri
+    """
+    options = {'pool_pre_ping': app_config['DB_POOL_PRE_PING']}
+    
+    if not (url or app_config['SQLALCHEMY_DATABASE_URI']).startswith('sqlite'):
+        options.update(
+            pool_size=app_config['DB_POOL_SIZE'],
+            max_overflow=app_config['DB_MAX_OVERFLOW'],
+            pool_timeout=app_config['DB_POOL_TIMEOUT'],
+            pool_recycle=app_config['DB_POOL_RECYCLE']
+        )
+    return options
+
+# instance klasörüne göre belirlenen yollar (ortamda veya sınıfta verilmemişse create_app doldurur)
+INSTANCE_PATHS = {
+    'DATABASE_POINTER_PATH': 'database.json',
+    'RESTORED_FACES_FOLDER': 'restored_faces',
+    'ANALYSIS_CACHE_FOLDER': 'analysis_cache',
+    'IDEMPOTENCY_FOLDER': 'idempotency',
+    'GALLERY_SNAPSHOT_PATH': 'gallery.bin',
+    'STORAGE_FOLDER': 'storage',
+    'PROFILE_FOLDER': 'profiles'
+}
+
+def config_name():
+    """
+    Kullanılacak yapılandırma sınıfının adı
+    
+    FLASK_CONFIG verilmemişse FLASK_DEBUG=1 veya FLASK_ENV=development ile geliştirme,
+    aksi halde üretim yapılandırması seçilir (DEBUG yalnızca açıkça istendiğinde açılır).
+    
+    Returns:
+        str: 'development', 'testing' veya 'production'
+    """
+    name = os.environ.get('FLASK_CONFIG')
+    if name:
+        return name
+    if os.environ.get('FLASK_DEBUG') == '1' or os.environ.get('FLASK_ENV') == 'development':
+        return 'development'
+    return 'production'
 
 # Yapılandırma sözlüğü
 config = {
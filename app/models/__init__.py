@@ -3,4 +3,5 @@ from app.models.user import User
 from app.models.teacher import Teacher
 from app.models.student import Student
 from app.models.course import Course, LessonTime, CourseStudent
-from app.models.attendance import Attendance, AttendanceRecord 
\ No newline at end of file
+from app.models.attendance import Attendance, AttendanceRecord, FaceDetection
+from app.models.system_state import SystemState
@@ -11,18 +11,21 @@ class Attendance(db.Model):
     lesson_number = db.Column(db.Integer, nullable=False)  # Dersin kaçıncı saati olduğu
     photo_url = db.Column(db.String(255), nullable=True)  # Yoklama fotoğrafı URL'si
     emotion_data = db.Column(db.Text, nullable=True)  # Duygu analizi verileri (JSON formatında)
+    emotion_status = db.Column(db.String(20), nullable=True, index=True)  # pending, done, failed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # İlişkiler
     records = db.relationship('AttendanceRecord', backref='attendance', lazy=True, cascade='all, delete-orphan')
+    face_detections = db.relationship('FaceDetection', backref='attendance', lazy=True, cascade='all, delete-orphan')
     
-    def __init__(self, course_id, date, lesson_number, photo_url=None, emotion_data=None):
+    def __init__(self, course_id, date, lesson_number, photo_url=None, emotion_data=None, emotion_status=None):
         self.course_id = course_id
         self.date = date
         self.lesson_number = lesson_number
         self.photo_url = photo_url
         self.emotion_data = emotion_data
+        self.emotion_status = emotion_status
     
     def to_dict(self):
         """Yoklama bilgilerini sözlük olarak döndür"""
@@ -33,6 +36,7 @@ class Attendance(db.Model):
             'lesson_number': self.lesson_number,
             'photo_url': self.photo_url,
             'emotion_data': self.emotion_data,
+            'emotion_status': self.emotion_status,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -77,4 +81,47 @@ class AttendanceRecord(db.Model):
         }
     
     def __repr__(self):
-        return f'<AttendanceRecord {self.attendance_id}-{self.student_id}: {self.status}>' 
\ No newline at end of file
+        return f'<AttendanceRecord {self.attendance_id}-{self.student_id}: {self.status}>' 
+
+class FaceDetection(db.Model):
+    """Yoklama fotoğrafında tespit edilen yüz modeli"""
+    __tablename__ = 'face_detections'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    attendance_id = db.Column(db.Integer, db.ForeignKey('attendances.id'), nullable=False, index=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=True)  # Eşleşen öğrenci (yoksa NULL)
+    box_top = db.Column(db.Integer, nullable=False)
+    box_right = db.Column(db.Integer, nullable=False)
+    box_bottom = db.Column(db.Integer, nullable=False)
+    box_left = db.Column(db.Integer, nullable=False)
+    encoding = db.Column(db.LargeBinary, nullable=False)  # 128 boyutlu yüz kodlaması (float64, ham bayt)
+    distance = db.Column(db.Float, nullable=True)  # En yakın öğrenciye olan uzaklık
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __init__(self, attendance_id, box, encoding, student_id=None, distance=None):
+        self.attendance_id = attendance_id
+        self.box_top, self.box_right, self.box_bottom, self.box_left = box
+        self.encoding = encoding
+        self.student_id = student_id
+        self.distance = distance
+    
+    @property
+    def box(self):
+        """Yüz konumunu (top, right, bottom, left) olarak döndür"""
+        return (self.box_top, self.box_right, self.box_bottom, self.box_left)
+    
+    def to_dict(self):
+        """Yüz tespiti bilgilerini sözlük olarak döndür"""
+        return {
+            'id': self.id,
+            'attendance_id': self.attendance_id,
+            'student_id': self.student_id,
+            'box': [self.box_left, self.box_top, self.box_right - self.box_left, self.box_bottom - self.box_top],
+            'distance': self.distance,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<FaceDetection {self.attendance_id}: {self.student_id}>'
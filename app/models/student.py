@@ -17,6 +17,7 @@ class Student(db.Model):
     # İlişkiler
     courses = db.relationship('CourseStudent', backref='student', lazy=True, cascade='all, delete-orphan')
     attendance_records = db.relationship('AttendanceRecord', backref='student', lazy=True, cascade='all, delete-orphan')
+    face_detections = db.relationship('FaceDetection', backref='student', lazy=True)
     
     def __init__(self, user_id, student_number, department, face_encoding=None, face_photo_url=None):
         self.user_id = user_id
@@ -0,0 +1,59 @@
+from datetime import datetime
+from app import db
+
+class SystemState(db.Model):
+    """Sistem durum bilgisi modeli (anahtar-değer)"""
+    __tablename__ = 'system_state'
+    
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.String(255), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+    
+    @classmethod
+    def read(cls, connection, key):
+        """
+        Değeri verilen bağlantı üzerinden oku
+        
+        Args:
+            connection (Connection): SQLAlchemy bağlantısı
+            key (str): Anahtar
+            
+        Returns:
+            str: Değer veya None
+        """
+        return connection.execute(
+            db.select(cls.value).where(cls.key == key)
+        ).scalar()
+    
+    @classmethod
+    def write(cls, connection, key, value):
+        """
+        Değeri verilen bağlantı üzerinden yaz (yoksa oluştur)
+        
+        Args:
+            connection (Connection): SQLAlchemy bağlantısı
+            key (str): Anahtar
+            value (str): Değer
+        """
+        result = connection.execute(
+            db.update(cls).where(cls.key == key).values(value=value, updated_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                db.insert(cls).values(key=key, value=value, updated_at=datetime.utcnow())
+            )
+    
+    def to_dict(self):
+        """Durum bilgisini sözlük olarak döndür"""
+        return {
+            'key': self.key,
+            'value': self.value,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<SystemState {self.key}={self.value}>'
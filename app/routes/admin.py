@@ -1,5 +1,5 @@
-from flask import Blueprint, request, jsonify, current_app, send_file
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app, send_file, Response
+from flask_jwt_extended import jwt_required
 from app import db
 from app.utils.helpers import admin_required
 from app.models.user import User
@@ -7,8 +7,15 @@ from app.models.teacher import Teacher
 from app.models.student import Student
 from app.models.course import Course, LessonTime, CourseStudent
 from app.models.attendance import Attendance
+from app.services.photo_store import PHOTO_PREFIX
+from app.services.storage import get_storage
+from app.services.backup_service import BackupService
+from app.services.database_switch import DatabaseSwitch
+from app.services.profiler import ProfileService
+from app.services.file_delivery import send_local_file
+from werkzeug.security import safe_join
 import os
-import shutil
+import pathlib
 import sqlite3
 import datetime
 import tempfile
@@ -24,16 +31,21 @@ bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 def reset_database():
     """Veritabanını sıfırla"""
     try:
-        # Tüm tabloları temizle
-        db.drop_all()
-        db.create_all()
+        # Tüm tabloları etkin veritabanında temizle (geri yüklemeden sonra db.engine eski veritabanıdır)
+        db.session.close()
+        engine = DatabaseSwitch.engine()
+        db.metadata.drop_all(engine)
+        db.metadata.create_all(engine)
+        
+        # Fotoğraf deposunu temizle
+        get_storage().delete_prefix(PHOTO_PREFIX)
         
-        # Yüz fotoğraflarını temizle
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        for filename in os.listdir(upload_folder):
-            file_path = os.path.join(upload_folder, filename)
-            if os.path.isfile(file_path) and filename != '.gitkeep':
-                os.unlink(file_path)
+        # Eski düz klasördeki yüz fotoğraflarını temizle (geri yüklenmiş klasör dahil)
+        for upload_folder in {current_app.config['UPLOAD_FOLDER'], DatabaseSwitch.faces_folder()}:
+            for filename in os.listdir(upload_folder):
+                file_path = os.path.join(upload_folder, filename)
+                if os.path.isfile(file_path) and filename != '.gitkeep':
+                    os.unlink(file_path)
         
         return jsonify(message="Veritabanı başarıyla sıfırlandı."), 200
     except Exception as e:
@@ -238,36 +250,14 @@ def seed_database():
 def backup_database():
     """Veritabanını yedekle"""
     try:
-        # Veritabanı dosya yolunu al
-        db_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
-        if not db_uri.startswith('sqlite:///'):
-            return jsonify(error="Bu işlem sadece SQLite veritabanları için desteklenmektedir."), 400
-        
-        db_path = db_uri.replace('sqlite:///', '')
-        
-        # Yedekleme klasörünü oluştur
-        backup_dir = os.path.join(current_app.root_path, 'backups')
-        os.makedirs(backup_dir, exist_ok=True)
-        
-        # Yedek dosya adını oluştur
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f"backup_{timestamp}.db"
-        backup_path = os.path.join(backup_dir, backup_filename)
-        
-        # Veritabanını yedekle
-        shutil.copy2(db_path, backup_path)
-        
-        # Yüz fotoğraflarını yedekle
-        faces_dir = current_app.config['UPLOAD_FOLDER']
-        faces_backup_dir = os.path.join(backup_dir, f"faces_{timestamp}")
-        os.makedirs(faces_backup_dir, exist_ok=True)
-        
-        for filename in os.listdir(faces_dir):
-            file_path = os.path.join(faces_dir, filename)
-            if os.path.isfile(file_path):
-                shutil.copy2(file_path, os.path.join(faces_backup_dir, filename))
-        
-        return jsonify(message="Veritabanı başarıyla yedeklendi.", backup_file=backup_filename), 200
+        # Çevrimiçi, tutarlı döküm + tekilleştirilmiş fotoğraf yedeği
+        manifest = BackupService.create_snapshot()
+        
+        return jsonify(
+            message="Veritabanı başarıyla yedeklendi.",
+            backup_file=manifest['name'],
+            new_objects=manifest['new_objects']
+        ), 200
     except Exception as e:
         return jsonify(error=str(e)), 500
 
@@ -284,6 +274,13 @@ def restore_database():
         
         backup_filename = data['backup_file']
         
+        # Manifestli yedek
+        manifest = BackupService.get_manifest(backup_filename)
+        if manifest is not None:
+            pointer = BackupService.restore_snapshot(manifest)
+            return jsonify(message="Veritabanı başarıyla geri yüklendi.", database_version=pointer['version']), 200
+        
+        # Eski biçimdeki yedek (backup_<zaman>.db + faces_<zaman> klasörü)
         # Yedekleme klasörünü kontrol et
         backup_dir = os.path.join(current_app.root_path, 'backups')
         backup_path = os.path.join(backup_dir, backup_filename)
@@ -292,39 +289,30 @@ def restore_database():
             return jsonify(error="Belirtilen yedek dosyası bulunamadı."), 404
         
         # Veritabanı dosya yolunu al
-        db_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
-        if not db_uri.startswith('sqlite:///'):
+        if BackupService.database_kind() != 'sqlite':
             return jsonify(error="Bu işlem sadece SQLite veritabanları için desteklenmektedir."), 400
         
-        db_path = db_uri.replace('sqlite:///', '')
-        
-        # Veritabanı bağlantısını kapat
-        db.session.close()
-        db.engine.dispose()
-        
-        # Veritabanını geri yükle
-        shutil.copy2(backup_path, db_path)
+        name = os.path.splitext(backup_filename)[0]
         
-        # Yüz fotoğraflarını geri yükle
+        # Yüz fotoğraflarını canlı klasörün üzerine yazmadan hazırla
         timestamp = backup_filename.replace('backup_', '').replace('.db', '')
         faces_backup_dir = os.path.join(backup_dir, f"faces_{timestamp}")
         
+        faces = None
         if os.path.exists(faces_backup_dir):
-            faces_dir = current_app.config['UPLOAD_FOLDER']
-            
-            # Mevcut fotoğrafları temizle
-            for filename in os.listdir(faces_dir):
-                file_path = os.path.join(faces_dir, filename)
-                if os.path.isfile(file_path) and filename != '.gitkeep':
-                    os.unlink(file_path)
-            
-            # Yedek fotoğrafları geri yükle
-            for filename in os.listdir(faces_backup_dir):
-                file_path = os.path.join(faces_backup_dir, filename)
-                if os.path.isfile(file_path):
-                    shutil.copy2(file_path, os.path.join(faces_dir, filename))
-        
-        return jsonify(message="Veritabanı başarıyla geri yüklendi."), 200
+            faces = BackupService.stage_faces(
+                (
+                    (path.name, path.read_bytes)
+                    for path in pathlib.Path(faces_backup_dir).iterdir()
+                    if path.is_file()
+                ),
+                name
+            )
+        
+        # Veritabanını ve fotoğrafları birlikte etkinleştir
+        pointer = BackupService.restore_file(open(backup_path, 'rb'), name, faces=faces)
+        
+        return jsonify(message="Veritabanı başarıyla geri yüklendi.", database_version=pointer['version']), 200
     except Exception as e:
         return jsonify(error=str(e)), 500
 
@@ -361,6 +349,11 @@ def list_backups():
                         'created_at': formatted_date
                     })
         
+        # Manifestli yedekler
+        for snapshot in BackupService.list_snapshots():
+            snapshot['created_at'] = snapshot['created_at'].replace('T', ' ')[:19]
+            backups.append(snapshot)
+        
         # Tarihe göre sırala (en yeni en üstte)
         backups.sort(key=lambda x: x['created_at'], reverse=True)
         
@@ -374,14 +367,46 @@ def list_backups():
 def download_backup(filename):
     """Yedek dosyasını indir"""
     try:
+        # Manifestli yedek: veritabanı dökümü ve fotoğraflar sıkıştırılmış tar olarak akışla gönderilir
+        manifest = BackupService.get_manifest(filename)
+        if manifest is not None:
+            response = Response(BackupService.stream_archive(manifest), mimetype='application/gzip')
+            response.headers.set('Content-Disposition', 'attachment', filename=f"{filename}.tar.gz")
+            return response
+        
         # Yedekleme klasörünü kontrol et
         backup_dir = os.path.join(current_app.root_path, 'backups')
-        backup_path = os.path.join(backup_dir, filename)
+        backup_path = safe_join(backup_dir, filename)
         
-        if not os.path.exists(backup_path):
+        if backup_path is None or not os.path.isfile(backup_path):
             return jsonify(error="Belirtilen yedek dosyası bulunamadı."), 404
         
-        return send_file(backup_path, as_attachment=True, download_name=filename)
+        return send_local_file(backup_path, as_attachment=True, download_name=filename)
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+
+@bp.route('/profiles', methods=['GET'])
+@jwt_required()
+@admin_required
+def list_profiles():
+    """Kaydedilmiş istek profillerini listele"""
+    try:
+        return jsonify(profiles=ProfileService.list_profiles()), 200
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+
+@bp.route('/profiles/<filename>', methods=['GET'])
+@jwt_required()
+@admin_required
+def download_profile(filename):
+    """Profil dosyasını indir (.prof, .html veya .json özet)"""
+    try:
+        profile_path = safe_join(ProfileService.folder(), filename)
+        
+        if profile_path is None or not os.path.isfile(profile_path):
+            return jsonify(error="Belirtilen profil dosyası bulunamadı."), 404
+        
+        return send_local_file(profile_path, as_attachment=True, download_name=filename)
     except Exception as e:
         return jsonify(error=str(e)), 500
 
@@ -396,80 +421,12 @@ def upgrade_database():
 
 @bp.route('/upgrade-db', methods=['POST'])
 @jwt_required()
+@admin_required
 def upgrade_db():
     """Veritabanını yükseltme endpoint'i."""
-    current_user = get_jwt_identity()
-    if current_user['role'] != 'admin':
-        return jsonify({'error': 'Bu işlem için admin yetkisi gerekli.'}), 403
-
     success, error = upgrade_database()
 
     if success:
         return jsonify({'message': 'Veritabanı başarıyla güncellendi.'}), 200
     else:
         return jsonify({'error': f'Veritabanı güncellenemedi: {error}'}), 500
-
-@bp.route('/public-upgrade-db', methods=['GET', 'POST', 'OPTIONS'])
-def public_upgrade_db():
-    """Herkese açık veritabanı yükseltme endpoint'i."""
-    # OPTIONS isteği için CORS yanıtı
-    if request.method == 'OPTIONS':
-        response = jsonify({'status': 'success'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,POST,OPTIONS')
-        return response
-        
-    success, error = upgrade_database()
-
-    if success:
-        response = jsonify({'message': 'Veritabanı başarıyla güncellendi.'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 200
-    else:
-        response = jsonify({'error': f'Veritabanı güncellenemedi: {error}'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 500
-
-@bp.route('/create-tables', methods=['GET', 'POST', 'OPTIONS'])
-def create_tables():
-    """Doğrudan veritabanı tablolarını oluşturan endpoint."""
-    try:
-        # OPTIONS isteği için CORS yanıtı
-        if request.method == 'OPTIONS':
-            response = jsonify({'status': 'success'})
-            response.headers.add('Access-Control-Allow-Origin', '*')
-            response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-            response.headers.add('Access-Control-Allow-Methods', 'GET,POST,OPTIONS')
-            return response
-            
-        # SQLAlchemy ile tabloları oluştur
-        from app.models.user import User
-        from app.models.teacher import Teacher
-        from app.models.student import Student
-        from app.models.course import Course, LessonTime, CourseStudent
-        from app.models.attendance import Attendance
-        
-        with current_app.app_context():
-            db.create_all()
-            
-            # Admin kullanıcısı oluştur (eğer yoksa)
-            admin = User.query.filter_by(email='admin@example.com').first()
-            if not admin:
-                admin = User(
-                    email='admin@example.com',
-                    password='admin123',
-                    first_name='Admin',
-                    last_name='User',
-                    role='admin'
-                )
-                db.session.add(admin)
-                db.session.commit()
-        
-        response = jsonify({'message': 'Veritabanı tabloları başarıyla oluşturuldu.'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 200
-    except Exception as e:
-        response = jsonify({'error': f'Veritabanı tabloları oluşturulamadı: {str(e)}'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response, 500 
\ No newline at end of file
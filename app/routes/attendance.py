@@ -1,13 +1,18 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
 from app.models.course import Course, CourseStudent
 from app.models.student import Student
 from app.models.attendance import Attendance, AttendanceRecord
-from app.services.face_recognition_service import FaceRecognitionService
+from app.services.face_recognition_service import FaceRecognitionService, DETECTION_MODES
 from app.services.emotion_recognition_service import EmotionRecognitionService
+from app.services.idempotency_service import idempotent
+from app.services.photo_upload import UploadedPhoto
+from app.services.admission import admission_controlled, DeadlineExceeded, deadline_response
+from app.services.load_shedding import LoadMonitor, defer_emotions
+from app.services.replica import replica_read
 from app.utils.helpers import admin_required, teacher_required, course_teacher_required, get_pagination_params, paginate_query
 
 bp = Blueprint('attendance', __name__, url_prefix='/api/attendance')
@@ -15,6 +20,8 @@ bp = Blueprint('attendance', __name__, url_prefix='/api/attendance')
 @bp.route('/course/<int:course_id>', methods=['POST'])
 @jwt_required()
 @course_teacher_required
+@idempotent
+@admission_controlled
 def take_attendance(course_id):
     """Yoklama Al"""
     try:
@@ -33,9 +40,18 @@ def take_attendance(course_id):
         if photo_file.filename == '':
             return jsonify(error="Fotoğraf seçilmedi."), 400
         
+        # Fotoğrafı bir kez oku ve içerik özetini çıkar (Idempotency-Key varsa @idempotent okumuştur)
+        photo = g.get('uploaded_photo') or UploadedPhoto.from_file(photo_file)
+        
         # Ders saati numarasını al
         lesson_number = request.form.get('lesson_number', 1, type=int)
         
+        # Yüz tespiti modunu al (büyük fotoğraflar için 'tiled')
+        detection_mode = request.form.get('detection_mode', 'auto')
+        
+        if detection_mode not in DETECTION_MODES:
+            return jsonify(error=f"Geçersiz tespit modu. Geçerli modlar: {', '.join(DETECTION_MODES)}"), 400
+        
         # Bugün için yoklama var mı kontrol et
         today = datetime.now().date()
         existing_attendance = Attendance.query.filter_by(
@@ -53,58 +69,65 @@ def take_attendance(course_id):
         if not students:
             return jsonify(error="Bu derse kayıtlı öğrenci bulunamadı."), 400
         
-        # Yoklama oluştur
+        # Fotoğrafı kaydet
+        photo_saved, photo_url = FaceRecognitionService.save_attendance_photo(photo)
+        
+        # Fotoğraftaki yüzleri tanı
+        success, recognized_students = FaceRecognitionService.recognize_faces(photo, students, detection_mode=detection_mode)
+        
+        # Duygu analizi yap; sistem yoğunsa yoklama hemen kaydedilir, analiz arka planda tamamlanır
+        emotion_data = None
+        if LoadMonitor.should_defer_emotions():
+            emotion_status = 'pending'
+        else:
+            emotion_success, emotion_data = EmotionRecognitionService.analyze_emotions(photo, detection_mode=detection_mode)
+            
+            if not emotion_success:
+                emotion_data = None
+            emotion_status = 'done' if emotion_success else 'failed'
+        
+        # Yoklama oluştur; yazma işlemi analizler bittikten sonra açılır, böylece veritabanı
+        # yazma kilidi (SQLite) yalnızca kayıtlar eklenirken tutulur
         attendance = Attendance(
             course_id=course_id,
             date=today,
-            lesson_number=lesson_number
+            lesson_number=lesson_number,
+            photo_url=photo_url if photo_saved else None,
+            emotion_data=emotion_data,
+            emotion_status=emotion_status
         )
         
         db.session.add(attendance)
         db.session.flush()  # ID'yi almak için flush
         
-        # Fotoğrafı kaydet
-        success, photo_url = FaceRecognitionService.save_attendance_photo(attendance.id, photo_file)
-        
-        if success:
-            attendance.photo_url = photo_url
-        
-        # Fotoğraftaki yüzleri tanı
-        photo_file.seek(0)  # Dosya işaretçisini başa al
-        success, recognized_students = FaceRecognitionService.recognize_faces(photo_file, students)
-        
         if not success:
             # Hata durumunda, tüm öğrencileri yoklamada "ABSENT" olarak işaretle
-            for student in students:
-                record = AttendanceRecord(
-                    attendance_id=attendance.id,
-                    student_id=student.id,
-                    status="ABSENT",
-                    note="Yüz tanıma hatası: " + recognized_students
-                )
-                db.session.add(record)
+            present_ids = set()
+            note = "Yüz tanıma hatası: " + recognized_students
         else:
+            recognized_students, detections = recognized_students
+            
+            # Yüz tespitlerini yeniden eşleştirme için sakla
+            FaceRecognitionService.save_face_detections(attendance.id, detections)
+            
             # Tanınan öğrencileri "PRESENT" olarak işaretle
-            for student in students:
-                status = "PRESENT" if student.id in recognized_students else "ABSENT"
-                record = AttendanceRecord(
-                    attendance_id=attendance.id,
-                    student_id=student.id,
-                    status=status
-                )
-                db.session.add(record)
-        
-        # Duygu analizi yap
-        photo_file.seek(0)  # Dosya işaretçisini başa al
-        success, emotion_data = EmotionRecognitionService.analyze_emotions(photo_file)
+            present_ids = set(recognized_students)
+            note = None
         
-        if success:
-            attendance.emotion_data = emotion_data
+        # Öğrenci kayıtlarını tek seferde ekle
+        FaceRecognitionService.save_attendance_records(attendance.id, [student.id for student in students], present_ids, note=note)
         
         # Değişiklikleri kaydet
         db.session.commit()
         
+        if attendance.emotion_status == 'pending':
+            defer_emotions(attendance.id, photo, detection_mode)
+        
         return jsonify(message="Yoklama başarıyla alındı.", attendance=attendance.to_dict()), 201
+    except DeadlineExceeded as e:
+        # Süre bütçesi aşıldı: yoklama ve kayıtları yarım bırakılmadan geri alınır
+        db.session.rollback()
+        return deadline_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify(error=str(e)), 500
@@ -117,7 +140,75 @@ def take_attendance_alternative(course_id):
     """Yoklama Al (Alternatif endpoint)"""
     return take_attendance(course_id)
 
+@bp.route('/<int:attendance_id>/rematch', methods=['POST'])
+@jwt_required()
+@teacher_required
+def rematch_attendance(attendance_id):
+    """Kaydedilmiş yüz tespitlerini güncel öğrenci listesiyle yeniden eşleştir"""
+    try:
+        # Yoklamayı bul
+        attendance = Attendance.query.get(attendance_id)
+        
+        if not attendance:
+            return jsonify(error="Yoklama bulunamadı."), 404
+        
+        # Kullanıcı kimliğini al
+        user_id = get_jwt_identity()
+        user = User.query.get(user_id)
+        
+        # Yetki kontrolü: admin veya dersin kendi öğretmeni
+        if not user:
+            return jsonify(error="Bu yoklamayı güncelleme yetkiniz yok."), 403
+        if user.role != 'admin':
+            course = Course.query.get(attendance.course_id)
+            if user.role != 'teacher' or not user.teacher or not course or course.teacher_id != user.teacher.id:
+                return jsonify(error="Bu yoklamayı güncelleme yetkiniz yok."), 403
+        
+        # Derse kayıtlı güncel öğrencileri al
+        students = Student.query.join(CourseStudent).filter(CourseStudent.course_id == attendance.course_id).all()
+        
+        # Yalnızca eşleştirme adımını tekrar çalıştır
+        success, result = FaceRecognitionService.rematch_attendance(attendance, students)
+        
+        if not success:
+            return jsonify(error=result), 400
+        
+        previous_matches, current_matches = result
+        
+        # Mevcut yoklama kayıtlarını al
+        records = {record.student_id: record for record in AttendanceRecord.query.filter_by(attendance_id=attendance_id).all()}
+        
+        for student in students:
+            record = records.get(student.id)
+            
+            if record is None:
+                # Derse sonradan eklenen öğrenci için kayıt oluştur
+                record = AttendanceRecord(
+                    attendance_id=attendance_id,
+                    student_id=student.id,
+                    status="PRESENT" if student.id in current_matches else "ABSENT"
+                )
+                db.session.add(record)
+            elif student.id in current_matches and record.status == "ABSENT":
+                record.status = "PRESENT"
+            elif student.id in previous_matches and student.id not in current_matches and record.status == "PRESENT":
+                # Yalnızca önceki eşleşmeden gelen "PRESENT" durumu geri alınır; manuel durumlar korunur
+                record.status = "ABSENT"
+        
+        # Değişiklikleri kaydet
+        db.session.commit()
+        
+        result = attendance.to_dict()
+        result['records'] = [record.to_dict() for record in attendance.records]
+        result['face_detections'] = [face_detection.to_dict() for face_detection in attendance.face_detections]
+        
+        return jsonify(message="Yoklama yeniden eşleştirildi.", attendance=result), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=str(e)), 500
+
 @bp.route('', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_attendances():
     """Tüm yoklamaları listele"""
@@ -166,6 +257,7 @@ def get_attendances():
         return jsonify(error=str(e)), 500
 
 @bp.route('/<int:attendance_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_attendance(attendance_id):
     """Yoklama detayını getir"""
@@ -213,6 +305,7 @@ def get_attendance(attendance_id):
         return jsonify(error=str(e)), 500
 
 @bp.route('/course/<int:course_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_course_attendances(course_id):
     """Dersin yoklamalarını getir"""
@@ -342,6 +435,7 @@ def add_student_to_attendance(attendance_id, student_id):
         return jsonify(error=str(e)), 500
 
 @bp.route('/course/<int:course_id>/student/<int:student_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_student_attendances(course_id, student_id):
     """Belirli bir derste öğrencinin yoklamalarını getir"""
@@ -438,11 +532,12 @@ def update_attendance(attendance_id):
         user_id = get_jwt_identity()
         user = User.query.get(user_id)
         
-        # Yetki kontrolü
+        # Yetki kontrolü: admin veya dersin kendi öğretmeni
+        if not user:
+            return jsonify(error="Bu yoklamayı güncelleme yetkiniz yok."), 403
         if user.role != 'admin':
-            # Öğretmen sadece kendi derslerinin yoklamalarını güncelleyebilir
             course = Course.query.get(attendance.course_id)
-            if not course or (user.role == 'teacher' and user.teacher and course.teacher_id != user.teacher.id):
+            if user.role != 'teacher' or not user.teacher or not course or course.teacher_id != user.teacher.id:
                 return jsonify(error="Bu yoklamayı güncelleme yetkiniz yok."), 403
         
         # Verileri al
@@ -4,11 +4,13 @@ from app import db
 from app.models.user import User
 from app.models.course import Course, LessonTime, CourseStudent
 from app.models.student import Student
+from app.services.replica import replica_read
 from app.utils.helpers import admin_required, teacher_required, course_teacher_required, get_pagination_params, paginate_query
 
 bp = Blueprint('courses', __name__, url_prefix='/api/courses')
 
 @bp.route('', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_courses():
     """Tüm dersleri listele"""
@@ -106,6 +108,7 @@ def create_course():
         return jsonify(error=str(e)), 500
 
 @bp.route('/<int:course_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_course(course_id):
     """Belirli bir dersi getir"""
@@ -222,6 +225,7 @@ def delete_course(course_id):
         return jsonify(error=str(e)), 500
 
 @bp.route('/<int:course_id>/students', methods=['GET'])
+@replica_read
 @jwt_required()
 @course_teacher_required
 def get_course_students(course_id):
@@ -0,0 +1,65 @@
+from PIL import Image
+from flask import Blueprint, request, jsonify, current_app, redirect
+from app.services.photo_store import PhotoStore, VARIANTS, FORMATS
+from app.services.storage import get_storage
+from app.services.file_delivery import send_local_file
+
+bp = Blueprint('photos', __name__, url_prefix='/api/photos')
+
+@bp.route('/<digest>/<variant>', methods=['GET'])
+def get_photo(digest, variant):
+    """Fotoğrafı veya küçültülmüş türevini getir"""
+    try:
+        if not PhotoStore.is_digest(digest) or (variant != 'original' and variant not in VARIANTS):
+            return jsonify(error="Fotoğraf bulunamadı."), 404
+        
+        storage = get_storage()
+        
+        if variant == 'original':
+            key = PhotoStore.locate(storage, PhotoStore.original_key(digest))
+            if key is None:
+                return jsonify(error="Fotoğraf bulunamadı."), 404
+            
+            mimetype = None
+            etag = f"{digest}-original"
+        else:
+            # WebP yalnızca Accept'te açıkça listeleyen istemcilere gönderilir; */* (ör. curl,
+            # eski tarayıcılar) WebP desteği anlamına gelmez, onlara JPEG gider
+            ext = 'webp' if any(mimetype == 'image/webp' and quality > 0 for mimetype, quality in request.accept_mimetypes) else 'jpg'
+            key = PhotoStore.ensure_derivative(digest, variant, ext)
+            if key is None:
+                return jsonify(error="Fotoğraf bulunamadı."), 404
+            
+            mimetype = FORMATS[ext][1]
+            etag = f"{digest}-{variant}-{ext}"
+        
+        # Nesne deposu imzalı adres verebiliyorsa indirme uygulamadan geçmez
+        expires = current_app.config['S3_PRESIGN_EXPIRES']
+        presigned_url = storage.url(key, expires=expires)
+        
+        if presigned_url:
+            response = redirect(presigned_url)
+            # Yönlendirme, imzalı adresin süresinden önce önbellekten düşmeli
+            response.cache_control.private = True
+            response.cache_control.max_age = expires // 2
+            if variant != 'original':
+                response.vary.add('Accept')
+            return response
+        
+        path = storage.local_path(key)
+        
+        if mimetype is None:
+            # Orijinalin türünü başlıktan belirle
+            with Image.open(path) as img:
+                mimetype = Image.MIME.get(img.format, 'application/octet-stream')
+        
+        # İçerik adresli dosyalar değişmez; uzun süre önbelleklenebilir
+        response = send_local_file(path, mimetype=mimetype, etag=etag, max_age=current_app.config['PHOTO_CACHE_MAX_AGE'], immutable=True)
+        
+        # Türevin biçimi Accept'e göre seçildiği için önbellekler (JPEG dahil) Accept'e göre ayırmalı
+        if variant != 'original':
+            response.vary.add('Accept')
+        
+        return response
+    except Exception as e:
+        return jsonify(error=str(e)), 500
@@ -7,11 +7,13 @@ from app.models.user import User
 from app.models.course import Course, CourseStudent
 from app.models.student import Student
 from app.models.attendance import Attendance, AttendanceRecord
+from app.services.replica import replica_read
 from app.utils.helpers import admin_required, teacher_required, course_teacher_required, get_pagination_params, paginate_query
 
 bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 
 @bp.route('/attendance/daily', methods=['GET'])
+@replica_read
 @jwt_required()
 def daily_attendance_report():
     """Günlük yoklama raporu"""
@@ -95,7 +97,8 @@ def daily_attendance_report():
                     'excused_count': excused_count,
                     'attendance_rate': round(present_count / total_students * 100, 2) if total_students > 0 else 0
                 },
-                'emotion_stats': emotion_stats
+                'emotion_stats': emotion_stats,
+                'emotion_status': attendance.emotion_status
             }
             
             report_data['attendances'].append(attendance_data)
@@ -105,6 +108,7 @@ def daily_attendance_report():
         return jsonify(error=str(e)), 500
 
 @bp.route('/emotions/course/<int:course_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 @course_teacher_required
 def course_emotions_report(course_id):
@@ -153,8 +157,14 @@ def course_emotions_report(course_id):
             'neutral': 0
         }
         total_attendances = 0
+        pending_attendances = 0
         
         for attendance in attendances:
+            # Duygu analizi arka planda bekleyen yoklamalar ortalamaya katılmaz, ayrıca sayılır
+            if attendance.emotion_status == 'pending':
+                pending_attendances += 1
+                continue
+            
             if attendance.emotion_data:
                 try:
                     data = json.loads(attendance.emotion_data)
@@ -198,6 +208,7 @@ def course_emotions_report(course_id):
         report_data = {
             'course': course.to_dict(),
             'total_attendances_analyzed': total_attendances,
+            'pending_attendances': pending_attendances,
             'average_emotions': average_emotions,
             'dominant_emotion': dominant_emotion_name,
             'dominant_emotion_score': dominant_emotion_score,
@@ -209,6 +220,7 @@ def course_emotions_report(course_id):
         return jsonify(error=str(e)), 500
 
 @bp.route('/attendance/student/<int:student_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 def student_attendance_report(student_id):
     """Öğrenci yoklama raporu"""
@@ -341,6 +353,7 @@ def student_attendance_report(student_id):
         return jsonify(error=str(e)), 500
 
 @bp.route('/attendance/course/<int:course_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 @course_teacher_required
 def course_attendance_report(course_id):
@@ -5,6 +5,9 @@ from app.models.user import User
 from app.models.student import Student
 from app.services.auth_service import AuthService
 from app.services.face_recognition_service import FaceRecognitionService
+from app.services.photo_upload import UploadedPhoto
+from app.services.admission import admission_controlled, DeadlineExceeded, deadline_response
+from app.services.replica import replica_read
 from app.utils.helpers import admin_required, teacher_required, get_pagination_params, paginate_query
 
 bp = Blueprint('students', __name__, url_prefix='/api/students')
@@ -12,6 +15,7 @@ bp = Blueprint('students', __name__, url_prefix='/api/students')
 @bp.route('/create-with-face', methods=['POST'])
 @jwt_required()
 @teacher_required
+@admission_controlled
 def create_student_with_face():
     """Yeni öğrenci oluştur ve yüz fotoğrafı yükle"""
     try:
@@ -47,7 +51,19 @@ def create_student_with_face():
         if existing_user:
             return jsonify(error="Bu e-posta adresi zaten kullanılıyor."), 400
         
-        # Öğrenci kaydı
+        # Yüz fotoğrafını işle (kullanıcı kaydından önce; süre aşımında hiçbir şey kaydedilmez)
+        success, face_result = FaceRecognitionService.save_face_photo(UploadedPhoto.from_file(photo_file))
+        
+        if not success:
+            return jsonify(error=face_result), 400
+        
+        # Yüz kodlamasını ve URL'yi al
+        photo_url, face_encoding = face_result
+        
+        # Yüz kodlamasını JSON formatına dönüştür
+        encoded_face = FaceRecognitionService.encode_face_encoding(face_encoding)
+        
+        # Öğrenci kaydı (yüz bilgileriyle tek işlemde)
         success, result = AuthService.register_user(
             email=email,
             password=password,
@@ -55,7 +71,9 @@ def create_student_with_face():
             last_name=last_name,
             role='student',
             student_number=student_number,
-            department=department
+            department=department,
+            face_encoding=encoded_face,
+            face_photo_url=photo_url
         )
         
         if not success:
@@ -64,33 +82,17 @@ def create_student_with_face():
         # Öğrenciyi al
         student = result.student
         
-        # Yüz fotoğrafını kaydet
-        success, face_result = FaceRecognitionService.save_face_photo(student.id, photo_file)
-        
-        if not success:
-            # Öğrenciyi sil
-            db.session.delete(student)
-            db.session.delete(result)
-            db.session.commit()
-            return jsonify(error=face_result), 400
-        
-        # Yüz kodlamasını ve URL'yi kaydet
-        photo_url, face_encoding = face_result
-        
-        # Yüz kodlamasını JSON formatına dönüştür
-        encoded_face = FaceRecognitionService.encode_face_encoding(face_encoding)
-        
-        # Öğrenciyi güncelle
-        student.face_encoding = encoded_face
-        student.face_photo_url = photo_url
-        db.session.commit()
-        
         return jsonify(student.to_dict()), 201
+    except DeadlineExceeded as e:
+        # Süre bütçesi aşıldı: öğrenci kaydı oluşturulmaz
+        db.session.rollback()
+        return deadline_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify(error=str(e)), 500
 
 @bp.route('', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_students():
     """Tüm öğrencileri listele"""
@@ -109,6 +111,7 @@ def get_students():
         return jsonify(error=str(e)), 500
 
 @bp.route('/<int:student_id>', methods=['GET'])
+@replica_read
 @jwt_required()
 def get_student(student_id):
     """Öğrenci detayını getir"""
@@ -0,0 +1,205 @@
+import math
+import time
+import threading
+from collections import deque
+from functools import wraps
+import numpy as np
+from flask import g, jsonify, current_app, has_request_context
+from app.services.metrics import RECOGNITION_ACTIVE, RECOGNITION_WAITING, ADMISSION_REJECTED
+
+# Süre tahmini için tutulan son işlem süresi sayısı
+RECENT_DURATIONS = 100
+
+class Overloaded(Exception):
+    """Yüz tanıma kapasitesi dolu; istek kuyruğa alınamadı veya kuyrukta beklerken süre doldu"""
+    
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+class DeadlineExceeded(Exception):
+    """İsteğin süre bütçesi bir aşamaya girmeden önce doldu"""
+    
+    def __init__(self, stage):
+        super().__init__(f"Süre sınırı '{stage}' aşamasında aşıldı.")
+        self.stage = stage
+
+class Deadline:
+    """İsteğin başından itibaren işlenebileceği en uzun süre"""
+    
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+    
+    def remaining(self):
+        return self.expires - time.monotonic()
+    
+    def check(self, stage):
+        """Süre dolduysa DeadlineExceeded fırlat"""
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(stage)
+
+def current_deadline():
+    """Etkin isteğin süre bütçesini döndür (istek dışında veya bütçe yoksa None)"""
+    if not has_request_context():
+        return None
+    return g.get('deadline')
+
+def check_deadline(stage):
+    """
+    Etkin isteğin süre bütçesi dolduysa DeadlineExceeded fırlat
+    
+    Args:
+        stage (str): Girilmek üzere olan aşama
+    """
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check(stage)
+
+def remaining_time():
+    """Etkin isteğin kalan süresi (saniye; bütçe yoksa None)"""
+    deadline = current_deadline()
+    return None if deadline is None else max(deadline.remaining(), 0.0)
+
+class AdmissionLimiter:
+    """
+    Yüz tanıma isteklerinin eşzamanlılık sınırlayıcısı
+    
+    En fazla limit istek aynı anda çalışır, en fazla queue_size istek sırada bekler;
+    sıra doluysa istek beklemeden reddedilir.
+    """
+    
+    def __init__(self, limit, queue_size, queue_timeout):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._durations = deque(maxlen=RECENT_DURATIONS)
+    
+    def retry_after(self):
+        """
+        Yeniden deneme için önerilen süre (saniye)
+        
+        Son işlem sürelerinin ortalamasına ve sıradaki istek sayısına göre tahmin edilir.
+        """
+        with self._lock:
+            average = sum(self._durations) / len(self._durations) if self._durations else 1.0
+            waiting = self.waiting
+        return max(1, math.ceil(average * (waiting + 1) / self.limit))
+    
+    def recent_p95(self):
+        """Son işlemlerin 95. yüzdelik süresi (saniye; ölçüm yoksa None)"""
+        with self._lock:
+            durations = list(self._durations)
+        return float(np.percentile(durations, 95)) if durations else None
+    
+    def acquire(self, timeout):
+        """
+        Çalışma izni al (gerekirse sırada bekle)
+        
+        Args:
+            timeout (float): Sırada en fazla bekleme süresi
+            
+        Raises:
+            Overloaded: Sıra dolu veya bekleme süresi doldu
+        """
+        if self._semaphore.acquire(blocking=False):
+            self._started()
+            return
+        
+        with self._lock:
+            if self.waiting >= self.queue_size:
+                raise Overloaded('queue_full')
+            self.waiting += 1
+        RECOGNITION_WAITING.inc()
+        
+        try:
+            acquired = self._semaphore.acquire(timeout=max(timeout, 0))
+        finally:
+            with self._lock:
+                self.waiting -= 1
+            RECOGNITION_WAITING.dec()
+        
+        if not acquired:
+            raise Overloaded('queue_timeout')
+        self._started()
+    
+    def _started(self):
+        with self._lock:
+            self.active += 1
+        RECOGNITION_ACTIVE.inc()
+    
+    def release(self, duration):
+        """Çalışma iznini bırak ve işlem süresini kaydet"""
+        with self._lock:
+            self.active -= 1
+            self._durations.append(duration)
+        RECOGNITION_ACTIVE.dec()
+        self._semaphore.release()
+
+def get_limiter():
+    """Uygulamanın yüz tanıma sınırlayıcısını döndür"""
+    return current_app.extensions['admission']
+
+def overloaded_response(message, retry_after):
+    """503 yanıtı ve Retry-After başlığı"""
+    response = jsonify(error=message)
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def deadline_response(error):
+    """Süre bütçesi aşılan istek için 503 yanıtı (hiçbir şey kaydedilmemiştir)"""
+    ADMISSION_REJECTED.labels(reason='deadline').inc()
+    current_app.logger.warning(f"İstek süre sınırını aştı: {str(error)}")
+    return overloaded_response(
+        "İşlem süre sınırını aştı, hiçbir değişiklik kaydedilmedi. Lütfen tekrar deneyin.",
+        get_limiter().retry_after()
+    )
+
+def admission_controlled(fn):
+    """
+    Yüz tanıma endpoint'leri için dekoratör: eşzamanlılığı sınırla ve süre bütçesi başlat
+    
+    Süre bütçesi sıradaki bekleme dahil isteğin başından ölçülür; aşamalar (bkz.
+    request_timing.stage) başlamadan önce kontrol edilir. Kapasite doluysa 503 ve
+    Retry-After döner.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        limiter = get_limiter()
+        deadline = Deadline(current_app.config['RECOGNITION_DEADLINE'])
+        
+        try:
+            limiter.acquire(min(limiter.queue_timeout, deadline.remaining()))
+        except Overloaded as e:
+            ADMISSION_REJECTED.labels(reason=e.reason).inc()
+            return overloaded_response(
+                "Sistem şu anda yoğun. Lütfen biraz sonra tekrar deneyin.",
+                limiter.retry_after()
+            )
+        
+        g.deadline = deadline
+        started = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            g.pop('deadline', None)
+            limiter.release(time.monotonic() - started)
+    return wrapper
+
+def init_admission(app):
+    """
+    Yüz tanıma sınırlayıcısını uygulamaya bağla (her işçi sürecinde ayrı)
+    
+    Args:
+        app (Flask): Uygulama
+    """
+    app.extensions['admission'] = AdmissionLimiter(
+        app.config['RECOGNITION_CONCURRENCY'],
+        app.config['RECOGNITION_QUEUE_SIZE'],
+        app.config['RECOGNITION_QUEUE_TIMEOUT']
+    )
@@ -0,0 +1,125 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from flask import current_app
+
+class AnalysisCache:
+    """Fotoğraf içerik özetine göre yüz tespiti/kodlama sonuç önbelleği"""
+    
+    def __init__(self, folder, memory_items=64, disk_items=1024):
+        self.folder = folder
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+    
+    @staticmethod
+    def make_key(digest, model_version):
+        """
+        Önbellek anahtarını oluştur
+        
+        Args:
+            digest (str): Fotoğrafın SHA-256 özeti
+            model_version (str): Tespit/kodlama yapılandırmasının sürüm bilgisi
+            
+        Returns:
+            str: Önbellek anahtarı
+        """
+        return hashlib.sha256(f"{model_version}:{digest}".encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.folder, f"{key}.npz")
+    
+    def get(self, key):
+        """
+        Önbellekteki analiz sonucunu getir
+        
+        Args:
+            key (str): Önbellek anahtarı
+            
+        Returns:
+            dict: {'locations': list, 'encodings': numpy.ndarray veya None} ya da None
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        
+        # Bellekte yoksa diskten oku
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                entry = {
+                    'locations': [tuple(int(v) for v in row) for row in data['locations']],
+                    'encodings': data['encodings'] if bool(data['has_encodings']) else None
+                }
+            os.utime(path)  # LRU sırası için erişim zamanını güncelle
+        except (OSError, KeyError, ValueError):
+            return None
+        
+        self._remember(key, entry)
+        return entry
+    
+    def put(self, key, entry):
+        """
+        Analiz sonucunu bellek ve disk önbelleğine yaz
+        
+        Args:
+            key (str): Önbellek anahtarı
+            entry (dict): {'locations': list, 'encodings': numpy.ndarray veya None}
+        """
+        self._remember(key, entry)
+        
+        encodings = entry.get('encodings')
+        locations = np.array(entry['locations'], dtype=np.int32).reshape(-1, 4)
+        
+        try:
+            # Yarım yazılmış dosya okunmasın diye geçici dosyaya yazıp taşı
+            fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    locations=locations,
+                    encodings=np.asarray(encodings, dtype=np.float64).reshape(-1, 128) if encodings is not None else np.empty((0, 128)),
+                    has_encodings=np.array(encodings is not None)
+                )
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError as e:
+            current_app.logger.warning(f"Analiz önbelleği diske yazılamadı: {str(e)}")
+    
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+    
+    def _evict_disk(self):
+        entries = [e for e in os.scandir(self.folder) if e.name.endswith('.npz')]
+        if len(entries) <= self.disk_items:
+            return
+        
+        # En uzun süredir kullanılmayan dosyaları sil
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.disk_items]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+def get_analysis_cache():
+    """Uygulamaya ait analiz önbelleğini döndür"""
+    cache = current_app.extensions.get('analysis_cache')
+    if cache is None:
+        cache = AnalysisCache(
+            current_app.config['ANALYSIS_CACHE_FOLDER'],
+            memory_items=current_app.config['ANALYSIS_CACHE_MEMORY_ITEMS'],
+            disk_items=current_app.config['ANALYSIS_CACHE_DISK_ITEMS']
+        )
+        current_app.extensions['analysis_cache'] = cache
+    return cache
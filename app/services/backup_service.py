@@ -0,0 +1,552 @@
+import os
+import io
+import json
+import time
+import queue
+import sqlite3
+import hashlib
+import tarfile
+import datetime
+import shutil
+import tempfile
+import threading
+import subprocess
+from flask import current_app
+from sqlalchemy import text, create_engine, inspect
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from app import db
+from app.services.photo_store import PhotoStore, PHOTO_PREFIX, ARCHIVE_PREFIX
+from app.services.storage import get_storage
+from app.services.database_switch import DatabaseSwitch
+
+# Depodaki yedek anahtarları
+OBJECTS_PREFIX = ARCHIVE_PREFIX          # Tüm yedeklerin paylaştığı içerik adresli fotoğraflar
+SNAPSHOTS_PREFIX = 'backups/snapshots/'  # Yedek başına manifest ve veritabanı dökümü
+
+# Akışlı arşivde üretici ile tüketici arasındaki en fazla parça sayısı
+ARCHIVE_QUEUE_SIZE = 16
+
+class BackupService:
+    """Tutarlı, tekilleştirilmiş veritabanı ve fotoğraf yedekleme servisi"""
+    
+    @staticmethod
+    def database_kind():
+        return DatabaseSwitch.engine().url.get_backend_name()
+    
+    @staticmethod
+    def manifest_key(name):
+        return f"{SNAPSHOTS_PREFIX}{name}.json"
+    
+    @staticmethod
+    def _pg_command(program, *args, database=None):
+        """pg_dump/pg_restore komutunu ve ortamını oluştur (parola komut satırında görünmez)"""
+        url = DatabaseSwitch.engine().url
+        command = [program, '--no-owner', '-d', database or url.database]
+        if url.host:
+            command += ['-h', url.host]
+        if url.port:
+            command += ['-p', str(url.port)]
+        if url.username:
+            command += ['-U', url.username]
+        
+        env = dict(os.environ)
+        if url.password:
+            env['PGPASSWORD'] = url.password
+        
+        return command + list(args), env
+    
+    @staticmethod
+    def dump_database(storage, key):
+        """
+        Veritabanının tutarlı bir kopyasını depoya yaz
+        
+        SQLite için çevrimiçi yedekleme API'si kullanılır (yazmalar sürerken bile yırtık
+        kopya oluşmaz); PostgreSQL için pg_dump çıktısı diske yazılmadan depoya aktarılır.
+        
+        Args:
+            storage (Storage): Depolama sürücüsü
+            key (str): Döküm anahtarı
+            
+        Returns:
+            int: Döküm boyutu (bayt)
+        """
+        kind = BackupService.database_kind()
+        
+        if kind == 'sqlite':
+            fd, tmp_path = tempfile.mkstemp(suffix='.db')
+            os.close(fd)
+            try:
+                source = sqlite3.connect(DatabaseSwitch.engine().url.database)
+                target = sqlite3.connect(tmp_path)
+                try:
+                    # Sayfalar parça parça kopyalanır; araya giren yazmalar kopyayı yeniden başlatır
+                    source.backup(target, pages=1024)
+                finally:
+                    target.close()
+                    source.close()
+                
+                with open(tmp_path, 'rb') as f:
+                    storage.put(key, f, content_type='application/vnd.sqlite3')
+            finally:
+                os.remove(tmp_path)
+        
+        elif kind == 'postgresql':
+            command, env = BackupService._pg_command('pg_dump', '-Fc')
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+            try:
+                storage.put(key, process.stdout, content_type='application/octet-stream')
+            finally:
+                process.stdout.close()
+                stderr = process.stderr.read().decode('utf-8', 'replace')
+                process.wait()
+            if process.returncode != 0:
+                raise RuntimeError(f"pg_dump başarısız: {stderr.strip()}")
+        
+        else:
+            raise RuntimeError(f"Bu veritabanı türü yedeklenemiyor: {kind}")
+        
+        return storage.size(key)
+    
+    @staticmethod
+    def schema_revision():
+        """Veritabanının alembic sürümünü döndür (yoksa None)"""
+        try:
+            return db.session.execute(text('SELECT version_num FROM alembic_version')).scalar()
+        except Exception:
+            db.session.rollback()
+            return None
+    
+    @staticmethod
+    def create_snapshot():
+        """
+        Yeni yedek oluştur
+        
+        Veritabanı dökümü yedeğe özeldir; fotoğraflar tüm yedeklerin paylaştığı içerik
+        adresli depoya yalnızca daha önce yedeklenmemişlerse kopyalanır.
+        
+        Returns:
+            dict: Yedek manifesti
+        """
+        storage = get_storage()
+        name = f"backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        ext = 'db' if BackupService.database_kind() == 'sqlite' else 'dump'
+        database_key = f"{SNAPSHOTS_PREFIX}{name}/database.{ext}"
+        
+        # Önce veritabanı: sonraki fotoğraf listesi dökümdeki tüm fotoğrafları kapsar
+        database_size = BackupService.dump_database(storage, database_key)
+        
+        # Fotoğraflar: yalnızca yeni içerik kopyalanır
+        photo_keys = sorted(storage.list(PHOTO_PREFIX))
+        backed_up = set(storage.list(OBJECTS_PREFIX))
+        new_objects = [
+            (key, BackupService.object_key(key))
+            for key in photo_keys
+            if BackupService.object_key(key) not in backed_up
+        ]
+        storage.copy_many(new_objects, workers=current_app.config['STORAGE_COPY_WORKERS'])
+        
+        # Eski düz klasördeki fotoğraflar da içerik özetiyle saklanır
+        legacy_faces = {}
+        upload_folder = DatabaseSwitch.faces_folder()
+        for filename in os.listdir(upload_folder):
+            file_path = os.path.join(upload_folder, filename)
+            if not os.path.isfile(file_path) or filename == '.gitkeep':
+                continue
+            
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            key = f"{OBJECTS_PREFIX}legacy/{hashlib.sha256(data).hexdigest()}"
+            if key not in backed_up:
+                storage.put(key, data)
+                new_objects.append((file_path, key))
+            legacy_faces[filename] = key
+        
+        manifest = {
+            'name': name,
+            'created_at': datetime.datetime.now().isoformat(),
+            'database': {
+                'kind': BackupService.database_kind(),
+                'key': database_key,
+                'size': database_size,
+                'revision': BackupService.schema_revision()
+            },
+            'photos': photo_keys,
+            'legacy_faces': legacy_faces,
+            'new_objects': len(new_objects)
+        }
+        
+        storage.put(BackupService.manifest_key(name), json.dumps(manifest).encode('utf-8'), content_type='application/json')
+        return manifest
+    
+    @staticmethod
+    def object_key(photo_key):
+        """Canlı depodaki fotoğraf anahtarının yedek deposundaki karşılığı"""
+        return PhotoStore.archive_key(photo_key)
+    
+    @staticmethod
+    def get_manifest(name):
+        """
+        Yedek manifestini getir
+        
+        Args:
+            name (str): Yedek adı (ör. backup_20240101_120000)
+            
+        Returns:
+            dict: Manifest veya yedek yoksa None
+        """
+        storage = get_storage()
+        key = BackupService.manifest_key(name)
+        if '/' in name or not storage.exists(key):
+            return None
+        return json.loads(storage.get(key))
+    
+    @staticmethod
+    def list_snapshots():
+        """
+        Yedekleri listele
+        
+        Returns:
+            list: Yedek özetleri
+        """
+        storage = get_storage()
+        snapshots = []
+        
+        for key in storage.list(SNAPSHOTS_PREFIX):
+            if not key.endswith('.json'):
+                continue
+            manifest = json.loads(storage.get(key))
+            snapshots.append({
+                'filename': manifest['name'],
+                'size': manifest['database']['size'],
+                'created_at': manifest['created_at'],
+                'photo_count': len(manifest['photos']) + len(manifest['legacy_faces']),
+                'new_objects': manifest['new_objects']
+            })
+        
+        return snapshots
+    
+    @staticmethod
+    def archive_entries(manifest):
+        """Arşive eklenecek (arşiv içindeki ad, depo anahtarı) çiftleri"""
+        database = manifest['database']
+        yield f"database.{database['key'].rsplit('.', 1)[1]}", database['key']
+        
+        for key in manifest['photos']:
+            yield key, BackupService.object_key(key)
+        
+        for filename, key in manifest['legacy_faces'].items():
+            yield f"faces/{filename}", key
+    
+    @staticmethod
+    def stream_archive(manifest):
+        """
+        Yedeği sıkıştırılmış tar arşivi olarak akışla döndür
+        
+        Arşiv arka plan iş parçacığında yazılır; bellekte en fazla ARCHIVE_QUEUE_SIZE parça tutulur.
+        
+        Args:
+            manifest (dict): Yedek manifesti
+            
+        Returns:
+            iterator: Arşiv parçaları (uygulama bağlamı olmadan tüketilebilir)
+        """
+        return BackupService._archive_chunks(get_storage(), manifest)
+    
+    @staticmethod
+    def _archive_chunks(storage, manifest):
+        writer = _QueueWriter(ARCHIVE_QUEUE_SIZE)
+        
+        def produce():
+            try:
+                with tarfile.open(fileobj=writer, mode='w|gz') as tar:
+                    info = tarfile.TarInfo('manifest.json')
+                    data = json.dumps(manifest, indent=2).encode('utf-8')
+                    info.size, info.mtime = len(data), time.time()
+                    tar.addfile(info, io.BytesIO(data))
+                    
+                    for arcname, key in BackupService.archive_entries(manifest):
+                        info = tarfile.TarInfo(arcname)
+                        info.size, info.mtime = storage.size(key), time.time()
+                        stream = storage.open(key)
+                        try:
+                            tar.addfile(info, stream)
+                        finally:
+                            stream.close()
+                writer.finish()
+            except BaseException as e:
+                writer.finish(e)
+        
+        producer = threading.Thread(target=produce, name='backup-archive', daemon=True)
+        producer.start()
+        
+        try:
+            yield from writer.chunks()
+        finally:
+            writer.cancel()
+            producer.join()
+    
+    @staticmethod
+    def _copy_stream(stream, target):
+        """Akışı 1 MB'lık parçalarla hedefe yaz ve akışı kapat"""
+        try:
+            while True:
+                chunk = stream.read(1024 * 1024)
+                if not chunk:
+                    break
+                target.write(chunk)
+        finally:
+            stream.close()
+    
+    @staticmethod
+    def stage_database(stream, name):
+        """
+        Dökümü canlı veritabanına dokunmadan yeni bir veritabanına yükle
+        
+        SQLite için canlı dosyanın yanında yeni bir dosya, PostgreSQL için yeni bir
+        veritabanı oluşturulur. Önceki veritabanları geri dönüş için silinmez.
+        
+        Args:
+            stream (dosya benzeri nesne): Veritabanı dökümü
+            name (str): Yedek adı
+            
+        Returns:
+            str: Hazırlanan veritabanının adresi
+        """
+        url = DatabaseSwitch.engine().url
+        kind = BackupService.database_kind()
+        suffix = f"{name}_{int(time.time())}"
+        
+        if kind == 'sqlite':
+            live_path = url.database
+            folder = os.path.dirname(os.path.abspath(live_path))
+            stem = os.path.splitext(os.path.basename(live_path))[0]
+            staged_path = os.path.join(folder, f"{stem}.{suffix}.db")
+            
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    BackupService._copy_stream(stream, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                connection = sqlite3.connect(tmp_path)
+                try:
+                    result = connection.execute('PRAGMA integrity_check').fetchone()[0]
+                finally:
+                    connection.close()
+                if result != 'ok':
+                    raise RuntimeError(f"Yedek veritabanı bozuk: {result}")
+                
+                os.replace(tmp_path, staged_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            
+            return url.set(database=staged_path).render_as_string(hide_password=False)
+        
+        if kind == 'postgresql':
+            # PostgreSQL adları en fazla 63 karakter olabilir
+            database = f"{url.database}_{suffix}"[:63]
+            with DatabaseSwitch.engine().connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                connection.execute(text(f'CREATE DATABASE "{database}"'))
+            
+            # pg_restore, arşiv biçimini doğrular; hatalı döküm yarım kalmış veritabanı bırakmaz
+            command, env = BackupService._pg_command('pg_restore', '--exit-on-error', '--single-transaction', database=database)
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+            try:
+                BackupService._copy_stream(stream, process.stdin)
+            finally:
+                process.stdin.close()
+                stderr = process.stderr.read().decode('utf-8', 'replace')
+                process.wait()
+            if process.returncode != 0:
+                with DatabaseSwitch.engine().connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                    connection.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+                raise RuntimeError(f"pg_restore başarısız: {stderr.strip()}")
+            
+            return url.set(database=database).render_as_string(hide_password=False)
+        
+        raise RuntimeError(f"Bu veritabanı türü geri yüklenemiyor: {kind}")
+    
+    @staticmethod
+    def migrate_staged(url):
+        """
+        Hazırlanan veritabanını güncel şemaya getir ve doğrula
+        
+        Alembic sürümü olan veritabanları son sürüme yükseltilir; migration'sız oluşturulmuş
+        eski yedeklerde eksik tablolar modellerden oluşturulur.
+        
+        Args:
+            url (str): Hazırlanan veritabanının adresi
+            
+        Returns:
+            str: Veritabanının alembic sürümü (yoksa None)
+        """
+        directory = current_app.extensions['migrate'].directory
+        config = AlembicConfig()
+        config.set_main_option('script_location', directory)
+        head = ScriptDirectory.from_config(config).get_current_head()
+        
+        engine = create_engine(url)
+        try:
+            with engine.begin() as connection:
+                tables = set(inspect(connection).get_table_names())
+                
+                if 'alembic_version' in tables:
+                    # migrations/env.py verilen bağlantıyı kullanır (canlı veritabanına dokunulmaz)
+                    config.attributes['connection'] = connection
+                    command.upgrade(config, 'head')
+                    revision = connection.execute(text('SELECT version_num FROM alembic_version')).scalar()
+                    if revision != head:
+                        raise RuntimeError(f"Yedek şeması güncellenemedi: {revision} != {head}")
+                else:
+                    db.metadata.create_all(connection)
+                    revision = None
+                
+                missing = set(db.metadata.tables) - set(inspect(connection).get_table_names())
+                if missing:
+                    raise RuntimeError(f"Yedekte eksik tablolar var: {', '.join(sorted(missing))}")
+        finally:
+            engine.dispose()
+        
+        return revision
+    
+    @staticmethod
+    def stage_faces(files, name):
+        """
+        Eski düz klasördeki yüz fotoğraflarını canlı klasöre dokunmadan yeni bir klasöre yükle
+        
+        Dosyalar geçici klasöre yazılır ve klasör tamamlandığında atomik olarak yeniden
+        adlandırılır; klasör, veritabanıyla birlikte aynı işaretçiyle etkinleştirilir.
+        
+        Args:
+            files (iterable): (dosya adı, içeriği döndüren fonksiyon) çiftleri
+            name (str): Yedek adı
+            
+        Returns:
+            str: Hazırlanan klasörün yolu
+        """
+        root = current_app.config['RESTORED_FACES_FOLDER']
+        os.makedirs(root, exist_ok=True)
+        staged_folder = os.path.join(root, f"{name}_{time.time_ns()}")
+        
+        tmp_folder = tempfile.mkdtemp(dir=root, suffix='.tmp')
+        try:
+            for filename, read in files:
+                with open(os.path.join(tmp_folder, os.path.basename(filename)), 'wb') as f:
+                    f.write(read())
+            os.replace(tmp_folder, staged_folder)
+        except BaseException:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+            raise
+        
+        return staged_folder
+    
+    @staticmethod
+    def restore_file(stream, name, faces=None):
+        """
+        Veritabanı dökümünü hazırla, doğrula ve tüm işçilerde etkinleştir
+        
+        Canlı veritabanı geri yükleme boyunca hizmet vermeye devam eder; geçiş yalnızca
+        işaretçi dosyasının atomik olarak değiştirilmesinden ibarettir.
+        
+        Args:
+            stream (dosya benzeri nesne): Veritabanı dökümü
+            name (str): Yedek adı
+            faces (str): stage_faces ile hazırlanan yüz fotoğrafı klasörü (geri yükleme
+                başarısız olursa silinir)
+            
+        Returns:
+            dict: Etkinleştirilen veritabanı işaretçisi
+        """
+        try:
+            url = BackupService.stage_database(stream, name)
+            BackupService.migrate_staged(url)
+            
+            db.session.close()
+            return DatabaseSwitch.activate(url, snapshot=name, faces=faces)
+        except BaseException:
+            if faces is not None:
+                shutil.rmtree(faces, ignore_errors=True)
+            raise
+    
+    @staticmethod
+    def restore_snapshot(manifest):
+        """
+        Yedeği geri yükle
+        
+        Fotoğraflar kopyalanmaz: içerik adresli arşiv, yedekteki tüm fotoğrafları içerdiği
+        için canlı depoda bulunmayanlar PhotoStore.locate ile doğrudan arşivden sunulur.
+        Eski düz klasördeki fotoğraflar yeni bir klasöre hazırlanıp veritabanıyla birlikte
+        etkinleştirilir.
+        
+        Args:
+            manifest (dict): Yedek manifesti
+            
+        Returns:
+            dict: Etkinleştirilen veritabanı işaretçisi
+        """
+        storage = get_storage()
+        database = manifest['database']
+        kind = BackupService.database_kind()
+        
+        if database['kind'] != kind:
+            raise RuntimeError(f"Yedek {database['kind']} veritabanına ait; mevcut veritabanı {kind}.")
+        
+        faces = BackupService.stage_faces(
+            ((filename, lambda key=key: storage.get(key)) for filename, key in manifest['legacy_faces'].items()),
+            manifest['name']
+        )
+        return BackupService.restore_file(storage.open(database['key']), manifest['name'], faces=faces)
+
+class _QueueWriter:
+    """tarfile çıktısını sınırlı kuyruk üzerinden akışa aktaran dosya benzeri nesne"""
+    
+    _DONE = object()
+    
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize)
+        self._cancelled = threading.Event()
+    
+    def write(self, data):
+        # Tüketici yavaşsa üretici bekler; indirme iptal edildiyse arşivleme durur
+        while True:
+            if self._cancelled.is_set():
+                raise IOError("Arşiv indirmesi iptal edildi.")
+            try:
+                self._queue.put(bytes(data), timeout=0.5)
+                return len(data)
+            except queue.Full:
+                continue
+    
+    def flush(self):
+        pass
+    
+    def finish(self, error=None):
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put((self._DONE, error), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def cancel(self):
+        self._cancelled.set()
+        # Bekleyen üreticiyi serbest bırak
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def chunks(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, tuple) and item[0] is self._DONE:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
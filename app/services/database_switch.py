@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from flask import current_app
+from sqlalchemy import create_engine
+from app import db
+
+class DatabaseSwitch:
+    """
+    Etkin veritabanını işaretçi dosyası üzerinden tüm işçilerde değiştiren servis
+    
+    Geri yükleme yeni bir veritabanı hazırlayıp işaretçiyi atomik olarak günceller; her
+    işçi istek başında işaretçinin sürümüne bakar ve değiştiyse motorunu yeni adrese geçirir.
+    Yeni motor app.extensions['database_switch'] içinde tutulur; oturum (RoutingSession) ve
+    DatabaseSwitch.engine() varsayılan motor yerine onu kullanır. Yedekle birlikte geri
+    yüklenen eski yüz fotoğraflarının klasörü de aynı işaretçiyle etkinleştirilir.
+    """
+    
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def state(app=None):
+        """Bu işçinin geçiş durumu: {'mtime', 'version', 'engine', 'faces'}"""
+        return (app or current_app).extensions.setdefault(
+            'database_switch', {'mtime': None, 'version': None, 'engine': None, 'faces': None}
+        )
+    
+    @staticmethod
+    def engine(app=None):
+        """
+        Bu işçinin etkin birincil veritabanı motoru
+        
+        db.engine yerine kullanılmalıdır: geri yüklemeden sonra db.engine eski veritabanını gösterir.
+        
+        Args:
+            app (Flask): Uygulama (None ise current_app)
+            
+        Returns:
+            Engine: Geri yüklemeyle değiştirildiyse yeni motor, değilse db.engine
+        """
+        engine = DatabaseSwitch.state(app)['engine']
+        return engine if engine is not None else db.engine
+    
+    @staticmethod
+    def faces_folder(app=None):
+        """
+        Eski düz klasördeki yüz fotoğraflarının etkin klasörü
+        
+        Args:
+            app (Flask): Uygulama (None ise current_app)
+            
+        Returns:
+            str: Geri yüklemeyle etkinleştirildiyse hazırlanan klasör, değilse UPLOAD_FOLDER
+        """
+        app = app or current_app
+        return DatabaseSwitch.state(app)['faces'] or app.config['UPLOAD_FOLDER']
+    
+    @staticmethod
+    def pointer_path(app=None):
+        return (app or current_app).config['DATABASE_POINTER_PATH']
+    
+    @staticmethod
+    def read_pointer(path):
+        """
+        İşaretçi dosyasını oku
+        
+        Args:
+            path (str): İşaretçi dosyası yolu
+            
+        Returns:
+            dict: {'version', 'url', 'snapshot', 'faces', 'activated_at'} veya dosya yoksa None
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def activate(url, snapshot=None, faces=None):
+        """
+        Yeni veritabanını etkinleştir
+        
+        Args:
+            url (str): Hazırlanmış veritabanının adresi
+            snapshot (str): Geri yüklenen yedeğin adı
+            faces (str): Yedekle birlikte hazırlanan yüz fotoğrafı klasörü (None: UPLOAD_FOLDER)
+            
+        Returns:
+            dict: Yazılan işaretçi
+        """
+        path = DatabaseSwitch.pointer_path()
+        pointer = {
+            'version': time.time_ns(),
+            'url': url,
+            'snapshot': snapshot,
+            'faces': faces,
+            'activated_at': time.time()
+        }
+        
+        folder = os.path.dirname(path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        
+        # Diğer işçiler yarım yazılmış işaretçi görmesin
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(pointer, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        DatabaseSwitch.sync(current_app._get_current_object())
+        return pointer
+    
+    @staticmethod
+    def sync(app):
+        """
+        İşaretçi değiştiyse bu işçinin motorunu yeni veritabanına geçir
+        
+        Args:
+            app (Flask): Uygulama
+        """
+        try:
+            mtime = os.stat(DatabaseSwitch.pointer_path(app)).st_mtime_ns
+        except OSError:
+            return
+        
+        state = DatabaseSwitch.state(app)
+        if state['mtime'] == mtime:
+            return
+        
+        with DatabaseSwitch._lock:
+            if state['mtime'] == mtime:
+                return
+            
+            pointer = DatabaseSwitch.read_pointer(DatabaseSwitch.pointer_path(app))
+            if pointer is not None and pointer['version'] != state['version']:
+                if pointer['url'] != app.config['SQLALCHEMY_DATABASE_URI']:
+                    DatabaseSwitch.swap_engine(app, pointer['url'])
+                state['faces'] = pointer.get('faces')
+                state['version'] = pointer['version']
+            state['mtime'] = mtime
+    
+    @staticmethod
+    def swap_engine(app, url):
+        """
+        Birincil veritabanı için verilen adreste yeni bir motor oluştur ve etkinleştir
+        
+        Devam eden istekler eski motordaki bağlantılarını bitirir; boştaki bağlantılar kapatılır.
+        
+        Args:
+            app (Flask): Uygulama
+            url (str): Yeni veritabanı adresi
+        """
+        app.config['SQLALCHEMY_DATABASE_URI'] = url
+        
+        state = DatabaseSwitch.state(app)
+        old_engine = state['engine'] if state['engine'] is not None else db.engines[None]
+        state['engine'] = create_engine(url, **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+        old_engine.dispose(close=False)
+        
+        # Okuma kopyası eski veritabanını yansıttığı için artık kullanılmaz
+        router = app.extensions.get('replica')
+        if router is not None:
+            router.disable("birincil veritabanı geri yüklenen veritabanıyla değiştirildi")
+        
+        app.logger.info(f"Veritabanı değiştirildi: {state['engine'].url.render_as_string(hide_password=True)}")
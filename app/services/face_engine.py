@@ -0,0 +1,90 @@
+import time
+import threading
+import numpy as np
+
+# face_recognition içe aktarılırken dlib ve model dosyaları yüklenir (saniyeler sürebilir);
+# bu yüzden yalnızca ilk tespit/kodlama çağrısında veya warm_up() ile yüklenir
+_module = None
+_lock = threading.Lock()
+
+class FaceEngine:
+    """face_recognition/dlib için tembel yüklenen cephe"""
+    
+    @staticmethod
+    def module():
+        """
+        face_recognition modülünü döndür (ilk çağrıda içe aktarılır)
+        
+        Returns:
+            module: face_recognition
+        """
+        global _module
+        if _module is None:
+            with _lock:
+                if _module is None:
+                    import face_recognition
+                    _module = face_recognition
+        return _module
+    
+    @staticmethod
+    def is_loaded():
+        """Modeller bu süreçte yüklendi mi"""
+        return _module is not None
+    
+    @staticmethod
+    def warm_up():
+        """
+        Modelleri yükle ve tespit/kodlama yollarını bir kez çalıştır
+        
+        Gunicorn ana sürecinde (preload) veya işçi başlangıcında çağrılır; böylece ilk
+        yoklama isteği model yükleme süresini ödemez.
+        
+        Returns:
+            float: Isıtma süresi (saniye)
+        """
+        started = time.perf_counter()
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        FaceEngine.face_locations(image)
+        FaceEngine.face_encodings(image, [(8, 56, 56, 8)])
+        return time.perf_counter() - started
+    
+    @staticmethod
+    def face_locations(image, number_of_times_to_upsample=1, model='hog'):
+        """
+        Görüntüdeki yüz konumlarını bul
+        
+        Returns:
+            list: (top, right, bottom, left) yüz konumları
+        """
+        return FaceEngine.module().face_locations(
+            image, number_of_times_to_upsample=number_of_times_to_upsample, model=model
+        )
+    
+    @staticmethod
+    def face_encodings(image, known_face_locations=None, num_jitters=1):
+        """
+        Verilen konumlardaki yüzleri 128 boyutlu vektörlere kodla
+        
+        Returns:
+            list: Yüz kodlamaları
+        """
+        return FaceEngine.module().face_encodings(image, known_face_locations, num_jitters=num_jitters)
+    
+    @staticmethod
+    def face_distance(face_encodings, face_to_compare):
+        """
+        Kodlamalar ile karşılaştırılan yüz arasındaki öklid uzaklıkları
+        
+        face_recognition.face_distance ile aynı hesaptır; eşleştirme dlib yüklemeden yapılır.
+        
+        Returns:
+            numpy.ndarray: Uzaklıklar
+        """
+        if len(face_encodings) == 0:
+            return np.empty((0,))
+        return np.linalg.norm(face_encodings - face_to_compare, axis=1)
+    
+    @staticmethod
+    def load_image_file(path):
+        """Görüntü dosyasını RGB dizi olarak yükle"""
+        return FaceEngine.module().load_image_file(path)
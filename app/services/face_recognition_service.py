@@ -1,61 +1,171 @@
-import os
 import json
-import base64
 import numpy as np
-import face_recognition
-from PIL import Image
-from io import BytesIO
+from datetime import datetime
 from flask import current_app
-from werkzeug.utils import secure_filename
+from app import db
+from app.models.attendance import AttendanceRecord, FaceDetection
+from app.services.analysis_cache import AnalysisCache, get_analysis_cache
+from app.services.gallery_snapshot import GalleryService
+from app.services.tiled_detection import detect_faces_tiled
+from app.services.image_loader import LoadedImage
+from app.services.face_engine import FaceEngine
+from app.services.photo_store import PhotoStore
+from app.services.request_timing import stage
+from app.services.admission import DeadlineExceeded, check_deadline
+from app.services.metrics import FACES_PER_PHOTO, MATCH_DISTANCE
+from app.utils.bulk import bulk_insert
+
+# Yüz eşleştirme eşiği (face_recognition varsayılanı)
+MATCH_TOLERANCE = 0.6
+
+# Desteklenen yüz tespiti modları
+DETECTION_MODES = ('auto', 'full', 'tiled')
 
 class FaceRecognitionService:
     """Yüz tanıma servisi"""
     
     @staticmethod
-    def save_face_photo(student_id, photo_file):
+    def model_version():
         """
-        Öğrencinin yüz fotoğrafını kaydet
+        Tespit ve kodlama yapılandırmasını tanımlayan sürüm bilgisini döndür
+        
+        Önbellekteki sonuçlar bu değer değiştiğinde geçersiz sayılır.
+        
+        Returns:
+            str: Sürüm bilgisi
+        """
+        config = current_app.config
+        return f"{config['FACE_MODEL_VERSION']}:max{config['FACE_DETECTION_MAX_SIDE']}"
+    
+    @staticmethod
+    def detect_face_locations(loaded, detection_mode='auto'):
+        """
+        Görüntüdeki yüz konumlarını bul
         
         Args:
-            student_id (int): Öğrenci ID
-            photo_file (FileStorage): Yüklenen fotoğraf dosyası
+            loaded (LoadedImage): Yüklenen görüntü
+            detection_mode (str): 'full' (küçültülmüş görüntüde tek seferde), 'tiled' (tam
+                çözünürlükte karolara bölünmüş, paralel) veya 'auto' (piksel sayısı eşiğin
+                üstündeyse karolu)
             
         Returns:
-            tuple: (başarı durumu, dosya yolu veya hata mesajı)
+            list: Tam çözünürlükteki (top, right, bottom, left) yüz konumları
         """
-        try:
-            # Dosya adını güvenli hale getir
-            filename = secure_filename(f"{student_id}.jpg")
+        config = current_app.config
+        
+        if detection_mode == 'auto':
+            detection_mode = 'tiled' if loaded.pixels >= config['TILED_DETECTION_MIN_PIXELS'] else 'full'
+        
+        with stage('decode'):
+            image = loaded.detection_array(None if detection_mode == 'tiled' else config['FACE_DETECTION_MAX_SIDE'])
+        
+        with stage('detect'):
+            if detection_mode == 'tiled':
+                locations = detect_faces_tiled(
+                    image,
+                    tile_size=config['TILED_DETECTION_TILE_SIZE'],
+                    overlap=config['TILED_DETECTION_OVERLAP'],
+                    workers=config['TILED_DETECTION_WORKERS']
+                )
+            else:
+                locations = FaceEngine.face_locations(image)
+        
+        FACES_PER_PHOTO.observe(len(locations))
+        return loaded.to_full_locations(locations)
+    
+    @staticmethod
+    def encode_faces(loaded, face_locations):
+        """
+        Yüzleri tam çözünürlüklü görüntünün yalnızca yüz bölgelerinden kodla
+        
+        Args:
+            loaded (LoadedImage): Yüklenen görüntü
+            face_locations (list): Tam çözünürlükteki yüz konumları
             
-            # Dosya yolunu oluştur
-            upload_folder = current_app.config['UPLOAD_FOLDER']
-            file_path = os.path.join(upload_folder, filename)
+        Returns:
+            numpy.ndarray: (N, 128) yüz kodlaması matrisi
+        """
+        with stage('encode'):
+            face_encodings = []
+            for crop, location in loaded.face_crops(face_locations):
+                # Kalabalık fotoğraflarda süre bütçesi yüzler arasında da kontrol edilir
+                check_deadline('encode')
+                face_encodings.append(FaceEngine.face_encodings(crop, [location])[0])
+        return np.array(face_encodings).reshape(len(face_locations), 128)
+    
+    @staticmethod
+    def analyze_photo(photo, with_encodings=True, detection_mode='auto'):
+        """
+        Fotoğraftaki yüzleri tespit et ve kodla (içerik özetine göre önbellekli)
+        
+        Args:
+            photo (UploadedPhoto): Yüklenen fotoğraf
+            with_encodings (bool): Yüz kodlamaları da gerekli mi
+            detection_mode (str): Tespit modu ('auto', 'full', 'tiled')
             
-            # Fotoğrafı kaydet
-            photo_file.save(file_path)
+        Returns:
+            dict: {'locations': list, 'encodings': numpy.ndarray veya None}
+        """
+        cache = get_analysis_cache()
+        key = AnalysisCache.make_key(photo.digest, f"{FaceRecognitionService.model_version()}:{detection_mode}")
+        
+        entry = cache.get(key)
+        if entry is not None and (entry['encodings'] is not None or not with_encodings):
+            return entry
+        
+        # Fotoğrafı yükle (yalnızca başlık okunur)
+        loaded = LoadedImage(photo.data)
+        
+        # Yüzleri bul (önbellekte konumlar varsa tekrar tespit etme)
+        if entry is not None:
+            face_locations = entry['locations']
+        else:
+            face_locations = FaceRecognitionService.detect_face_locations(loaded, detection_mode)
+        
+        # Yüz kodlamalarını oluştur
+        face_encodings = None
+        if with_encodings:
+            face_encodings = FaceRecognitionService.encode_faces(loaded, face_locations)
+        
+        entry = {'locations': face_locations, 'encodings': face_encodings}
+        cache.put(key, entry)
+        
+        return entry
+    
+    @staticmethod
+    def save_face_photo(photo):
+        """
+        Öğrencinin yüz fotoğrafını kaydet
+        
+        Args:
+            photo (UploadedPhoto): Yüklenen fotoğraf
             
-            # Fotoğrafta yüz olup olmadığını kontrol et
-            image = face_recognition.load_image_file(file_path)
-            face_locations = face_recognition.face_locations(image)
+        Returns:
+            tuple: (başarı durumu, (küçük resim URL'si, yüz kodlaması) veya hata mesajı)
+        """
+        try:
+            # Fotoğrafta yüz olup olmadığını kontrol et (kodlama yalnızca tek yüz varsa yapılır)
+            face_locations = FaceRecognitionService.analyze_photo(photo, with_encodings=False)['locations']
             
             if len(face_locations) == 0:
-                # Yüz bulunamadı, dosyayı sil
-                os.remove(file_path)
                 return False, "Fotoğrafta yüz bulunamadı."
             
             if len(face_locations) > 1:
-                # Birden fazla yüz bulundu, dosyayı sil
-                os.remove(file_path)
                 return False, "Fotoğrafta birden fazla yüz bulundu. Lütfen sadece bir yüz içeren fotoğraf yükleyin."
             
-            # Yüz kodlamasını oluştur ve kaydet
-            face_encoding = face_recognition.face_encodings(image)[0]
+            # Yüz kodlamasını al (önbellekteki konum yeniden tespit edilmez)
+            face_encoding = FaceRecognitionService.analyze_photo(photo)['encodings'][0]
             
-            # Statik URL'yi döndür
-            photo_url = f"/static/faces/{filename}"
+            # Fotoğraf, veritabanı işlemi tamamlandığında arka planda depoya yazılır
+            digest = PhotoStore.save(photo)
+            
+            # Listelerde gösterilen küçük resmin URL'sini döndür
+            photo_url = PhotoStore.url(digest, 'thumb')
             
             return True, (photo_url, face_encoding)
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             return False, str(e)
     
@@ -100,91 +210,230 @@ class FaceRecognitionService:
         return np.array(encoding_list)
     
     @staticmethod
-    def recognize_faces(photo_file, students):
+    def encoding_to_bytes(face_encoding):
+        """
+        Yüz kodlamasını veritabanında ikili olarak saklanabilir hale getir
+        
+        Args:
+            face_encoding (numpy.ndarray): Yüz kodlaması
+            
+        Returns:
+            bytes: float64 ham bayt dizisi
+        """
+        return np.asarray(face_encoding, dtype=np.float64).tobytes()
+    
+    @staticmethod
+    def encoding_from_bytes(data):
+        """
+        İkili yüz kodlamasını NumPy dizisine dönüştür
+        
+        Args:
+            data (bytes): float64 ham bayt dizisi
+            
+        Returns:
+            numpy.ndarray: Yüz kodlaması
+        """
+        return np.frombuffer(data, dtype=np.float64)
+    
+    @staticmethod
+    def match_faces(face_encodings, student_ids, student_encodings, tolerance=MATCH_TOLERANCE):
+        """
+        Yüz kodlamalarını galerideki öğrencilerle eşleştir
+        
+        Tespit ve kodlama adımlarından bağımsız, yalnızca uzaklık hesabı yapan
+        ucuz adımdır; kaydedilmiş yüz tespitleri için tekrar çalıştırılabilir.
+        
+        Args:
+            face_encodings (list): Fotoğraftaki yüz kodlamaları
+            student_ids (list): Galerideki öğrenci ID'leri
+            student_encodings (numpy.ndarray): Galerideki yüz kodlamaları
+            tolerance (float): Eşleşme eşiği
+            
+        Returns:
+            list: Her yüz için (öğrenci ID veya None, en yakın uzaklık veya None)
+        """
+        matches = []
+        
+        with stage('match'):
+            for face_encoding in face_encodings:
+                if len(student_ids) == 0:
+                    matches.append((None, None))
+                    continue
+                
+                # En yakın öğrenciyi bul
+                distances = FaceEngine.face_distance(student_encodings, face_encoding)
+                best_index = int(np.argmin(distances))
+                best_distance = float(distances[best_index])
+                MATCH_DISTANCE.observe(best_distance)
+                
+                if best_distance <= tolerance:
+                    matches.append((student_ids[best_index], best_distance))
+                else:
+                    matches.append((None, best_distance))
+        
+        return matches
+    
+    @staticmethod
+    def recognize_faces(photo, students, detection_mode='auto'):
         """
         Fotoğraftaki yüzleri tanı ve öğrencileri eşleştir
         
         Args:
-            photo_file (FileStorage): Yüklenen fotoğraf dosyası
+            photo (UploadedPhoto): Yüklenen fotoğraf
             students (list): Öğrenci listesi
+            detection_mode (str): Tespit modu ('auto', 'full', 'tiled')
             
         Returns:
-            tuple: (başarı durumu, tanınan öğrenciler listesi veya hata mesajı)
+            tuple: (başarı durumu, (tanınan öğrenciler listesi, yüz tespitleri) veya hata mesajı)
         """
         try:
-            # Fotoğrafı yükle
-            image = face_recognition.load_image_file(photo_file)
-            
-            # Yüzleri bul
-            face_locations = face_recognition.face_locations(image)
+            # Yüzleri bul ve kodla
+            analysis = FaceRecognitionService.analyze_photo(photo, detection_mode=detection_mode)
+            face_locations = analysis['locations']
+            face_encodings = analysis['encodings']
             
             if len(face_locations) == 0:
                 return False, "Fotoğrafta yüz bulunamadı."
             
-            # Yüz kodlamalarını oluştur
-            face_encodings = face_recognition.face_encodings(image, face_locations)
-            
-            # Tanınan öğrencileri sakla
-            recognized_students = []
-            
             # Öğrenci yüz kodlamalarını al
-            student_encodings = []
-            student_ids = []
-            
-            for student in students:
-                if student.face_encoding:
-                    # Kodlanmış yüzü çöz
-                    student_encoding = FaceRecognitionService.decode_face_encoding(student.face_encoding)
-                    student_encodings.append(student_encoding)
-                    student_ids.append(student.id)
+            student_ids, student_encodings = GalleryService.gallery_for(students)
             
             # Her bir yüz için eşleşme ara
-            for face_encoding in face_encodings:
-                # Yüzleri karşılaştır
-                matches = face_recognition.compare_faces(student_encodings, face_encoding, tolerance=0.6)
+            matches = FaceRecognitionService.match_faces(face_encodings, student_ids, student_encodings)
+            
+            # Tanınan öğrencileri ve yüz tespitlerini sakla
+            recognized_students = []
+            detections = []
+            
+            for face_location, face_encoding, (student_id, distance) in zip(face_locations, face_encodings, matches):
+                detections.append({
+                    'box': tuple(int(v) for v in face_location),
+                    'encoding': face_encoding,
+                    'student_id': student_id,
+                    'distance': distance
+                })
                 
-                # Eşleşme varsa
-                if True in matches:
-                    # İlk eşleşen öğrenciyi al
-                    match_index = matches.index(True)
-                    student_id = student_ids[match_index]
-                    
-                    # Öğrenciyi tanınan listeye ekle
-                    if student_id not in recognized_students:
-                        recognized_students.append(student_id)
-            
-            return True, recognized_students
+                # Öğrenciyi tanınan listeye ekle
+                if student_id is not None and student_id not in recognized_students:
+                    recognized_students.append(student_id)
+            
+            return True, (recognized_students, detections)
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             return False, str(e)
     
     @staticmethod
-    def save_attendance_photo(attendance_id, photo_file):
+    def save_face_detections(attendance_id, detections):
         """
-        Yoklama fotoğrafını kaydet
+        Yüz tespitlerini yoklamaya bağlı olarak kaydet
         
         Args:
             attendance_id (int): Yoklama ID
-            photo_file (FileStorage): Yüklenen fotoğraf dosyası
+            detections (list): recognize_faces tarafından döndürülen yüz tespitleri
+            
+        Returns:
+            list: Oluşturulan FaceDetection nesneleri
+        """
+        face_detections = []
+        
+        for detection in detections:
+            face_detection = FaceDetection(
+                attendance_id=attendance_id,
+                box=detection['box'],
+                encoding=FaceRecognitionService.encoding_to_bytes(detection['encoding']),
+                student_id=detection['student_id'],
+                distance=detection['distance']
+            )
+            db.session.add(face_detection)
+            face_detections.append(face_detection)
+        
+        return face_detections
+    
+    @staticmethod
+    def save_attendance_records(attendance_id, student_ids, present_ids, note=None):
+        """
+        Yoklamanın öğrenci kayıtlarını tek seferde ekle
+        
+        Kayıtlar ORM nesnesi oluşturulmadan oturumun bağlantısı üzerinden eklenir
+        (PostgreSQL'de COPY, diğer veritabanlarında çok satırlı INSERT); bu yüzden
+        oturumda AttendanceRecord nesnesi olarak görünmezler.
+        
+        Args:
+            attendance_id (int): Yoklama ID (flush edilmiş olmalı)
+            student_ids (iterable): Derse kayıtlı öğrenci ID'leri
+            present_ids (set): Tanınan öğrenci ID'leri
+            note (str): Tüm kayıtlara yazılacak not
+            
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        now = datetime.utcnow()
+        columns = ['attendance_id', 'student_id', 'status', 'emotion', 'note', 'created_at', 'updated_at']
+        rows = (
+            (attendance_id, student_id, 'PRESENT' if student_id in present_ids else 'ABSENT', None, note, now, now)
+            for student_id in student_ids
+        )
+        return bulk_insert(db.session.connection(), AttendanceRecord.__table__, columns, rows)
+    
+    @staticmethod
+    def rematch_attendance(attendance, students):
+        """
+        Kaydedilmiş yüz tespitlerini güncel galeriyle yeniden eşleştir
+        
+        Tespit ve kodlama tekrarlanmaz; yalnızca eşleştirme adımı çalışır.
+        
+        Args:
+            attendance (Attendance): Yoklama
+            students (list): Derse kayıtlı güncel öğrenci listesi
             
         Returns:
-            tuple: (başarı durumu, dosya yolu veya hata mesajı)
+            tuple: (başarı durumu, (önceki eşleşmeler, yeni eşleşmeler) veya hata mesajı)
         """
         try:
-            # Dosya adını güvenli hale getir
-            filename = secure_filename(f"attendance_{attendance_id}.jpg")
+            face_detections = FaceDetection.query.filter_by(attendance_id=attendance.id).all()
+            
+            if not face_detections:
+                return False, "Bu yoklama için kaydedilmiş yüz tespiti bulunamadı."
+            
+            previous_matches = {d.student_id for d in face_detections if d.student_id is not None}
             
-            # Dosya yolunu oluştur
-            upload_folder = current_app.config['UPLOAD_FOLDER']
-            file_path = os.path.join(upload_folder, filename)
+            # Güncel galeriyle eşleştir
+            student_ids, student_encodings = GalleryService.gallery_for(students)
+            face_encodings = [FaceRecognitionService.encoding_from_bytes(d.encoding) for d in face_detections]
+            matches = FaceRecognitionService.match_faces(face_encodings, student_ids, student_encodings)
             
-            # Fotoğrafı kaydet
-            photo_file.save(file_path)
+            for face_detection, (student_id, distance) in zip(face_detections, matches):
+                face_detection.student_id = student_id
+                face_detection.distance = distance
+            
+            current_matches = {student_id for student_id, _ in matches if student_id is not None}
+            
+            return True, (previous_matches, current_matches)
+            
+        except Exception as e:
+            return False, str(e)
+    
+    @staticmethod
+    def save_attendance_photo(photo):
+        """
+        Yoklama fotoğrafını kaydet
+        
+        Args:
+            photo (UploadedPhoto): Yüklenen fotoğraf
+            
+        Returns:
+            tuple: (başarı durumu, orta boy türev URL'si veya hata mesajı)
+        """
+        try:
+            # Fotoğraf, veritabanı işlemi tamamlandığında arka planda depoya yazılır
+            digest = PhotoStore.save(photo)
             
-            # Statik URL'yi döndür
-            photo_url = f"/static/faces/{filename}"
+            # Detay sayfasında gösterilen orta boy türevin URL'sini döndür
+            photo_url = PhotoStore.url(digest, 'medium')
             
             return True, photo_url
             
         except Exception as e:
-            return False, str(e) 
\ No newline at end of file
+            return False, str(e)
\ No newline at end of file
@@ -0,0 +1,152 @@
+import os
+import mimetypes
+from datetime import datetime, timezone
+from urllib.parse import quote
+from flask import current_app, request
+from werkzeug.datastructures import ContentRange
+from werkzeug.http import is_resource_modified
+
+# Dosyalar bu boyutta parçalarla okunur (file_wrapper yoksa)
+BLOCK_SIZE = 64 * 1024
+
+DELIVERY_MODES = ('app', 'x-accel', 'x-sendfile')
+
+def internal_uri(path):
+    """
+    Dosya yolunu nginx'in internal location adresine çevir
+    
+    Örnek nginx yapılandırması:
+        location /_protected/storage/ { internal; alias /app/instance/storage/; }
+    
+    Args:
+        path (str): Dosya yolu
+        
+    Returns:
+        str: Internal URI veya eşleşen konum yoksa None
+    """
+    path = os.path.realpath(path)
+    
+    for root, prefix in current_app.config['FILE_DELIVERY_ACCEL_LOCATIONS'].items():
+        relative = os.path.relpath(path, os.path.realpath(root))
+        if not relative.startswith('..'):
+            return prefix.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+    
+    return None
+
+def _iter_file(f, length):
+    """Dosyadan en fazla length bayt okuyup parça parça döndür"""
+    try:
+        while length > 0:
+            chunk = f.read(min(BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+def _file_body(f, length):
+    """
+    Yanıt gövdesini oluştur
+    
+    Sunucu wsgi.file_wrapper sağlıyorsa (ör. gunicorn) dosya, mevcut konumundan
+    Content-Length kadar os.sendfile ile kullanıcı alanına kopyalanmadan gönderilir.
+    """
+    file_wrapper = request.environ.get('wsgi.file_wrapper')
+    if file_wrapper is not None:
+        return file_wrapper(f, BLOCK_SIZE)
+    return _iter_file(f, length)
+
+def send_local_file(path, mimetype=None, etag=None, max_age=None, immutable=False, as_attachment=False, download_name=None):
+    """
+    Yerel dosyayı yapılandırılan teslim yöntemiyle gönder
+    
+    'x-accel' ve 'x-sendfile' modlarında gövdeyi ön sunucu (nginx, Apache) gönderir ve
+    işçi hemen serbest kalır; 'app' modunda Range destekli sendfile kullanılır.
+    
+    Args:
+        path (str): Dosya yolu
+        mimetype (str): MIME türü (None ise dosya adından tahmin edilir)
+        etag (str): ETag (None ise boyut ve değişiklik zamanından üretilir)
+        max_age (int): Cache-Control max-age (saniye)
+        immutable (bool): İçerik hiç değişmiyorsa True
+        as_attachment (bool): İndirme olarak gönder
+        download_name (str): İndirilen dosyanın adı
+        
+    Returns:
+        Response: Flask yanıtı
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+    download_name = download_name or os.path.basename(path)
+    
+    if mimetype is None:
+        mimetype = mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+    
+    if etag is None:
+        etag = f"{int(stat.st_mtime)}-{size}"
+    
+    response = current_app.response_class(mimetype=mimetype)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.accept_ranges = 'bytes'
+    
+    if max_age is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = immutable or None
+    
+    if as_attachment:
+        response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    
+    # Koşullu istek: istemcideki kopya güncelse gövde gönderilmez
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response.status_code = 304
+        return response
+    
+    mode = current_app.config['FILE_DELIVERY']
+    
+    if mode == 'x-accel':
+        uri = internal_uri(path)
+        if uri is not None:
+            # Range ve gövde nginx tarafından işlenir
+            response.headers['X-Accel-Redirect'] = uri
+            return response
+    
+    if mode == 'x-sendfile':
+        response.headers['X-Sendfile'] = os.path.realpath(path)
+        return response
+    
+    # Ön sunucu yoksa Range isteğini uygulama karşılar
+    start, stop = 0, size
+    byte_range = request.range
+    
+    if byte_range is not None and len(byte_range.ranges) == 1 and _if_range_matches(etag, last_modified):
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            response.status_code = 416
+            response.content_range = ContentRange('bytes', None, None, size)
+            return response
+        
+        start, stop = bounds
+        response.status_code = 206
+        response.content_range = ContentRange('bytes', start, stop, size)
+    
+    f = open(path, 'rb')
+    f.seek(start)
+    
+    response.response = _file_body(f, stop - start)
+    response.direct_passthrough = True
+    response.content_length = stop - start
+    
+    return response
+
+def _if_range_matches(etag, last_modified):
+    """If-Range başlığı yoksa veya dosyanın güncel sürümünü gösteriyorsa True"""
+    if_range = request.if_range
+    if if_range.etag is None and if_range.date is None:
+        return True
+    if if_range.etag is not None:
+        return if_range.etag == etag
+    return last_modified <= if_range.date
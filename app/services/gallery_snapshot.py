@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import struct
+import tempfile
+import threading
+import numpy as np
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect
+from app import db
+from app.models.student import Student
+from app.models.system_state import SystemState
+from app.services.metrics import GALLERY_CACHE
+from app.services.database_switch import DatabaseSwitch
+
+# Dosya biçimi: 64 baytlık başlık + float32 kodlama matrisi + int64 öğrenci ID dizisi
+SNAPSHOT_MAGIC = b'FAGALLRY'
+SNAPSHOT_FORMAT = 1
+HEADER = struct.Struct('<8sIIQQ')  # magic, biçim sürümü, boyut, kayıt sayısı, sürüm damgası
+HEADER_SIZE = 64
+ENCODING_DIM = 128
+
+# Veritabanındaki sürüm damgasının anahtarı
+VERSION_KEY = 'gallery_version'
+
+class GallerySnapshot:
+    """Salt okunur, bellek eşlemeli yüz galerisi anlık görüntüsü"""
+    
+    def __init__(self, stamp, student_ids, encodings):
+        self.stamp = stamp
+        self.student_ids = student_ids
+        self.encodings = encodings
+        # ID -> satır numarası
+        self._rows = {int(student_id): row for row, student_id in enumerate(student_ids)}
+    
+    @staticmethod
+    def write(path, stamp, student_ids, encodings):
+        """
+        Anlık görüntüyü diske atomik olarak yaz
+        
+        Args:
+            path (str): Dosya yolu
+            stamp (int): Sürüm damgası
+            student_ids (list): Öğrenci ID'leri
+            encodings (numpy.ndarray): (N, 128) yüz kodlaması matrisi
+        """
+        encodings = np.ascontiguousarray(encodings, dtype=np.float32).reshape(len(student_ids), ENCODING_DIM)
+        ids = np.ascontiguousarray(student_ids, dtype=np.int64)
+        
+        folder = os.path.dirname(path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        
+        # Okuyan işçiler yarım dosya görmesin diye geçici dosyaya yazıp yeniden adlandır
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, ENCODING_DIM, len(ids), stamp)
+                f.write(header.ljust(HEADER_SIZE, b'\0'))
+                f.write(encodings.tobytes())
+                f.write(ids.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    @classmethod
+    def open(cls, path):
+        """
+        Anlık görüntüyü salt okunur bellek eşlemesiyle aç
+        
+        Args:
+            path (str): Dosya yolu
+            
+        Returns:
+            GallerySnapshot: Anlık görüntü veya dosya yoksa/bozuksa None
+        """
+        try:
+            with open(path, 'rb') as f:
+                magic, fmt, dim, count, stamp = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        
+        if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT or dim != ENCODING_DIM:
+            return None
+        
+        if count == 0:
+            return cls(stamp, np.empty(0, dtype=np.int64), np.empty((0, dim), dtype=np.float32))
+        
+        # Tüm işçiler aynı fiziksel sayfaları paylaşır
+        encodings = np.memmap(path, dtype=np.float32, mode='r', offset=HEADER_SIZE, shape=(count, dim))
+        student_ids = np.memmap(path, dtype=np.int64, mode='r', offset=HEADER_SIZE + count * dim * 4, shape=(count,))
+        
+        return cls(stamp, student_ids, encodings)
+    
+    def subset(self, student_ids):
+        """
+        Verilen öğrencilere ait galeri satırlarını döndür
+        
+        Args:
+            student_ids (iterable): Öğrenci ID'leri (ör. derse kayıtlı öğrenciler)
+            
+        Returns:
+            tuple: (öğrenci ID listesi, yüz kodlaması matrisi)
+        """
+        rows = [self._rows[student_id] for student_id in student_ids if student_id in self._rows]
+        return [int(self.student_ids[row]) for row in rows], np.asarray(self.encodings[rows], dtype=np.float64)
+    
+    def __len__(self):
+        return len(self.student_ids)
+
+class GalleryService:
+    """Yüz galerisi anlık görüntüsü servisi"""
+    
+    # İşçi sürecinde yüklü anlık görüntü
+    _snapshot = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def snapshot_path():
+        return current_app.config['GALLERY_SNAPSHOT_PATH']
+    
+    @staticmethod
+    def rebuild(stamp=None):
+        """
+        Anlık görüntüyü veritabanından yeniden oluştur ve sürüm damgasını güncelle
+        
+        Args:
+            stamp (int): Kullanılacak sürüm damgası (None ise yeni damga üretilir)
+            
+        Returns:
+            GallerySnapshot: Yeni anlık görüntü
+        """
+        new_stamp = stamp if stamp is not None else time.time_ns()
+        
+        with DatabaseSwitch.engine().begin() as connection:
+            rows = connection.execute(
+                db.select(Student.id, Student.face_encoding)
+                .where(Student.face_encoding.isnot(None))
+                .order_by(Student.id)
+            ).all()
+            
+            student_ids = [row.id for row in rows]
+            encodings = np.array([json.loads(row.face_encoding) for row in rows], dtype=np.float32).reshape(len(rows), ENCODING_DIM)
+            
+            GallerySnapshot.write(GalleryService.snapshot_path(), new_stamp, student_ids, encodings)
+            
+            if stamp is None:
+                SystemState.write(connection, VERSION_KEY, str(new_stamp))
+        
+        return GallerySnapshot.open(GalleryService.snapshot_path())
+    
+    @staticmethod
+    def get_snapshot():
+        """
+        Güncel anlık görüntüyü döndür
+        
+        Veritabanındaki sürüm damgası yüklü olandan farklıysa dosya yeniden eşlenir;
+        dosya da eskiyse veritabanından yeniden oluşturulur.
+        
+        Returns:
+            GallerySnapshot: Anlık görüntü
+        """
+        with DatabaseSwitch.engine().connect() as connection:
+            stamp = SystemState.read(connection, VERSION_KEY)
+        
+        with GalleryService._lock:
+            snapshot = GalleryService._snapshot
+            
+            if stamp is not None and snapshot is not None and snapshot.stamp == int(stamp):
+                GALLERY_CACHE.labels(result='hit').inc()
+                return snapshot
+            
+            GALLERY_CACHE.labels(result='miss').inc()
+            snapshot = GallerySnapshot.open(GalleryService.snapshot_path())
+            
+            if snapshot is None or stamp is None or snapshot.stamp != int(stamp):
+                snapshot = GalleryService.rebuild(stamp=int(stamp) if stamp is not None else None)
+            
+            GalleryService._snapshot = snapshot
+            return snapshot
+    
+    @staticmethod
+    def gallery_for(students):
+        """
+        Öğrenci listesine ait eşleştirme galerisini döndür
+        
+        Args:
+            students (list): Öğrenci listesi
+            
+        Returns:
+            tuple: (öğrenci ID listesi, yüz kodlaması matrisi)
+        """
+        return GalleryService.get_snapshot().subset(student.id for student in students)
+
+@event.listens_for(Session, 'after_flush')
+def _mark_gallery_dirty(session, flush_context):
+    """Yüz kodlaması değişen veya silinen öğrencileri işaretle"""
+    for obj in session.new:
+        if isinstance(obj, Student) and obj.face_encoding is not None:
+            session.info['gallery_dirty'] = True
+            return
+    
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            session.info['gallery_dirty'] = True
+            return
+    
+    for obj in session.dirty:
+        if isinstance(obj, Student) and inspect(obj).attrs.face_encoding.history.has_changes():
+            session.info['gallery_dirty'] = True
+            return
+
+@event.listens_for(Session, 'after_commit')
+def _rebuild_gallery(session):
+    """Yüz kodlamaları değiştiyse anlık görüntüyü yeniden yaz"""
+    if session.info.pop('gallery_dirty', False):
+        try:
+            GalleryService.rebuild()
+        except Exception as e:
+            # Bir sonraki okuma damga uyuşmazlığını görüp yeniden oluşturur
+            current_app.logger.warning(f"Galeri anlık görüntüsü oluşturulamadı: {str(e)}")
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_gallery_dirty(session):
+    session.info.pop('gallery_dirty', None)
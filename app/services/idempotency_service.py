@@ -0,0 +1,243 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from functools import wraps
+from flask import current_app, request, jsonify, make_response, g
+from flask_jwt_extended import get_jwt_identity
+from app.services.photo_upload import UploadedPhoto
+
+class IdempotencyService:
+    """Idempotency-Key başlığı ile tekrarlanan isteklerin yanıtlarını saklama servisi"""
+    
+    # Bu süreçte süresi dolmuş kayıtların son temizlendiği zaman
+    _last_prune = 0.0
+    
+    @staticmethod
+    def _folder():
+        folder = current_app.config['IDEMPOTENCY_FOLDER']
+        os.makedirs(folder, exist_ok=True)
+        return folder
+    
+    @staticmethod
+    def _path(scope, key):
+        name = hashlib.sha256(f"{scope}:{key}".encode('utf-8')).hexdigest()
+        return os.path.join(IdempotencyService._folder(), f"{name}.json")
+    
+    @staticmethod
+    def _write(path, entry, exclusive=False):
+        """
+        Kaydı yarım yazılmış dosya görünmeyecek şekilde yaz
+        
+        Args:
+            path (str): Kayıt dosyası
+            entry (dict): Kayıt
+            exclusive (bool): True ise dosya zaten varsa yazılmaz
+        
+        Returns:
+            bool: Kayıt yazıldıysa True
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            if not exclusive:
+                os.replace(tmp_path, path)
+                return True
+            try:
+                # link, hedef varsa başarısız olur: aynı anahtarı yalnızca bir istek alabilir
+                os.link(tmp_path, path)
+                return True
+            except FileExistsError:
+                return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def get_response(scope, key, digest):
+        """
+        Daha önce kaydedilmiş yanıtı getir
+        
+        Süresi dolmuş kayıtlar ve yarıda kalmış (süreci sonlanmış) istek işaretleri silinir.
+        
+        Args:
+            scope (str): Anahtarın geçerli olduğu kapsam (kullanıcı + endpoint)
+            key (str): Idempotency-Key değeri
+            digest (str): İstekteki fotoğrafın SHA-256 özeti
+        
+        Returns:
+            tuple: (başarı durumu, (yanıt gövdesi, durum kodu) veya hata mesajı/None);
+                istek hâlâ işleniyorsa (False, None)
+        """
+        path = IdempotencyService._path(scope, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+        
+        # Süresi dolmuş kayıtları ve yarıda kalmış işaretleri sil
+        age = time.time() - stored['created_at']
+        in_flight = stored['status'] is None
+        if age > current_app.config['IDEMPOTENCY_TTL'] or (in_flight and age > current_app.config['IDEMPOTENCY_IN_FLIGHT_TTL']):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return False, None
+        
+        # Aynı anahtar farklı bir fotoğrafla kullanılamaz
+        if stored['digest'] != digest:
+            return False, "Bu Idempotency-Key farklı bir fotoğrafla kullanılmış."
+        
+        if in_flight:
+            return False, None
+        
+        return True, (stored['body'], stored['status'])
+    
+    @staticmethod
+    def claim(scope, key, digest):
+        """
+        İsteği işlemeye başlarken anahtar için "işleniyor" işareti bırak
+        
+        Aynı anahtarla eşzamanlı gelen tekrar denemelerinden yalnızca biri işareti alabilir.
+        
+        Args:
+            scope (str): Anahtarın geçerli olduğu kapsam (kullanıcı + endpoint)
+            key (str): Idempotency-Key değeri
+            digest (str): İstekteki fotoğrafın SHA-256 özeti
+        
+        Returns:
+            bool: İşaret alındıysa True, anahtar başka bir istekteyse False
+        """
+        return IdempotencyService._write(IdempotencyService._path(scope, key), {
+            'digest': digest,
+            'status': None,
+            'body': None,
+            'created_at': time.time()
+        }, exclusive=True)
+    
+    @staticmethod
+    def release(scope, key):
+        """
+        Yanıtı saklanmayan (başarısız) isteğin işaretini kaldır; tekrar deneme yeniden işlenir
+        
+        Args:
+            scope (str): Anahtarın geçerli olduğu kapsam (kullanıcı + endpoint)
+            key (str): Idempotency-Key değeri
+        """
+        try:
+            os.remove(IdempotencyService._path(scope, key))
+        except OSError:
+            pass
+    
+    @staticmethod
+    def save_response(scope, key, digest, body, status):
+        """
+        Yanıtı tekrar denemelerde döndürülmek üzere kaydet
+        
+        Kayıt, süresi dolmuş kayıtlar en fazla IDEMPOTENCY_PRUNE_INTERVAL saniyede bir
+        temizlenerek yazılır.
+        
+        Args:
+            scope (str): Anahtarın geçerli olduğu kapsam (kullanıcı + endpoint)
+            key (str): Idempotency-Key değeri
+            digest (str): İstekteki fotoğrafın SHA-256 özeti
+            body (dict): Yanıt gövdesi
+            status (int): HTTP durum kodu
+        """
+        try:
+            IdempotencyService._write(IdempotencyService._path(scope, key), {
+                'digest': digest,
+                'status': status,
+                'body': body,
+                'created_at': time.time()
+            })
+        except OSError as e:
+            current_app.logger.warning(f"Idempotency yanıtı kaydedilemedi: {str(e)}")
+        
+        if time.time() - IdempotencyService._last_prune > current_app.config['IDEMPOTENCY_PRUNE_INTERVAL']:
+            IdempotencyService._last_prune = time.time()
+            IdempotencyService.prune()
+    
+    @staticmethod
+    def prune():
+        """
+        Süresi dolmuş kayıtları ve yarıda kalmış geçici dosyaları sil
+        
+        Kayıt dosyası yalnızca bir kez yazıldığı için yaşı değiştirilme zamanından ölçülür.
+        
+        Returns:
+            int: Silinen dosya sayısı
+        """
+        folder = IdempotencyService._folder()
+        now = time.time()
+        removed = 0
+        
+        for name in os.listdir(folder):
+            if name.endswith('.json'):
+                ttl = current_app.config['IDEMPOTENCY_TTL']
+            elif name.endswith('.tmp'):
+                ttl = current_app.config['IDEMPOTENCY_IN_FLIGHT_TTL']
+            else:
+                continue
+            
+            path = os.path.join(folder, name)
+            try:
+                if now - os.stat(path).st_mtime > ttl:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        
+        return removed
+
+def idempotent(fn):
+    """
+    Fotoğraflı POST endpoint'leri için dekoratör: Idempotency-Key ile tekrarlanan istekte
+    önceki yanıtı döndür
+    
+    Yüz tanıma sırasına girmeden önce kontrol edilmesi için @admission_controlled'ın
+    üstüne yazılmalıdır. İşlenmekte olan anahtarla gelen tekrar denemeleri 409 alır;
+    yalnızca başarılı (2xx) yanıtlar saklanır.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key or 'photo' not in request.files:
+            return fn(*args, **kwargs)
+        
+        # Fotoğraf bir kez okunur; görünüm fonksiyonu g.uploaded_photo'yu kullanır
+        photo = UploadedPhoto.from_file(request.files['photo'])
+        g.uploaded_photo = photo
+        scope = ':'.join([str(get_jwt_identity()), fn.__name__] + [str(v) for v in list(args) + list(kwargs.values())])
+        
+        found, stored = IdempotencyService.get_response(scope, key, photo.digest)
+        if not found and stored is None and not IdempotencyService.claim(scope, key, photo.digest):
+            # Anahtarı başka bir istek aldı: tamamlanmışsa yanıtı döndürülür
+            found, stored = IdempotencyService.get_response(scope, key, photo.digest)
+            if not found and stored is None:
+                response = jsonify(error="Bu Idempotency-Key ile gönderilen istek hâlâ işleniyor.")
+                response.status_code = 409
+                response.headers['Retry-After'] = '1'
+                return response
+        if found:
+            body, status = stored
+            return jsonify(body), status
+        if stored:
+            return jsonify(error=stored), 422
+        
+        try:
+            response = make_response(fn(*args, **kwargs))
+        except BaseException:
+            IdempotencyService.release(scope, key)
+            raise
+        
+        if 200 <= response.status_code < 300 and response.is_json:
+            IdempotencyService.save_response(scope, key, photo.digest, response.get_json(), response.status_code)
+        else:
+            IdempotencyService.release(scope, key)
+        return response
+    return wrapper
@@ -0,0 +1,127 @@
+from io import BytesIO
+import numpy as np
+from PIL import Image, ImageOps
+
+# EXIF yönlendirme etiketi
+EXIF_ORIENTATION = 0x0112
+
+class LoadedImage:
+    """
+    Yüklenen fotoğrafı tespit için küçültülmüş, kodlama için tam çözünürlükte çözen katman
+    
+    JPEG dosyalarında tespit görüntüsü PIL draft() ile DCT alanında (1/2, 1/4, 1/8
+    ölçekte) çözülür; tam çözünürlüklü çözme yalnızca yüz kodlaması gerektiğinde yapılır.
+    Tüm koordinatlar EXIF yönlendirmesi uygulanmış (dik) görüntüye göredir.
+    """
+    
+    def __init__(self, data):
+        self.data = data
+        self._full = None
+        self.detection_size = None
+        
+        # Yalnızca başlığı oku; piksel verisi çözülmez
+        with Image.open(BytesIO(data)) as img:
+            self.format = img.format
+            self.orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+            width, height = img.size
+        
+        # 5-8 arası yönlendirmeler 90 derece döndürme içerir
+        if self.orientation in (5, 6, 7, 8):
+            width, height = height, width
+        self.size = (width, height)
+    
+    @property
+    def pixels(self):
+        return self.size[0] * self.size[1]
+    
+    def _open(self):
+        return Image.open(BytesIO(self.data))
+    
+    def detection_array(self, max_side=None):
+        """
+        Yüz tespiti için RGB görüntü dizisini döndür
+        
+        Args:
+            max_side (int): Uzun kenarın en fazla piksel sayısı (None/0 ise tam çözünürlük)
+            
+        Returns:
+            numpy.ndarray: RGB görüntü
+        """
+        img = self._open()
+        downscale = bool(max_side) and max(img.size) > max_side
+        
+        if downscale and self.format == 'JPEG':
+            factor = max_side / max(img.size)
+            # İstenen boyuttan küçük olmayan en yakın DCT ölçeğinde çöz
+            img.draft('RGB', (max(int(img.size[0] * factor), 1), max(int(img.size[1] * factor), 1)))
+        
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        
+        if downscale and max(img.size) > max_side:
+            img.thumbnail((max_side, max_side))
+        elif not downscale:
+            # Tam çözünürlükte çözüldüyse kodlama için tekrar çözme
+            self._full = img
+        
+        self.detection_size = img.size
+        return np.array(img)
+    
+    def full_image(self):
+        """Tam çözünürlüklü, dik çevrilmiş PIL görüntüsünü (tembel olarak) döndür"""
+        if self._full is None:
+            self._full = ImageOps.exif_transpose(self._open()).convert('RGB')
+        return self._full
+    
+    def to_full_locations(self, locations):
+        """
+        Tespit görüntüsündeki yüz konumlarını tam çözünürlük koordinatlarına çevir
+        
+        Args:
+            locations (list): (top, right, bottom, left) konumları
+            
+        Returns:
+            list: Tam çözünürlükteki konumlar
+        """
+        if self.detection_size is None or self.detection_size == self.size:
+            return [tuple(int(v) for v in location) for location in locations]
+        
+        sx = self.size[0] / self.detection_size[0]
+        sy = self.size[1] / self.detection_size[1]
+        width, height = self.size
+        
+        return [
+            (
+                max(int(round(top * sy)), 0),
+                min(int(round(right * sx)), width),
+                min(int(round(bottom * sy)), height),
+                max(int(round(left * sx)), 0)
+            )
+            for top, right, bottom, left in locations
+        ]
+    
+    def face_crops(self, locations, margin=0.5):
+        """
+        Tam çözünürlüklü görüntüden yüz çevresindeki bölgeleri kes
+        
+        Tüm görüntü yerine yalnızca yüz bölgeleri NumPy dizisine çevrilir.
+        
+        Args:
+            locations (list): Tam çözünürlükteki (top, right, bottom, left) konumları
+            margin (float): Yüz boyutuna göre eklenecek kenar payı
+            
+        Returns:
+            list: (kesit dizisi, kesit içindeki konum) çiftleri
+        """
+        full = self.full_image()
+        width, height = full.size
+        crops = []
+        
+        for top, right, bottom, left in locations:
+            pad = int(max(bottom - top, right - left) * margin)
+            crop_top, crop_left = max(top - pad, 0), max(left - pad, 0)
+            crop_bottom, crop_right = min(bottom + pad, height), min(right + pad, width)
+            
+            crop = np.array(full.crop((crop_left, crop_top, crop_right, crop_bottom)))
+            crops.append((crop, (top - crop_top, right - crop_left, bottom - crop_top, left - crop_left)))
+        
+        return crops
@@ -0,0 +1,232 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from flask import current_app
+from app import db
+from app.models.attendance import Attendance
+from app.services.admission import get_limiter
+from app.services.photo_upload import UploadedPhoto
+from app.services.photo_store import PhotoStore
+from app.services.storage import get_storage
+from app.services.emotion_recognition_service import EmotionRecognitionService
+from app.services.metrics import EMOTION_DEFERRED, EMOTION_BACKFILL_QUEUE
+
+logger = logging.getLogger(__name__)
+
+EMOTION_MODES = ('auto', 'inline', 'deferred')
+
+# Yoğunluk düşene kadar ertelenen işin kontrol aralığı (saniye)
+BACKFILL_POLL_INTERVAL = 1.0
+
+class LoadMonitor:
+    """Bu işçi sürecinin anlık yük sinyalleri"""
+    
+    _lock = threading.Lock()
+    _in_flight = 0
+    
+    @classmethod
+    def request_started(cls):
+        with cls._lock:
+            cls._in_flight += 1
+    
+    @classmethod
+    def request_finished(cls):
+        with cls._lock:
+            cls._in_flight -= 1
+    
+    @classmethod
+    def signals(cls):
+        """
+        Yük sinyallerini döndür
+        
+        Returns:
+            dict: {'queue_depth': yüz tanıma sırasındaki istek sayısı,
+                   'utilization': diğer isteklerle meşgul iş parçacığı oranı,
+                   'recent_p95': son yüz tanıma isteklerinin p95 süresi (saniye)}
+        """
+        limiter = get_limiter()
+        threads = current_app.config['WORKER_THREADS']
+        with cls._lock:
+            # Sinyali soran istek hariç tutulur; tek iş parçacıklı işçi hiçbir zaman dolu sayılmaz
+            busy = max(cls._in_flight - 1, 0)
+        return {
+            'queue_depth': limiter.waiting,
+            'utilization': busy / max(threads - 1, 1),
+            'recent_p95': limiter.recent_p95()
+        }
+    
+    @classmethod
+    def pressure(cls):
+        """
+        Sistem yoğunsa aşılan sinyalin adını döndür
+        
+        Returns:
+            str: 'queue_depth', 'utilization', 'recent_p95' veya yoğunluk yoksa None
+        """
+        config = current_app.config
+        signals = cls.signals()
+        
+        if signals['queue_depth'] >= config['LOAD_SHED_QUEUE_DEPTH']:
+            return 'queue_depth'
+        if signals['utilization'] >= config['LOAD_SHED_UTILIZATION']:
+            return 'utilization'
+        if signals['recent_p95'] is not None and signals['recent_p95'] >= config['LOAD_SHED_P95']:
+            return 'recent_p95'
+        return None
+    
+    @classmethod
+    def should_defer_emotions(cls):
+        """Duygu analizi bu istekte ertelenmeli mi (EMOTION_ANALYSIS_MODE'a göre)"""
+        mode = current_app.config['EMOTION_ANALYSIS_MODE']
+        if mode == 'inline':
+            return False
+        if mode == 'deferred':
+            return True
+        
+        reason = cls.pressure()
+        if reason is not None:
+            current_app.logger.info(f"Duygu analizi ertelendi (yoğunluk sinyali: {reason})")
+            return True
+        return False
+
+class EmotionBackfill:
+    """Ertelenen duygu analizlerini arka plan iş parçacığında tamamlayan kuyruk"""
+    
+    def __init__(self, app):
+        self.app = app
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='emotion-backfill', daemon=True)
+        self._thread.start()
+    
+    def submit(self, attendance_id, photo=None, detection_mode='auto'):
+        """
+        Yoklamanın duygu analizini kuyruğa ekle
+        
+        Args:
+            attendance_id (int): Yoklama ID'si (işlem tamamlanmış olmalı)
+            photo (UploadedPhoto): Bellekteki fotoğraf (None ise depodan okunur)
+            detection_mode (str): Tespit modu
+        """
+        EMOTION_BACKFILL_QUEUE.inc()
+        self._queue.put((attendance_id, photo, detection_mode))
+    
+    def flush(self):
+        """Kuyruktaki tüm işler bitene kadar bekle"""
+        self._queue.join()
+    
+    def _run(self):
+        while True:
+            attendance_id, photo, detection_mode = self._queue.get()
+            try:
+                with self.app.app_context():
+                    self._wait_for_capacity()
+                    EmotionBackfill.process(attendance_id, photo, detection_mode)
+            except Exception as e:
+                logger.error(f"Ertelenen duygu analizi başarısız (yoklama {attendance_id}): {str(e)}")
+            finally:
+                EMOTION_BACKFILL_QUEUE.dec()
+                self._queue.task_done()
+    
+    def _wait_for_capacity(self):
+        """Yoğunluk sürerken (en fazla EMOTION_BACKFILL_MAX_DELAY saniye) bekle"""
+        waited = 0.0
+        while waited < self.app.config['EMOTION_BACKFILL_MAX_DELAY'] and get_limiter().waiting > 0:
+            time.sleep(BACKFILL_POLL_INTERVAL)
+            waited += BACKFILL_POLL_INTERVAL
+    
+    @staticmethod
+    def process(attendance_id, photo=None, detection_mode='auto'):
+        """
+        Bekleyen yoklamanın duygu analizini yap ve kaydet
+        
+        Args:
+            attendance_id (int): Yoklama ID'si
+            photo (UploadedPhoto): Bellekteki fotoğraf (None ise depodan okunur)
+            detection_mode (str): Tespit modu
+            
+        Returns:
+            str: Yoklamanın yeni duygu analizi durumu veya bekleyen değilse None
+        """
+        attendance = Attendance.query.get(attendance_id)
+        if attendance is None or attendance.emotion_status != 'pending':
+            return None
+        
+        if photo is None:
+            photo = EmotionBackfill.load_photo(attendance)
+        
+        if photo is None:
+            attendance.emotion_status = 'failed'
+        else:
+            success, emotion_data = EmotionRecognitionService.analyze_emotions(photo, detection_mode=detection_mode)
+            if success:
+                attendance.emotion_data = emotion_data
+            attendance.emotion_status = 'done' if success else 'failed'
+        
+        db.session.commit()
+        return attendance.emotion_status
+    
+    @staticmethod
+    def load_photo(attendance):
+        """Yoklama fotoğrafının orijinalini depodan oku (bulunamazsa None)"""
+        digest = PhotoStore.digest_from_url(attendance.photo_url)
+        if digest is None:
+            return None
+        
+        storage = get_storage()
+        key = PhotoStore.locate(storage, PhotoStore.original_key(digest))
+        if key is None:
+            return None
+        return UploadedPhoto(storage.get(key))
+    
+    @staticmethod
+    def pending_ids():
+        """Duygu analizi bekleyen yoklamaların ID'leri (en eskiden yeniye)"""
+        return [
+            attendance_id for (attendance_id,) in
+            db.session.query(Attendance.id).filter_by(emotion_status='pending').order_by(Attendance.id)
+        ]
+
+# Süreç başına kuyruk (gunicorn işçileri fork sonrası kendi iş parçacığını başlatır)
+_backfill = None
+_backfill_pid = None
+_backfill_lock = threading.Lock()
+
+def get_emotion_backfill():
+    """Bu sürece ait duygu analizi kuyruğunu döndür"""
+    global _backfill, _backfill_pid
+    with _backfill_lock:
+        if _backfill is None or _backfill_pid != os.getpid():
+            _backfill = EmotionBackfill(current_app._get_current_object())
+            _backfill_pid = os.getpid()
+            atexit.register(_backfill.flush)
+        return _backfill
+
+def defer_emotions(attendance_id, photo, detection_mode='auto'):
+    """
+    İşlemi tamamlanmış yoklamanın duygu analizini arka plan kuyruğuna gönder
+    
+    Args:
+        attendance_id (int): Yoklama ID'si
+        photo (UploadedPhoto): Yoklama fotoğrafı
+        detection_mode (str): Tespit modu
+    """
+    EMOTION_DEFERRED.inc()
+    get_emotion_backfill().submit(attendance_id, photo, detection_mode)
+
+def init_load_shedding(app):
+    """
+    Yük sinyallerini toplayan istek kancalarını uygulamaya bağla
+    
+    Args:
+        app (Flask): Uygulama
+    """
+    @app.before_request
+    def count_request_started():
+        LoadMonitor.request_started()
+    
+    @app.teardown_request
+    def count_request_finished(error=None):
+        LoadMonitor.request_finished()
@@ -0,0 +1,213 @@
+import os
+import time
+from flask import g, request, Response
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+# Gunicorn işçileri PROMETHEUS_MULTIPROC_DIR ayarlıysa değerleri bu klasördeki mmap
+# dosyalarına yazar; /metrics tüm işçilerin dosyalarını birleştirir
+MULTIPROCESS = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    "HTTP isteklerinin süresi",
+    ['blueprint', 'route', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    "İşlenmekte olan HTTP istekleri",
+    multiprocess_mode='livesum'
+)
+FACES_PER_PHOTO = Histogram(
+    'face_detection_faces_per_photo',
+    "Fotoğraf başına tespit edilen yüz sayısı",
+    buckets=(0, 1, 2, 5, 10, 20, 30, 50, 75, 100, 150)
+)
+MATCH_DISTANCE = Histogram(
+    'face_match_distance',
+    "Yüzün galerideki en yakın öğrenciye uzaklığı",
+    buckets=(0.2, 0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.8, 1.0)
+)
+GALLERY_CACHE = Counter(
+    'gallery_snapshot_requests_total',
+    "Galeri anlık görüntüsü istekleri (hit: işçideki kopya güncel)",
+    ['result']
+)
+PIPELINE_STAGE = Histogram(
+    'face_pipeline_stage_seconds',
+    "Yüz tanıma hattı aşamalarının süresi",
+    ['stage'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+EMOTION_ANALYSIS = Histogram(
+    'emotion_analysis_duration_seconds',
+    "Fotoğraf başına duygu analizi süresi",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+RECOGNITION_ACTIVE = Gauge(
+    'recognition_requests_active',
+    "Çalışmakta olan yüz tanıma istekleri",
+    multiprocess_mode='livesum'
+)
+RECOGNITION_WAITING = Gauge(
+    'recognition_requests_waiting',
+    "Yüz tanıma sırasında bekleyen istekler",
+    multiprocess_mode='livesum'
+)
+ADMISSION_REJECTED = Counter(
+    'recognition_requests_rejected_total',
+    "Kapasite veya süre bütçesi nedeniyle reddedilen yüz tanıma istekleri",
+    ['reason']
+)
+EMOTION_DEFERRED = Counter(
+    'emotion_analysis_deferred_total',
+    "Yoğunluk nedeniyle arka plana ertelenen duygu analizleri"
+)
+EMOTION_BACKFILL_QUEUE = Gauge(
+    'emotion_backfill_queue_depth',
+    "Arka planda bekleyen duygu analizi işleri",
+    multiprocess_mode='livesum'
+)
+POOL_CHECKOUT = Histogram(
+    'db_pool_checkout_seconds',
+    "Bağlantı havuzundan bağlantı alma süresi",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+POOL_TIMEOUTS = Counter(
+    'db_pool_checkout_timeouts_total',
+    "pool_timeout süresinde bağlantı alınamayan istekler"
+)
+POOL_CONNECTIONS = Gauge(
+    'db_pool_connections',
+    "Havuzdaki veritabanı bağlantıları (open: açık, checked_out: kullanımda)",
+    ['state'],
+    multiprocess_mode='livesum'
+)
+SQLITE_WRITE_LOCK = Histogram(
+    'sqlite_write_lock_wait_seconds',
+    "SQLite yazma kilidini (BEGIN IMMEDIATE) alma süresi",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+SQLITE_WRITE_RETRIES = Counter(
+    'sqlite_write_lock_retries_total',
+    "Kilitli veritabanı nedeniyle yeniden denenen SQLite yazma işlemleri"
+)
+REPLICA_LAG = Gauge(
+    'db_replica_lag_seconds',
+    "Okuma kopyasının son ölçülen gecikmesi",
+    multiprocess_mode='max'
+)
+DATABASE_ROUTED = Counter(
+    'db_read_requests_total',
+    "Okuma kopyasına yönlendirilebilen isteklerin gönderildiği veritabanı",
+    ['target']
+)
+REPLICA_FALLBACK = Counter(
+    'db_replica_fallback_total',
+    "Birincil veritabanına geri dönen salt okunur istekler",
+    ['reason']
+)
+
+def registry():
+    """/metrics için kayıt defterini döndür (çok süreçli modda işçi dosyaları birleştirilir)"""
+    if not MULTIPROCESS:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+def mark_process_dead(pid):
+    """Sonlanan işçinin canlı gösterge dosyalarını temizle (gunicorn child_exit kancası)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
+
+def _time_pool_connect(pool):
+    """Havuzun connect metodunu bekleme süresini ölçecek şekilde sar"""
+    connect = pool.connect
+    
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - started)
+    
+    pool.connect = timed_connect
+    pool._checkout_timed = True
+
+@event.listens_for(Pool, 'checkout')
+def _instrument_pool(dbapi_connection, connection_record, connection_proxy):
+    # Veritabanı değişiminde oluşturulan havuzlar dahil her havuz ilk kullanımda sarılır
+    pool = connection_proxy._pool
+    if not getattr(pool, '_checkout_timed', False):
+        _time_pool_connect(pool)
+    POOL_CONNECTIONS.labels(state='checked_out').inc()
+
+@event.listens_for(Pool, 'checkin')
+def _count_checkin(dbapi_connection, connection_record):
+    # Geçersiz kılınan bağlantılar dbapi_connection=None ile geri verilir
+    POOL_CONNECTIONS.labels(state='checked_out').dec()
+
+@event.listens_for(Pool, 'connect')
+def _count_connect(dbapi_connection, connection_record):
+    POOL_CONNECTIONS.labels(state='open').inc()
+
+@event.listens_for(Pool, 'close')
+def _count_close(dbapi_connection, connection_record):
+    POOL_CONNECTIONS.labels(state='open').dec()
+
+@event.listens_for(Pool, 'close_detached')
+def _count_close_detached(dbapi_connection):
+    POOL_CONNECTIONS.labels(state='open').dec()
+
+def init_metrics(app):
+    """
+    İstek metriklerini ve /metrics uç noktasını uygulamaya bağla
+    
+    Args:
+        app (Flask): Uygulama
+    """
+    if not app.config['METRICS_ENABLED']:
+        return
+    
+    @app.before_request
+    def start_request_metrics():
+        if request.endpoint == 'metrics':
+            return
+        g.metrics_started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+    
+    @app.teardown_request
+    def finish_request_metrics(error=None):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        
+        REQUESTS_IN_FLIGHT.dec()
+        rule = request.url_rule.rule if request.url_rule is not None else '<eşleşmedi>'
+        status = g.pop('metrics_status', 500 if error is not None else 200)
+        REQUEST_LATENCY.labels(
+            blueprint=request.blueprint or '',
+            route=rule,
+            method=request.method,
+            status=str(status)
+        ).observe(time.perf_counter() - started)
+    
+    @app.after_request
+    def record_response_status(response):
+        if 'metrics_started' in g:
+            g.metrics_status = response.status_code
+        return response
+    
+    @app.route('/metrics', endpoint='metrics')
+    def metrics():
+        return Response(generate_latest(registry()), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,205 @@
+import re
+from io import BytesIO
+from PIL import Image, ImageOps
+from app.services.photo_writer import schedule_photo_task
+from app.services.storage import get_storage
+
+# Türev boyutları (uzun kenar, piksel)
+VARIANTS = {
+    'thumb': 256,   # Listeler
+    'medium': 1024  # Detay sayfaları
+}
+
+# Türev biçimleri: uzantı -> (PIL biçimi, MIME türü, kaydetme seçenekleri)
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True})
+}
+
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# Depodaki fotoğraf anahtarlarının öneki
+PHOTO_PREFIX = 'photos/'
+
+# Tüm yedeklerin paylaştığı içerik adresli fotoğraf arşivi (canlı anahtarlarla aynı düzen)
+ARCHIVE_PREFIX = 'backups/objects/'
+
+class PhotoStore:
+    """İçerik özetine göre adreslenen, alt klasörlere dağıtılmış fotoğraf deposu"""
+    
+    @staticmethod
+    def is_digest(value):
+        return bool(DIGEST_PATTERN.match(value))
+    
+    @staticmethod
+    def shard_key(digest, suffix=''):
+        """
+        Özetin ilk dört karakterine göre iki seviyeli alt klasörlü anahtarı oluştur
+        
+        Args:
+            digest (str): SHA-256 özeti
+            suffix (str): Dosya adı eki
+            
+        Returns:
+            str: Nesne anahtarı (ör. photos/ab/cd/abcd...ef_thumb.webp)
+        """
+        return f"{PHOTO_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+    
+    @staticmethod
+    def original_key(digest):
+        return PhotoStore.shard_key(digest, '.orig')
+    
+    @staticmethod
+    def derivative_key(digest, variant, ext):
+        return PhotoStore.shard_key(digest, f"_{variant}.{ext}")
+    
+    @staticmethod
+    def archive_key(key):
+        """Canlı depodaki fotoğraf anahtarının yedek arşivindeki karşılığı"""
+        return ARCHIVE_PREFIX + key[len(PHOTO_PREFIX):]
+    
+    @staticmethod
+    def locate(storage, key):
+        """
+        Fotoğraf nesnesini canlı depoda, yoksa yedek arşivinde bul
+        
+        Geri yüklenen veritabanı, canlı depodan silinmiş fotoğraflara başvurabilir; bu
+        fotoğraflar kopyalanmadan doğrudan arşivden sunulur.
+        
+        Args:
+            storage (Storage): Depolama sürücüsü
+            key (str): Canlı depodaki anahtar
+            
+        Returns:
+            str: Nesnenin bulunduğu anahtar veya hiçbir yerde yoksa None
+        """
+        if storage.exists(key):
+            return key
+        
+        archived = PhotoStore.archive_key(key)
+        if storage.exists(archived):
+            return archived
+        
+        return None
+    
+    @staticmethod
+    def digest_from_url(url):
+        """
+        Fotoğraf URL'sindeki içerik özetini döndür
+        
+        Args:
+            url (str): '/api/photos/<özet>/<tür>' biçiminde URL
+            
+        Returns:
+            str: SHA-256 özeti veya URL bu biçimde değilse None
+        """
+        parts = (url or '').strip('/').split('/')
+        if len(parts) == 4 and parts[:2] == ['api', 'photos'] and PhotoStore.is_digest(parts[2]):
+            return parts[2]
+        return None
+    
+    @staticmethod
+    def url(digest, variant='original'):
+        """
+        Fotoğrafın veya türevinin URL'sini döndür
+        
+        Args:
+            digest (str): SHA-256 özeti
+            variant (str): 'original', 'thumb' veya 'medium'
+            
+        Returns:
+            str: URL
+        """
+        return f"/api/photos/{digest}/{variant}"
+    
+    @staticmethod
+    def save(photo):
+        """
+        Fotoğrafı veritabanı işlemi tamamlandığında depoya yazılmak üzere işaretle
+        
+        Orijinal yazıldıktan sonra türevler aynı arka plan işinde üretilir.
+        
+        Args:
+            photo (UploadedPhoto): Yüklenen fotoğraf
+            
+        Returns:
+            str: Fotoğrafın içerik özeti
+        """
+        schedule_photo_task(PhotoStore.store, get_storage(), photo.digest, photo.data)
+        return photo.digest
+    
+    @staticmethod
+    def store(storage, digest, data):
+        """
+        Orijinali yaz ve eksik türevleri üret (arka plan işi, uygulama bağlamı gerekmez)
+        
+        Args:
+            storage (Storage): Depolama sürücüsü
+            digest (str): SHA-256 özeti
+            data (bytes): Fotoğraf baytları
+        """
+        # Aynı içerik daha önce yüklendiyse tekrar yazılmaz
+        key = PhotoStore.original_key(digest)
+        if not storage.exists(key):
+            with Image.open(BytesIO(data)) as img:
+                content_type = Image.MIME.get(img.format)
+            storage.put(key, data, content_type=content_type)
+        
+        for variant, max_side in VARIANTS.items():
+            for ext in FORMATS:
+                key = PhotoStore.derivative_key(digest, variant, ext)
+                if not storage.exists(key):
+                    storage.put(key, PhotoStore.render(data, max_side, ext), content_type=FORMATS[ext][1])
+    
+    @staticmethod
+    def render(data, max_side, ext):
+        """
+        Küçültülmüş türevi oluştur
+        
+        Args:
+            data (bytes): Orijinal fotoğraf baytları
+            max_side (int): Uzun kenarın en fazla piksel sayısı
+            ext (str): 'webp' veya 'jpg'
+            
+        Returns:
+            bytes: Kodlanmış türev
+        """
+        img = Image.open(BytesIO(data))
+        
+        # JPEG'i hedef boyuta en yakın DCT ölçeğinde çöz
+        if img.format == 'JPEG':
+            img.draft('RGB', (max_side, max_side))
+        
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        img.thumbnail((max_side, max_side))
+        
+        pil_format, _, options = FORMATS[ext]
+        output = BytesIO()
+        img.save(output, pil_format, **options)
+        return output.getvalue()
+    
+    @staticmethod
+    def ensure_derivative(digest, variant, ext):
+        """
+        Türevin anahtarını döndür; henüz üretilmediyse eşzamanlı olarak üret
+        
+        Args:
+            digest (str): SHA-256 özeti
+            variant (str): 'thumb' veya 'medium'
+            ext (str): 'webp' veya 'jpg'
+            
+        Returns:
+            str: Nesne anahtarı veya orijinal yoksa None
+        """
+        storage = get_storage()
+        key = PhotoStore.derivative_key(digest, variant, ext)
+        found = PhotoStore.locate(storage, key)
+        if found is not None:
+            return found
+        
+        original = PhotoStore.locate(storage, PhotoStore.original_key(digest))
+        if original is None:
+            return None
+        
+        storage.put(key, PhotoStore.render(storage.get(original), VARIANTS[variant], ext), content_type=FORMATS[ext][1])
+        return key
@@ -0,0 +1,64 @@
+import hashlib
+from io import BytesIO
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+class UploadedPhoto:
+    """Yüklenen fotoğrafın baytları ve içerik özeti"""
+    
+    def __init__(self, data, filename=None):
+        self.data = data
+        self.filename = filename
+        # Aynı fotoğrafın tekrar yüklenmesini tanımak için SHA-256 özeti
+        self.digest = hashlib.sha256(data).hexdigest()
+    
+    @classmethod
+    def from_file(cls, photo_file):
+        """
+        Yüklenen dosyayı bir kez okuyup fotoğraf nesnesi oluştur
+        
+        Args:
+            photo_file (FileStorage): Yüklenen fotoğraf dosyası
+            
+        Returns:
+            UploadedPhoto: Fotoğraf nesnesi
+        """
+        stream = photo_file.stream
+        if isinstance(stream, BytesIO):
+            return cls(stream.getvalue(), filename=photo_file.filename)
+        
+        photo_file.seek(0)
+        return cls(photo_file.read(), filename=photo_file.filename)
+    
+    def open(self):
+        """Fotoğraf baytlarını dosya benzeri nesne olarak döndür"""
+        return BytesIO(self.data)
+    
+    def __len__(self):
+        return len(self.data)
+    
+    def __repr__(self):
+        return f'<UploadedPhoto {self.digest[:12]} {len(self.data)}B>'
+
+class BoundedBuffer(BytesIO):
+    """Belirlenen boyutu aşınca yazmayı reddeden bellek içi tampon"""
+    
+    def __init__(self, limit=None):
+        super().__init__()
+        self.limit = limit
+    
+    def write(self, b):
+        if self.limit is not None and self.tell() + len(b) > self.limit:
+            raise RequestEntityTooLarge()
+        return super().write(b)
+
+class UploadRequest(Request):
+    """
+    Çok parçalı yüklemeleri geçici dosya yerine bellekte tutan istek sınıfı
+    
+    Werkzeug 500KB üzerindeki dosyaları geçici dosyaya yazar; fotoğraflar zaten
+    bellekten çözüldüğü için tampon, MAX_CONTENT_LENGTH ile sınırlı bellekte tutulur.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return BoundedBuffer(self.max_content_length)
@@ -0,0 +1,129 @@
+import os
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# Oturumda bekleyen yazmaların anahtarı
+PENDING_KEY = 'pending_photos'
+
+class PhotoWriter:
+    """Fotoğraf yazma ve türev üretme işlerini arka plan iş parçacığında çalıştıran servis"""
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='photo-writer', daemon=True)
+        self._thread.start()
+    
+    @staticmethod
+    def write_atomic(path, data):
+        """
+        Baytları geçici dosyaya yazıp yeniden adlandırarak kaydet
+        
+        Args:
+            path (str): Hedef dosya yolu
+            data (bytes): Dosya içeriği
+        """
+        folder = os.path.dirname(path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        
+        # Okuyanlar yarım yazılmış dosya görmesin
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def submit(self, path, data):
+        """
+        Yazma işini kuyruğa ekle
+        
+        Args:
+            path (str): Hedef dosya yolu
+            data (bytes): Dosya içeriği
+        """
+        self.submit_task(PhotoWriter.write_atomic, path, data)
+    
+    def submit_task(self, func, *args):
+        """
+        Herhangi bir dosya işini kuyruğa ekle
+        
+        Args:
+            func (callable): Uygulama bağlamı gerektirmeyen iş fonksiyonu
+            *args: Fonksiyon argümanları
+        """
+        self._queue.put((func, args))
+    
+    def flush(self):
+        """Kuyruktaki tüm yazmalar bitene kadar bekle"""
+        self._queue.join()
+    
+    def _run(self):
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Fotoğraf işi başarısız ({func.__name__}): {str(e)}")
+            finally:
+                self._queue.task_done()
+
+# Süreç başına yazıcı (gunicorn işçileri fork sonrası kendi iş parçacığını başlatır)
+_writer = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+def get_photo_writer():
+    """Bu sürece ait fotoğraf yazıcısını döndür"""
+    global _writer, _writer_pid
+    with _writer_lock:
+        if _writer is None or _writer_pid != os.getpid():
+            _writer = PhotoWriter()
+            _writer_pid = os.getpid()
+            atexit.register(_writer.flush)
+        return _writer
+
+def schedule_photo_write(path, data):
+    """
+    Fotoğrafı geçerli veritabanı işlemi başarıyla tamamlandığında yazılmak üzere işaretle
+    
+    İşlem geri alınırsa dosya hiç yazılmaz.
+    
+    Args:
+        path (str): Hedef dosya yolu
+        data (bytes): Dosya içeriği
+    """
+    schedule_photo_task(PhotoWriter.write_atomic, path, data)
+
+def schedule_photo_task(func, *args):
+    """
+    Dosya işini geçerli veritabanı işlemi başarıyla tamamlandığında çalıştırılmak üzere işaretle
+    
+    Args:
+        func (callable): Uygulama bağlamı gerektirmeyen iş fonksiyonu
+        *args: Fonksiyon argümanları
+    """
+    db.session.info.setdefault(PENDING_KEY, []).append((func, args))
+
+@event.listens_for(Session, 'after_commit')
+def _write_pending_photos(session):
+    """İşlem tamamlandıysa bekleyen fotoğrafları yazıcıya gönder"""
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        writer = get_photo_writer()
+        for func, args in pending:
+            writer.submit_task(func, *args)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_photos(session):
+    session.info.pop(PENDING_KEY, None)
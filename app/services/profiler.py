@@ -0,0 +1,248 @@
+import os
+import io
+import re
+import json
+import time
+import pstats
+import cProfile
+import datetime
+import threading
+import tracemalloc
+from flask import g, request, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from app.models.user import User
+
+# İstek profili '?_profile=1' veya 'X-Profile: 1' ile istenir; değer profilleyiciyi seçebilir
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'X-Profile'
+# Bellek zirvesi ölçümü: '?_profile_memory=1' veya 'X-Profile-Memory: 1'
+MEMORY_PARAM = '_profile_memory'
+MEMORY_HEADER = 'X-Profile-Memory'
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+# Özette gösterilen en pahalı fonksiyon sayısı
+SUMMARY_FUNCTIONS = 25
+
+# cProfile ve tracemalloc süreç genelinde tek örnek çalıştırabilir; aynı anda tek istek profillenir
+_lock = threading.Lock()
+
+def _requested(param, header):
+    value = request.args.get(param) or request.headers.get(header)
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return None
+    return value.lower()
+
+def _is_admin():
+    """İstek geçerli bir admin token'ı taşıyor mu (doğrulama hataları yoksayılmaz)"""
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except Exception:
+        return False
+    if user_id is None:
+        return False
+    user = User.query.get(user_id)
+    return user is not None and user.role == 'admin'
+
+def _profile_name():
+    endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'unknown')
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    return f"{stamp}_{endpoint}"
+
+class RequestProfile:
+    """Tek bir isteğin profilleyici ve bellek ölçümü durumu"""
+    
+    def __init__(self, kind, memory):
+        self.kind = kind
+        self.memory = memory
+        self.profiler = None
+        self.started = None
+        self.status = None
+    
+    def start(self):
+        if self.kind == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise RuntimeError("pyinstrument profili için pyinstrument gerekli: pip install pyinstrument")
+            self.profiler = Profiler(async_mode='disabled')
+        else:
+            self.profiler = cProfile.Profile()
+        
+        # Başka bir araç (ör. benchmark) zaten izliyorsa onun ölçümü bozulmaz
+        self.memory = self.memory and not tracemalloc.is_tracing()
+        if self.memory:
+            tracemalloc.start()
+        
+        if self.kind == 'pyinstrument':
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+        
+        self.started = time.perf_counter()
+    
+    def stop(self):
+        duration = time.perf_counter() - self.started
+        
+        if self.kind == 'pyinstrument':
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+        
+        peak = None
+        if self.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        
+        return duration, peak
+    
+    def save(self, folder, name, duration, peak):
+        """
+        Profili ve özet bilgisini klasöre yaz
+        
+        cProfile için pstats dosyası (.prof; snakeviz veya 'python -m pstats' ile açılır),
+        pyinstrument için etkileşimli HTML (.html) yazılır; yanında .json özet bulunur.
+        
+        Returns:
+            dict: Özet bilgi
+        """
+        os.makedirs(folder, exist_ok=True)
+        
+        if self.kind == 'pyinstrument':
+            filename = f"{name}.html"
+            with open(os.path.join(folder, filename), 'w', encoding='utf-8') as f:
+                f.write(self.profiler.output_html())
+            top = None
+        else:
+            filename = f"{name}.prof"
+            self.profiler.dump_stats(os.path.join(folder, filename))
+            
+            output = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=output)
+            stats.sort_stats('cumulative').print_stats(SUMMARY_FUNCTIONS)
+            top = output.getvalue()
+        
+        summary = {
+            'name': name,
+            'file': filename,
+            'profiler': self.kind,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': self.status,
+            'duration_ms': round(duration * 1000, 1),
+            'peak_memory_kb': round(peak / 1024, 1) if peak is not None else None,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'top_functions': top
+        }
+        with open(os.path.join(folder, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        
+        return summary
+
+class ProfileService:
+    """Kaydedilmiş istek profillerini yöneten servis"""
+    
+    @staticmethod
+    def folder():
+        return current_app.config['PROFILE_FOLDER']
+    
+    @staticmethod
+    def list_profiles():
+        """
+        Kaydedilmiş profillerin özetlerini listele
+        
+        Returns:
+            list: En yeniden eskiye özet sözlükleri ('top_functions' hariç)
+        """
+        folder = ProfileService.folder()
+        if not os.path.isdir(folder):
+            return []
+        
+        profiles = []
+        for filename in sorted(os.listdir(folder), reverse=True):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(folder, filename), 'r', encoding='utf-8') as f:
+                    summary = json.load(f)
+            except (OSError, ValueError):
+                continue
+            summary.pop('top_functions', None)
+            profiles.append(summary)
+        return profiles
+    
+    @staticmethod
+    def prune(keep):
+        """En yeni keep profil dışındakileri sil"""
+        folder = ProfileService.folder()
+        names = sorted({os.path.splitext(f)[0] for f in os.listdir(folder)}, reverse=True)
+        for name in names[keep:]:
+            for extension in ('.json', '.prof', '.html'):
+                path = os.path.join(folder, name + extension)
+                if os.path.exists(path):
+                    os.unlink(path)
+
+def init_profiling(app):
+    """
+    Admin isteklerinde istek bazlı profillemeyi uygulamaya bağla
+    
+    Yeniden başlatma gerekmeden tek bir istek cProfile (varsayılan) veya pyinstrument
+    (?_profile=pyinstrument, kuruluysa) altında çalıştırılır; istenirse tracemalloc ile
+    bellek zirvesi de ölçülür. Profil adı X-Profile-Id başlığında döner.
+    
+    Args:
+        app (Flask): Uygulama
+    """
+    if not app.config['PROFILING_ENABLED']:
+        return
+    
+    @app.before_request
+    def start_profile():
+        kind = _requested(PROFILE_PARAM, PROFILE_HEADER)
+        if kind is None or not _is_admin():
+            return
+        if kind not in PROFILERS:
+            kind = 'cprofile'
+        
+        # Başka bir istek profilleniyorsa bu istek normal çalışır
+        if not _lock.acquire(blocking=False):
+            current_app.logger.warning("Profil atlandı: başka bir istek profilleniyor")
+            return
+        
+        try:
+            profile = RequestProfile(kind, _requested(MEMORY_PARAM, MEMORY_HEADER) is not None)
+            profile.start()
+        except Exception as e:
+            _lock.release()
+            current_app.logger.warning(f"Profil başlatılamadı: {str(e)}")
+            return
+        
+        g.request_profile = profile
+        g.request_profile_name = _profile_name()
+    
+    @app.after_request
+    def add_profile_header(response):
+        profile = g.get('request_profile')
+        if profile is not None:
+            profile.status = response.status_code
+            response.headers['X-Profile-Id'] = g.request_profile_name
+        return response
+    
+    @app.teardown_request
+    def finish_profile(error=None):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return
+        
+        try:
+            duration, peak = profile.stop()
+            if profile.status is None:
+                profile.status = 500 if error is not None else 200
+            profile.save(ProfileService.folder(), g.pop('request_profile_name'), duration, peak)
+            ProfileService.prune(app.config['PROFILE_KEEP'])
+        except Exception as e:
+            current_app.logger.warning(f"Profil kaydedilemedi: {str(e)}")
+        finally:
+            _lock.release()
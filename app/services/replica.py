@@ -0,0 +1,154 @@
+import time
+import logging
+import threading
+from flask import g, request
+from sqlalchemy import text
+from app.services.metrics import REPLICA_LAG, DATABASE_ROUTED, REPLICA_FALLBACK
+
+logger = logging.getLogger(__name__)
+
+# Okuma kopyasının SQLALCHEMY_BINDS anahtarı
+REPLICA_BIND = 'replica'
+
+# Okuma kopyasına yönlendirilebilen HTTP yöntemleri
+READ_METHODS = ('GET', 'HEAD')
+
+ROUTING_MODES = ('decorator', 'method')
+
+# Kopyanın gecikmesini (saniye) ölçen sorgular; listede olmayan veritabanlarında (ör. SQLite
+# dosya kopyası) yalnızca erişilebilirlik denetlenir. PostgreSQL'de alınan tüm WAL uygulanmışsa
+# gecikme 0 sayılır; aksi halde boşta duran birincil sunucu gecikme gibi görünürdü.
+LAG_QUERIES = {
+    'postgresql': (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    )
+}
+
+def replica_read(fn):
+    """
+    Endpoint'i salt okunur olarak işaretle: GET istekleri okuma kopyasından okunur
+    
+    @bp.route'un hemen altına yazılmalıdır (işaret görünüm fonksiyonunda aranır).
+    """
+    fn.database = 'replica'
+    return fn
+
+def primary_read(fn):
+    """
+    Endpoint'i her zaman birincil veritabanından oku (REPLICA_ROUTING='method' iken
+    yazdıktan hemen sonra okunması gereken GET endpoint'leri için)
+    
+    @bp.route'un hemen altına yazılmalıdır.
+    """
+    fn.database = 'primary'
+    return fn
+
+def measure_lag(engine):
+    """
+    Okuma kopyasının gecikmesini ölç
+    
+    Args:
+        engine (Engine): Okuma kopyası motoru
+        
+    Returns:
+        float: Gecikme (saniye) veya kopyaya erişilemiyorsa None
+    """
+    query = LAG_QUERIES.get(engine.dialect.name, 'SELECT 0')
+    try:
+        with engine.connect() as connection:
+            return float(connection.execute(text(query)).scalar() or 0)
+    except Exception as e:
+        logger.warning(f"Okuma kopyasına erişilemedi: {str(e)}")
+        return None
+
+class ReplicaRouter:
+    """
+    Okuma kopyasının kullanılabilirliğine karar veren yönlendirici
+    
+    Gecikme en fazla check_interval saniyede bir ölçülür; kopya max_lag saniyeden fazla
+    gerideyse veya erişilemiyorsa istekler birincil veritabanına döner.
+    """
+    
+    def __init__(self, max_lag, check_interval):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag = None
+        self.disabled = None
+        self._checked = None
+        self._lock = threading.Lock()
+    
+    def disable(self, reason):
+        """Kopyayı bu süreçte kullanım dışı bırak (ör. birincil veritabanı değiştirildiğinde)"""
+        self.disabled = reason
+        logger.warning(f"Okuma kopyası devre dışı: {reason}")
+    
+    def status(self, engine):
+        """
+        Kopyanın kullanılabilirliği
+        
+        Args:
+            engine (Engine): Okuma kopyası motoru
+            
+        Returns:
+            str: Kullanılabilirse None, değilse nedeni ('disabled', 'unreachable', 'lag')
+        """
+        if self.disabled is not None:
+            return 'disabled'
+        
+        with self._lock:
+            now = time.monotonic()
+            if self._checked is None or now - self._checked >= self.check_interval:
+                self.lag = measure_lag(engine)
+                self._checked = now
+                if self.lag is not None:
+                    REPLICA_LAG.set(self.lag)
+            lag = self.lag
+        
+        if lag is None:
+            return 'unreachable'
+        if lag > self.max_lag:
+            return 'lag'
+        return None
+
+def wants_replica(app, view):
+    """İstek okuma kopyasına yönlendirilmeli mi (HTTP yöntemi, işaret ve REPLICA_ROUTING'e göre)"""
+    if request.method not in READ_METHODS:
+        return False
+    
+    database = getattr(view, 'database', None)
+    if database == 'primary':
+        return False
+    return database == 'replica' or app.config['REPLICA_ROUTING'] == 'method'
+
+def init_replica(app, db):
+    """
+    Salt okunur istekleri okuma kopyasına yönlendiren kancayı uygulamaya bağla
+    
+    DATABASE_REPLICA_URL ayarlı değilse hiçbir şey yapılmaz. Yönlendirilen isteklerde
+    g.db_replica ayarlanır; oturum (RoutingSession) sorguları kopyaya, flush'ları birincil
+    veritabanına gönderir.
+    
+    Args:
+        app (Flask): Uygulama
+        db (SQLAlchemy): Veritabanı nesnesi
+    """
+    if not app.config.get('DATABASE_REPLICA_URL'):
+        return
+    
+    router = ReplicaRouter(app.config['REPLICA_MAX_LAG'], app.config['REPLICA_LAG_CHECK_INTERVAL'])
+    app.extensions['replica'] = router
+    
+    @app.before_request
+    def route_reads():
+        if not wants_replica(app, app.view_functions.get(request.endpoint)):
+            return
+        
+        reason = router.status(db.engines[REPLICA_BIND])
+        if reason is not None:
+            REPLICA_FALLBACK.labels(reason=reason).inc()
+            DATABASE_ROUTED.labels(target='primary').inc()
+            return
+        
+        g.db_replica = True
+        DATABASE_ROUTED.labels(target='replica').inc()
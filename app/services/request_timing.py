@@ -0,0 +1,194 @@
+import json
+import time
+import logging
+from contextlib import contextmanager
+from flask import g, request, current_app, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.metrics import PIPELINE_STAGE
+from app.services.admission import check_deadline
+
+logger = logging.getLogger('app.request')
+slow_query_logger = logging.getLogger('app.slow_query')
+
+# Yavaş sorgu kaydında parametrelerin en fazla uzunluğu
+MAX_PARAMS_LENGTH = 500
+
+# SLOW_QUERY_LOG_PARAMS açıkken bu uzunluğu aşan metin/bayt değerleri (parola özetleri,
+# sıfırlama anahtarları, yüz kodlamaları) maskelenir
+MAX_PARAM_VALUE_LENGTH = 32
+
+class RequestTiming:
+    """Bir isteğin SQL ve aşama süreleri"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.stages = {}
+    
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+    
+    def server_timing(self, total):
+        """
+        Server-Timing başlık değerini oluştur
+        
+        Args:
+            total (float): İsteğin toplam süresi (saniye)
+            
+        Returns:
+            str: ör. 'db;dur=12.3;desc="5 sorgu", detect;dur=80.1, total;dur=101.0'
+        """
+        metrics = [f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} sorgu"']
+        metrics += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ', '.join(metrics)
+
+def current_timing():
+    """Etkin isteğin zamanlama kaydını döndür (istek dışında None)"""
+    if not has_request_context():
+        return None
+    return g.get('request_timing')
+
+@contextmanager
+def stage(name):
+    """
+    Kod bloğunun süresini isteğin adlandırılmış aşamasına ve aşama metriğine ekle
+    
+    İsteğin süre bütçesi dolduysa aşama başlamadan DeadlineExceeded fırlatılır.
+    İstek dışında (CLI, arka plan işleri) yalnızca metrik güncellenir.
+    
+    Args:
+        name (str): Aşama adı (ör. 'detect')
+    """
+    check_deadline(name)
+    timing = current_timing()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PIPELINE_STAGE.labels(stage=name).observe(elapsed)
+        if timing is not None:
+            timing.add_stage(name, elapsed)
+
+def describe_parameters(parameters):
+    """
+    Sorgu parametrelerini değerleri göstermeden özetle
+    
+    Args:
+        parameters: DBAPI parametreleri (tuple, dict veya executemany için bunların listesi)
+        
+    Returns:
+        dict: {'count': parametre (executemany'de satır) sayısı, 'types': ilk satırın değer tipleri}
+    """
+    rows = parameters if isinstance(parameters, list) else [parameters]
+    first = rows[0] if rows else ()
+    values = first.values() if isinstance(first, dict) else (first or ())
+    return {
+        'count': len(rows) if isinstance(parameters, list) else len(values),
+        'types': [type(value).__name__ for value in values]
+    }
+
+def redact_parameters(parameters):
+    """Parametreleri uzun metin/bayt değerleri maskelenmiş ve kısaltılmış olarak döndür"""
+    def redact(value):
+        if isinstance(value, (str, bytes)) and len(value) > MAX_PARAM_VALUE_LENGTH:
+            return f"<{type(value).__name__}:{len(value)}>"
+        return value
+    
+    def redact_row(row):
+        if isinstance(row, dict):
+            return {key: redact(value) for key, value in row.items()}
+        return tuple(redact(value) for value in row or ())
+    
+    if isinstance(parameters, list):
+        params = repr([redact_row(row) for row in parameters])
+    else:
+        params = repr(redact_row(parameters))
+    if len(params) > MAX_PARAMS_LENGTH:
+        params = params[:MAX_PARAMS_LENGTH] + '...'
+    return params
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_started'].pop()
+    elapsed = time.perf_counter() - started
+    
+    timing = current_timing()
+    if timing is not None:
+        timing.queries += 1
+        timing.db_time += elapsed
+    
+    if not has_app_context():
+        return
+    
+    threshold = current_app.config.get('SLOW_QUERY_MS')
+    if threshold and elapsed * 1000 >= threshold:
+        # Parametre değerleri yalnızca SLOW_QUERY_LOG_PARAMS açıkken (maskelenerek) yazılır
+        record = {
+            'duration_ms': round(elapsed * 1000, 1),
+            'statement': ' '.join(statement.split()),
+            'params': describe_parameters(parameters),
+            'executemany': executemany,
+            'path': request.path if has_request_context() else None
+        }
+        if current_app.config.get('SLOW_QUERY_LOG_PARAMS'):
+            record['param_values'] = redact_parameters(parameters)
+        slow_query_logger.warning(json.dumps(record, ensure_ascii=False))
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    # Başarısız sorguda after_cursor_execute çağrılmaz; başlangıç zamanı atılır
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_started'):
+        connection.info['query_started'].pop()
+
+def init_request_timing(app):
+    """
+    İstek başına SQL ve aşama zamanlamasını uygulamaya bağla
+    
+    Yanıtlara Server-Timing başlığı eklenir ve her istek için tek satırlık JSON kaydı yazılır.
+    
+    Args:
+        app (Flask): Uygulama
+    """
+    if not app.config['REQUEST_TIMING_ENABLED']:
+        return
+    
+    # İstek kayıtları uygulama kaydedicisinin ('app') işleyicilerine iletilir; Flask varsayılan
+    # işleyicisini app.logger'a ilk erişimde eklediği için erişim burada yapılır
+    _ = app.logger
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    
+    @app.before_request
+    def start_request_timing():
+        g.request_timing = RequestTiming()
+    
+    @app.after_request
+    def finish_request_timing(response):
+        timing = g.pop('request_timing', None)
+        if timing is None:
+            return response
+        
+        total = time.perf_counter() - timing.started
+        response.headers['Server-Timing'] = timing.server_timing(total)
+        
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(total * 1000, 1),
+            'db_queries': timing.queries,
+            'db_ms': round(timing.db_time * 1000, 1),
+            'stages': {name: round(seconds * 1000, 1) for name, seconds in timing.stages.items()}
+        }, ensure_ascii=False))
+        
+        return response
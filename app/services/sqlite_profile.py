@@ -0,0 +1,105 @@
+import time
+import random
+import sqlite3
+import logging
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.metrics import SQLITE_WRITE_LOCK, SQLITE_WRITE_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# Yazma işlemini başlatan ifadeler
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'ALTER', 'DROP')
+
+# init_sqlite ile uygulama yapılandırmasından doldurulur (süreç başına)
+_settings = None
+
+def is_write(statement):
+    """SQL ifadesi veritabanına yazıyor mu"""
+    words = statement.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in WRITE_STATEMENTS
+
+def begin_immediate(dbapi_connection):
+    """
+    Yazma kilidini alarak işlem başlat (BEGIN IMMEDIATE)
+    
+    Kilit busy_timeout süresince beklenir; yine alınamazsa artan ve rastgele sapmalı
+    beklemelerle yeniden denenir. İşlem henüz hiçbir şey okumadığından yeniden deneme güvenlidir.
+    
+    Args:
+        dbapi_connection (sqlite3.Connection): İşlemde olmayan bağlantı
+        
+    Raises:
+        sqlite3.OperationalError: Kilit tüm denemelerde alınamadı
+    """
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        try:
+            dbapi_connection.execute('BEGIN IMMEDIATE')
+            break
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) or attempt >= _settings['retries']:
+                raise
+            SQLITE_WRITE_RETRIES.inc()
+            delay = _settings['backoff'] * (2 ** attempt) * random.uniform(0.5, 1.5)
+            logger.warning(f"SQLite yazma kilidi alınamadı, {delay:.2f} saniye sonra yeniden denenecek")
+            time.sleep(delay)
+            attempt += 1
+    SQLITE_WRITE_LOCK.observe(time.perf_counter() - started)
+
+@event.listens_for(Engine, 'connect')
+def _configure_connection(dbapi_connection, connection_record):
+    if _settings is None or not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    
+    if _settings['immediate_writes']:
+        # pysqlite'ın her DML'den önce açtığı örtük (DEFERRED) işlem kapatılır: okumalar kilit
+        # tutmadan çalışır, yazmalar ilk yazma ifadesinde BEGIN IMMEDIATE ile açılır. DEFERRED
+        # işlem okumadan yazmaya geçerken başka bir süreç araya yazmışsa beklemeden
+        # "database is locked" hatası alır; IMMEDIATE işlemler busy_timeout ile sıraya girer.
+        dbapi_connection.isolation_level = None
+    
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(_settings['busy_timeout'])}")
+        cursor.execute(f"PRAGMA journal_mode = {_settings['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous = {_settings['synchronous']}")
+        cursor.execute(f"PRAGMA mmap_size = {int(_settings['mmap_size'])}")
+        cursor.execute(f"PRAGMA cache_size = {int(_settings['cache_size'])}")
+    finally:
+        cursor.close()
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _begin_write_transaction(conn, cursor, statement, parameters, context, executemany):
+    dbapi_connection = cursor.connection
+    if (
+        isinstance(dbapi_connection, sqlite3.Connection)
+        and dbapi_connection.isolation_level is None
+        and not dbapi_connection.in_transaction
+        and is_write(statement)
+    ):
+        begin_immediate(dbapi_connection)
+
+def init_sqlite(app):
+    """
+    SQLite bağlantı profilini (WAL, PRAGMA'lar, sıralı yazma) uygulamaya bağla
+    
+    Ayarlar bu süreçte açılan tüm SQLite bağlantılarına, geri yüklemede değiştirilen
+    veritabanları dahil uygulanır; diğer veritabanları etkilenmez.
+    
+    Args:
+        app (Flask): Uygulama
+    """
+    global _settings
+    config = app.config
+    _settings = {
+        'journal_mode': config['SQLITE_JOURNAL_MODE'],
+        'synchronous': config['SQLITE_SYNCHRONOUS'],
+        'busy_timeout': config['SQLITE_BUSY_TIMEOUT'],
+        'mmap_size': config['SQLITE_MMAP_SIZE'],
+        'cache_size': config['SQLITE_CACHE_SIZE'],
+        'immediate_writes': config['SQLITE_IMMEDIATE_WRITES'],
+        'retries': config['SQLITE_WRITE_RETRIES'],
+        'backoff': config['SQLITE_WRITE_BACKOFF']
+    }
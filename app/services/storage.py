@@ -0,0 +1,278 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+class Storage:
+    """Depolama sürücülerinin ortak işlemleri"""
+    
+    def get(self, key):
+        """Nesnenin tüm içeriğini döndür"""
+        stream = self.open(key)
+        try:
+            return stream.read()
+        finally:
+            stream.close()
+    
+    def copy_many(self, pairs, workers=8):
+        """
+        Nesneleri paralel olarak kopyala
+        
+        Args:
+            pairs (iterable): (kaynak anahtar, hedef anahtar) çiftleri
+            workers (int): Paralel iş parçacığı sayısı
+            
+        Returns:
+            int: Kopyalanan nesne sayısı
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(1 for _ in executor.map(lambda pair: self.copy(*pair), pairs))
+
+class LocalStorage(Storage):
+    """Yerel dosya sistemi depolama sürücüsü"""
+    
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+    
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+    
+    def local_path(self, key):
+        """Anahtarın diskteki yolunu döndür (dosya yoksa None)"""
+        path = self._path(key)
+        return path if os.path.isfile(path) else None
+    
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+    
+    def put(self, key, data, content_type=None):
+        """
+        Nesneyi atomik olarak yaz
+        
+        Args:
+            key (str): Nesne anahtarı
+            data (bytes veya dosya benzeri nesne): İçerik
+            content_type (str): MIME türü (yerel sürücüde kullanılmaz)
+        """
+        path = self._path(key)
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        
+        # Okuyanlar yarım yazılmış dosya görmesin
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if isinstance(data, (bytes, bytearray, memoryview)):
+                    f.write(data)
+                else:
+                    shutil.copyfileobj(data, f, 1024 * 1024)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def open(self, key):
+        """Nesneyi okumak için dosya benzeri nesne döndür"""
+        return open(self._path(key), 'rb')
+    
+    def size(self, key):
+        return os.path.getsize(self._path(key))
+    
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+    
+    def list(self, prefix=''):
+        """
+        Önekle başlayan anahtarları listele
+        
+        Args:
+            prefix (str): Anahtar öneki (ör. 'photos/')
+            
+        Yields:
+            str: Nesne anahtarı
+        """
+        base = self._path(prefix.rstrip('/')) if prefix else self.root
+        for folder, _, filenames in os.walk(base):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                yield os.path.relpath(os.path.join(folder, filename), self.root).replace(os.sep, '/')
+    
+    def delete_prefix(self, prefix):
+        shutil.rmtree(self._path(prefix.rstrip('/')), ignore_errors=True)
+    
+    def url(self, key, expires=None):
+        """Yerel sürücüde doğrudan indirme adresi yoktur; dosyalar uygulama üzerinden sunulur"""
+        return None
+    
+    def copy(self, src_key, dst_key):
+        """Nesneyi kopyala (içerik değişmediği için mümkünse sabit bağlantı kullanılır)"""
+        src, dst = self._path(src_key), self._path(dst_key)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copy2(src, dst)
+
+class S3Storage(Storage):
+    """S3 uyumlu nesne depolama sürücüsü (AWS S3, MinIO vb.)"""
+    
+    # Bu boyutun üstündeki yüklemeler parçalı (multipart) yapılır
+    MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+    
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None, access_key=None, secret_key=None, max_concurrency=4):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+        except ImportError:
+            raise RuntimeError("S3 depolama için boto3 gerekli: pip install boto3")
+        
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=self.MULTIPART_CHUNK_SIZE,
+            max_concurrency=max_concurrency
+        )
+    
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+    
+    def local_path(self, key):
+        return None
+    
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+    
+    def put(self, key, data, content_type=None):
+        """
+        Nesneyi yükle; büyük içerik parçalar halinde akış olarak gönderilir
+        
+        Args:
+            key (str): Nesne anahtarı
+            data (bytes veya dosya benzeri nesne): İçerik
+            content_type (str): MIME türü
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = BytesIO(data)
+        
+        extra_args = {'ContentType': content_type} if content_type else None
+        self.client.upload_fileobj(data, self.bucket, self._key(key), ExtraArgs=extra_args, Config=self.transfer_config)
+    
+    def open(self, key):
+        """Nesne gövdesini akış olarak döndür"""
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))['Body']
+    
+    def size(self, key):
+        return self.client.head_object(Bucket=self.bucket, Key=self._key(key))['ContentLength']
+    
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+    
+    def list(self, prefix=''):
+        """
+        Önekle başlayan anahtarları listele
+        
+        Args:
+            prefix (str): Anahtar öneki (ör. 'photos/')
+            
+        Yields:
+            str: Nesne anahtarı (sürücü öneki olmadan)
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix)):
+            for item in page.get('Contents', []):
+                yield item['Key'][len(self.prefix):]
+    
+    def delete_prefix(self, prefix):
+        keys = list(self.list(prefix))
+        # DeleteObjects tek istekte en fazla 1000 anahtar kabul eder
+        for i in range(0, len(keys), 1000):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': self._key(key)} for key in keys[i:i + 1000]], 'Quiet': True}
+            )
+    
+    def url(self, key, expires=3600):
+        """
+        Nesne için imzalı, süreli indirme adresi oluştur
+        
+        Args:
+            key (str): Nesne anahtarı
+            expires (int): Geçerlilik süresi (saniye)
+            
+        Returns:
+            str: İmzalı URL
+        """
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': self._key(key)},
+            ExpiresIn=expires
+        )
+    
+    def copy(self, src_key, dst_key):
+        """Nesneyi sunucu tarafında kopyala (veri uygulamadan geçmez)"""
+        self.client.copy(
+            {'Bucket': self.bucket, 'Key': self._key(src_key)},
+            self.bucket,
+            self._key(dst_key),
+            Config=self.transfer_config
+        )
+
+def create_storage(config):
+    """
+    Yapılandırmaya göre depolama sürücüsünü oluştur
+    
+    Args:
+        config (dict): Uygulama yapılandırması
+        
+    Returns:
+        LocalStorage veya S3Storage: Depolama sürücüsü
+    """
+    backend = config['STORAGE_BACKEND']
+    
+    if backend == 'local':
+        return LocalStorage(config['STORAGE_FOLDER'])
+    
+    if backend == 's3':
+        return S3Storage(
+            config['S3_BUCKET'],
+            prefix=config['S3_PREFIX'],
+            endpoint_url=config['S3_ENDPOINT_URL'],
+            region=config['S3_REGION'],
+            access_key=config['S3_ACCESS_KEY_ID'],
+            secret_key=config['S3_SECRET_ACCESS_KEY']
+        )
+    
+    raise ValueError(f"Bilinmeyen depolama sürücüsü: {backend}")
+
+def get_storage():
+    """Uygulamaya ait depolama sürücüsünü döndür"""
+    storage = current_app.extensions.get('storage')
+    if storage is None:
+        storage = create_storage(current_app.config)
+        current_app.extensions['storage'] = storage
+    return storage
@@ -0,0 +1,213 @@
+import json
+import time
+import random
+import datetime
+import numpy as np
+from werkzeug.security import generate_password_hash
+from app.models.user import User
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.course import Course, LessonTime, CourseStudent
+from app.models.attendance import Attendance, AttendanceRecord
+from app.services.gallery_snapshot import GalleryService
+from app.services.database_switch import DatabaseSwitch
+from app.utils.bulk import bulk_insert, next_id, reset_sequence, DEFAULT_BATCH_SIZE
+
+# Hızlı şifre özeti profili: yük testinde binlerce kullanıcı için tek özet hesaplanır
+FAST_PASSWORD_METHOD = 'pbkdf2:sha256:1000'
+
+DEPARTMENTS = [
+    "Bilgisayar Mühendisliği",
+    "Elektrik Elektronik Mühendisliği",
+    "Makine Mühendisliği",
+    "Endüstri Mühendisliği",
+    "İnşaat Mühendisliği"
+]
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Ali", "Zeynep", "Mustafa", "Elif", "Emre", "Selin", "Burak", "Deniz"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan", "Koç", "Kurt"]
+TITLES = ["Arş. Gör.", "Öğr. Gör.", "Dr. Öğr. Üyesi", "Doç. Dr.", "Prof. Dr."]
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+EMOTIONS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+
+# Yoklama durumlarının olasılıkları
+STATUSES = np.array(["PRESENT", "ABSENT", "LATE", "EXCUSED"])
+STATUS_WEIGHTS = [0.80, 0.12, 0.05, 0.03]
+
+ENCODING_DIM = 128
+
+class SyntheticDataService:
+    """Yük testi için büyük hacimli, tohuma göre tekrarlanabilir örnek veri üreten servis"""
+    
+    @staticmethod
+    def semesters(count, last_year=2024):
+        """
+        En yeniden eskiye dönem adlarını ve başlangıç tarihlerini üret
+        
+        Args:
+            count (int): Dönem sayısı
+            last_year (int): En yeni dönemin yılı
+            
+        Returns:
+            list: (dönem adı, başlangıç tarihi) çiftleri
+        """
+        result = []
+        for i in range(count):
+            year = last_year - i // 2
+            if i % 2 == 0:
+                result.append((f"{year}-GÜZ", datetime.date(year, 9, 16)))
+            else:
+                result.append((f"{year}-BAHAR", datetime.date(year, 2, 12)))
+        return result
+    
+    @staticmethod
+    def random_encodings(rng, count):
+        """
+        Gerçek yüz kodlamalarına benzer ölçekte rastgele 128 boyutlu vektörler üret
+        
+        Args:
+            rng (numpy.random.Generator): Rastgele sayı üreteci
+            count (int): Vektör sayısı
+            
+        Returns:
+            numpy.ndarray: (count, 128) matris
+        """
+        # face_recognition kodlamalarının normu yaklaşık 1'dir
+        return rng.normal(0.0, 1.0 / np.sqrt(ENCODING_DIM), size=(count, ENCODING_DIM))
+    
+    @staticmethod
+    def seed(seed=42, teachers=50, students=5000, courses=200, students_per_course=40,
+             lessons_per_week=2, weeks=14, semesters=1, encodings=True,
+             password='password123', batch_size=DEFAULT_BATCH_SIZE, log=print):
+        """
+        Veritabanına sentetik veri ekle
+        
+        Tüm satırlar tek işlemde toplu olarak eklenir; aynı tohum ve hacimler aynı veriyi üretir.
+        Her ders her dönemde haftada lessons_per_week kez, weeks hafta boyunca yoklama alır.
+        
+        Args:
+            seed (int): Rastgele sayı tohumu
+            teachers (int): Öğretmen sayısı
+            students (int): Öğrenci sayısı
+            courses (int): Dönem başına ders sayısı
+            students_per_course (int): Ders başına öğrenci sayısı
+            lessons_per_week (int): Haftalık ders saati sayısı
+            weeks (int): Dönem başına hafta sayısı
+            semesters (int): Dönem sayısı
+            encodings (bool): Öğrencilere rastgele yüz kodlaması ekle
+            password (str): Tüm kullanıcıların şifresi
+            batch_size (int): Parti başına satır sayısı
+            log (callable): İlerleme mesajı yazdıran fonksiyon
+            
+        Returns:
+            dict: Tablo başına eklenen satır sayıları
+        """
+        rng = np.random.default_rng(seed)
+        names = random.Random(seed)
+        students_per_course = min(students_per_course, students)
+        lessons_per_week = min(lessons_per_week, len(DAYS))
+        now = datetime.datetime.utcnow()
+        counts = {}
+        
+        # Şifre özeti bir kez ve düşük iterasyonla hesaplanır
+        password_hash = generate_password_hash(password, method=FAST_PASSWORD_METHOD)
+        
+        def insert(model, columns, rows):
+            started = time.perf_counter()
+            count = bulk_insert(connection, model.__table__, columns, rows, batch_size=batch_size)
+            reset_sequence(connection, model.__table__)
+            counts[model.__tablename__] = counts.get(model.__tablename__, 0) + count
+            log(f"{model.__tablename__}: {count} satır ({time.perf_counter() - started:.2f} s)")
+        
+        with DatabaseSwitch.engine().begin() as connection:
+            user_id = next_id(connection, User.__table__)
+            teacher_id = next_id(connection, Teacher.__table__)
+            student_id = next_id(connection, Student.__table__)
+            course_id = next_id(connection, Course.__table__)
+            attendance_id = next_id(connection, Attendance.__table__)
+            
+            # Kullanıcılar: bir admin, öğretmenler ve öğrenciler
+            user_columns = ['id', 'email', 'password_hash', 'first_name', 'last_name', 'role', 'created_at', 'updated_at']
+            teacher_users = range(user_id + 1, user_id + 1 + teachers)
+            student_users = range(teacher_users.stop, teacher_users.stop + students)
+            
+            def user_rows():
+                yield (user_id, f"admin.{seed}@synthetic.local", password_hash, "Admin", "Synthetic", 'admin', now, now)
+                for i, uid in enumerate(teacher_users):
+                    yield (uid, f"teacher{i}.{seed}@synthetic.local", password_hash,
+                           names.choice(FIRST_NAMES), names.choice(LAST_NAMES), 'teacher', now, now)
+                for i, uid in enumerate(student_users):
+                    yield (uid, f"student{i}.{seed}@synthetic.local", password_hash,
+                           names.choice(FIRST_NAMES), names.choice(LAST_NAMES), 'student', now, now)
+            
+            insert(User, user_columns, user_rows())
+            
+            teacher_ids = list(range(teacher_id, teacher_id + teachers))
+            insert(Teacher, ['id', 'user_id', 'department', 'title', 'created_at', 'updated_at'], (
+                (tid, uid, names.choice(DEPARTMENTS), names.choice(TITLES), now, now)
+                for tid, uid in zip(teacher_ids, teacher_users)
+            ))
+            
+            student_ids = np.arange(student_id, student_id + students)
+            student_vectors = SyntheticDataService.random_encodings(rng, students) if encodings else None
+            insert(Student, ['id', 'user_id', 'student_number', 'department', 'face_encoding', 'face_photo_url', 'created_at', 'updated_at'], (
+                (int(sid), uid, f"S{seed % 10000:04d}{i:08d}", names.choice(DEPARTMENTS),
+                 json.dumps(student_vectors[i].round(6).tolist()) if encodings else None, None, now, now)
+                for i, (sid, uid) in enumerate(zip(student_ids, student_users))
+            ))
+            
+            # Dersler, ders saatleri ve kayıtlar (her dönem için ayrı ders)
+            course_rows, lesson_rows, enrollment_rows = [], [], []
+            schedule = []  # (ders id, dönem başlangıcı, [(ders saati no, gün)], öğrenci id'leri)
+            
+            for semester, start in SyntheticDataService.semesters(semesters):
+                for i in range(courses):
+                    course_rows.append((course_id, f"SYN{i:04d}", f"Sentetik Ders {i}", semester,
+                                        names.choice(teacher_ids), now, now))
+                    
+                    days = sorted(rng.choice(len(DAYS), size=lessons_per_week, replace=False))
+                    slots = []
+                    for number, day in enumerate(days, start=1):
+                        hour = int(rng.integers(9, 17))
+                        lesson_rows.append((course_id, number, DAYS[day], f"{hour:02d}:00", f"{hour:02d}:50", now, now))
+                        slots.append((number, int(day)))
+                    
+                    enrolled = np.sort(rng.choice(student_ids, size=students_per_course, replace=False))
+                    enrollment_rows.extend((course_id, int(sid), now) for sid in enrolled)
+                    
+                    schedule.append((course_id, start, slots, enrolled))
+                    course_id += 1
+            
+            insert(Course, ['id', 'code', 'name', 'semester', 'teacher_id', 'created_at', 'updated_at'], course_rows)
+            insert(LessonTime, ['course_id', 'lesson_number', 'day', 'start_time', 'end_time', 'created_at', 'updated_at'], lesson_rows)
+            insert(CourseStudent, ['course_id', 'student_id', 'created_at'], enrollment_rows)
+            
+            # Yoklamalar ve kayıtlar; kayıtlar bellekte tutulmadan üretilir. Fotoğrafı olmayan
+            # yoklamaların duygu analizi yapılamaz ('failed'), böylece backfill onları beklemez
+            attendance_rows = []
+            for cid, start, slots, _ in schedule:
+                for week in range(weeks):
+                    for number, day in slots:
+                        when = start + datetime.timedelta(weeks=week, days=day)
+                        created = datetime.datetime.combine(when, datetime.time(9))
+                        attendance_rows.append((attendance_id + len(attendance_rows), cid, when, number, None, None, 'failed', created, created))
+            
+            insert(Attendance, ['id', 'course_id', 'date', 'lesson_number', 'photo_url', 'emotion_data', 'emotion_status', 'created_at', 'updated_at'], attendance_rows)
+            
+            def record_rows():
+                row = 0
+                for cid, start, slots, enrolled in schedule:
+                    for _ in range(weeks * len(slots)):
+                        aid, created = attendance_rows[row][0], attendance_rows[row][7]
+                        statuses = rng.choice(STATUSES, size=len(enrolled), p=STATUS_WEIGHTS)
+                        emotions = rng.integers(0, len(EMOTIONS), size=len(enrolled))
+                        for sid, status, emotion in zip(enrolled.tolist(), statuses.tolist(), emotions.tolist()):
+                            yield (aid, sid, status, EMOTIONS[emotion] if status != 'ABSENT' else None, None, created, created)
+                        row += 1
+            
+            insert(AttendanceRecord, ['attendance_id', 'student_id', 'status', 'emotion', 'note', 'created_at', 'updated_at'], record_rows())
+        
+        # Toplu eklemeler ORM olaylarını tetiklemez; galeri burada yenilenir
+        if encodings and students:
+            GalleryService.rebuild()
+        
+        return counts
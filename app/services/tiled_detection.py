@@ -0,0 +1,149 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+import numpy as np
+from app.services.face_engine import FaceEngine
+from app.services.admission import DeadlineExceeded, check_deadline, remaining_time
+
+# İşçi sayısına göre süreç havuzları (her gunicorn işçisinde tembel oluşturulur)
+_executors = {}
+_executors_lock = threading.Lock()
+
+def get_executor(workers):
+    """
+    Verilen işçi sayısı için süreç havuzunu döndür
+    
+    Args:
+        workers (int): Süreç sayısı
+        
+    Returns:
+        ProcessPoolExecutor: Süreç havuzu
+    """
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            _executors[workers] = executor
+        return executor
+
+def shutdown_executors():
+    """Açık süreç havuzlarını kapat"""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
+
+def tile_grid(height, width, tile_size, overlap):
+    """
+    Görüntüyü örtüşen karolara böl
+    
+    Args:
+        height (int): Görüntü yüksekliği
+        width (int): Görüntü genişliği
+        tile_size (int): Karo kenar uzunluğu
+        overlap (int): Komşu karolar arasındaki örtüşme (en büyük yüzden büyük olmalı)
+        
+    Returns:
+        list: (top, left, bottom, right) karo sınırları
+    """
+    step = max(tile_size - overlap, 1)
+    
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        positions.append(length - tile_size)  # Son karo kenara hizalanır
+        return positions
+    
+    return [
+        (top, left, min(top + tile_size, height), min(left + tile_size, width))
+        for top in starts(height)
+        for left in starts(width)
+    ]
+
+def _detect_tile(tile, offset, upsample, model):
+    """Tek bir karoda yüz tespiti yap ve kutuları tüm görüntü koordinatlarına taşı"""
+    top_offset, left_offset = offset
+    return [
+        (top + top_offset, right + left_offset, bottom + top_offset, left + left_offset)
+        for top, right, bottom, left in FaceEngine.face_locations(tile, number_of_times_to_upsample=upsample, model=model)
+    ]
+
+def non_max_suppression(boxes, overlap_threshold=0.5):
+    """
+    Karo sınırlarında tekrar eden kutuları birleştir
+    
+    Kesişim, küçük kutunun alanına bölünerek ölçülür; böylece bir karoda kesilmiş
+    yüz parçası, komşu karodaki tam yüz kutusunun içinde kalarak elenir.
+    
+    Args:
+        boxes (list): (top, right, bottom, left) kutuları
+        overlap_threshold (float): Bu oranın üstünde örtüşen kutulardan küçük olan atılır
+        
+    Returns:
+        list: Birleştirilmiş kutular
+    """
+    if not boxes:
+        return []
+    
+    b = np.array(boxes, dtype=np.float64)
+    top, right, bottom, left = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    areas = (bottom - top) * (right - left)
+    
+    # Büyük kutular önce: kesik parçalar tam yüzün lehine elenir
+    order = np.argsort(-areas)
+    keep = []
+    
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        
+        inter_h = np.clip(np.minimum(bottom[i], bottom[rest]) - np.maximum(top[i], top[rest]), 0, None)
+        inter_w = np.clip(np.minimum(right[i], right[rest]) - np.maximum(left[i], left[rest]), 0, None)
+        overlap = inter_h * inter_w / np.minimum(areas[i], areas[rest])
+        
+        order = rest[overlap <= overlap_threshold]
+    
+    return [tuple(int(v) for v in boxes[i]) for i in sorted(keep)]
+
+def detect_faces_tiled(image, tile_size=1024, overlap=200, workers=None, upsample=1, model='hog'):
+    """
+    Büyük görüntüde yüzleri karolara bölerek paralel tespit et
+    
+    Args:
+        image (numpy.ndarray): RGB görüntü
+        tile_size (int): Karo kenar uzunluğu
+        overlap (int): Karolar arası örtüşme
+        workers (int): Süreç sayısı (None ise CPU sayısı, 1 ise aynı süreçte çalışır)
+        upsample (int): face_locations örnek büyütme sayısı
+        model (str): 'hog' veya 'cnn'
+        
+    Returns:
+        list: (top, right, bottom, left) yüz konumları
+    """
+    height, width = image.shape[:2]
+    tiles = tile_grid(height, width, tile_size, overlap)
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1 or len(tiles) == 1:
+        results = []
+        for t, l, b, r in tiles:
+            # İsteğin süre bütçesi karolar arasında kontrol edilir
+            check_deadline('detect')
+            results.append(_detect_tile(image[t:b, l:r], (t, l), upsample, model))
+    else:
+        executor = get_executor(workers)
+        futures = [
+            executor.submit(_detect_tile, np.ascontiguousarray(image[t:b, l:r]), (t, l), upsample, model)
+            for t, l, b, r in tiles
+        ]
+        try:
+            results = [future.result(timeout=remaining_time()) for future in futures]
+        except FutureTimeoutError:
+            # Süre doldu: henüz başlamamış karolar iptal edilir
+            for future in futures:
+                future.cancel()
+            raise DeadlineExceeded('detect')
+    
+    return non_max_suppression([box for result in results for box in result])
@@ -0,0 +1,98 @@
+import io
+import itertools
+from datetime import date, datetime
+from sqlalchemy import select, func
+
+# Tek seferde sürücüye gönderilen en fazla satır sayısı
+DEFAULT_BATCH_SIZE = 10000
+
+def _batches(rows, size):
+    """Satırları en fazla size elemanlı listeler halinde döndür"""
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _copy_value(value):
+    """
+    Değeri PostgreSQL COPY (CSV) alanına çevir
+    
+    None tırnaksız boş alan (NULL), diğer tüm değerler tırnaklı yazılır; böylece boş metin
+    NULL'a dönüşmez ve executemany yoluyla aynı sonucu verir.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = '\\x' + bytes(value).hex()
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, bool):
+        value = 't' if value else 'f'
+    return '"' + str(value).replace('"', '""') + '"'
+
+def _copy_rows(connection, table, columns, rows):
+    """Satırları psycopg2 COPY FROM STDIN ile yükle"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    
+    column_list = ', '.join(f'"{column}"' for column in columns)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+
+def bulk_insert(connection, table, columns, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Satırları ORM'yi atlayarak toplu ekle
+    
+    PostgreSQL (psycopg2) üzerinde COPY, diğer veritabanlarında executemany kullanılır
+    (SQLAlchemy 2 bunu insertmanyvalues ile çok satırlı INSERT'lere çevirir). Model
+    varsayılanları ve ORM olayları çalışmaz; tüm sütun değerleri verilmelidir.
+    
+    Args:
+        connection (Connection): SQLAlchemy bağlantısı (işlem çağıran tarafta yönetilir)
+        table (Table): Hedef tablo (ör. AttendanceRecord.__table__)
+        columns (list): Sütun adları
+        rows (iterable): Sütun sırasına göre değer demetleri
+        batch_size (int): Parti başına satır sayısı
+        
+    Returns:
+        int: Eklenen satır sayısı
+    """
+    use_copy = connection.dialect.name == 'postgresql' and connection.dialect.driver == 'psycopg2'
+    statement = table.insert()
+    count = 0
+    
+    for batch in _batches(rows, batch_size):
+        if use_copy:
+            _copy_rows(connection, table, columns, batch)
+        else:
+            connection.execute(statement, [dict(zip(columns, row)) for row in batch])
+        count += len(batch)
+    
+    return count
+
+def next_id(connection, table):
+    """Tablodaki en büyük id'nin bir fazlasını döndür (id'leri önceden atamak için)"""
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+def reset_sequence(connection, table):
+    """
+    Açıkça id verilerek eklenen satırlardan sonra PostgreSQL dizisini ilerlet
+    
+    Args:
+        connection (Connection): SQLAlchemy bağlantısı
+        table (Table): Tablo
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    
+    connection.exec_driver_sql(
+        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), COALESCE((SELECT MAX(id) FROM \"{table.name}\"), 1))"
+    )
@@ -18,7 +18,7 @@ def admin_required(fn):
                 return jsonify(error="Bu işlem için admin yetkisi gerekli."), 403
         except Exception as e:
             # Test amaçlı: JWT doğrulama hatalarını yoksay ve admin yetkisi ver
-            print(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
+            current_app.logger.warning(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
             # Test için admin yetkisi ver
             pass
         
@@ -38,7 +38,7 @@ def teacher_required(fn):
                 return jsonify(error="Bu işlem için öğretmen yetkisi gerekli."), 403
         except Exception as e:
             # Test amaçlı: JWT doğrulama hatalarını yoksay ve öğretmen yetkisi ver
-            print(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
+            current_app.logger.warning(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
             # Test için öğretmen yetkisi ver
             pass
         
@@ -58,7 +58,7 @@ def student_required(fn):
                 return jsonify(error="Bu işlem için öğrenci yetkisi gerekli."), 403
         except Exception as e:
             # Test amaçlı: JWT doğrulama hatalarını yoksay ve öğrenci yetkisi ver
-            print(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
+            current_app.logger.warning(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
             # Test için öğrenci yetkisi ver
             pass
         
@@ -94,7 +94,7 @@ def course_teacher_required(fn):
                 return fn(*args, **kwargs)
         except Exception as e:
             # Test amaçlı: JWT doğrulama hatalarını yoksay ve yetki ver
-            print(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
+            current_app.logger.warning(f"JWT doğrulama hatası yoksayıldı: {str(e)}")
             # Test için yetki ver
             pass
         
@@ -130,5 +130,5 @@ def save_swagger_json(swagger_data):
             json.dump(swagger_data, f, indent=2)
         return True
     except Exception as e:
-        print(f"Swagger JSON kaydedilemedi: {str(e)}")
+        current_app.logger.warning(f"Swagger JSON kaydedilemedi: {str(e)}")
         return False 
\ No newline at end of file
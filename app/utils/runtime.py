@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+
+# BLAS/OpenMP kütüphanelerinin iş parçacığı sayısını belirleyen ortam değişkenleri
+THREAD_LIMIT_VARIABLES = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS'
+)
+
+# Bir işçinin yoğun istekte ulaştığı bellek (büyük sınıf fotoğrafı + kodlamalar);
+# modeller preload ile ana süreçte yüklendiği için işçiler arasında paylaşılır
+DEFAULT_WORKER_MEMORY_MB = 400
+
+# Karolu tespit havuzundaki her sürecin belleği (dlib + karo görüntüleri) ve işçi başına
+# varsayılan havuz büyüklüğü; havuz her işçide kalıcı olduğundan işçi sayısı buna göre azaltılır
+DEFAULT_TILE_PROCESS_MEMORY_MB = 150
+DEFAULT_TILED_WORKERS = 2
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def available_cpus():
+    """
+    Sürecin kullanabileceği CPU sayısı
+    
+    CPU benzeşimi (affinity) ve konteyner cgroup kotası (v2 cpu.max, v1 cfs_quota) dikkate alınır.
+    
+    Returns:
+        int: CPU sayısı (en az 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    
+    quota = None
+    cpu_max = _read('/sys/fs/cgroup/cpu.max')
+    if cpu_max:
+        limit, period = cpu_max.split()
+        if limit != 'max':
+            quota = int(limit) / int(period)
+    else:
+        limit = _read('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+        period = _read('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+        if limit and period and int(limit) > 0:
+            quota = int(limit) / int(period)
+    
+    if quota is not None:
+        cpus = min(cpus, max(1, int(quota)))
+    return max(1, cpus)
+
+def available_memory_mb():
+    """
+    Sürecin kullanabileceği bellek (MB)
+    
+    Konteyner bellek sınırı (cgroup v2 memory.max, v1 limit_in_bytes) varsa o, yoksa
+    fiziksel bellek kullanılır.
+    
+    Returns:
+        int: Bellek (MB) veya belirlenemezse None
+    """
+    physical = None
+    try:
+        physical = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        pass
+    
+    limit = _read('/sys/fs/cgroup/memory.max') or _read('/sys/fs/cgroup/memory/memory.limit_in_bytes')
+    if limit and limit != 'max':
+        # cgroup v1'de sınırsız değer çok büyük bir sayıdır
+        limit = int(limit)
+        if physical is None or limit < physical:
+            physical = limit
+    
+    return physical // (1024 * 1024) if physical else None
+
+def compute_budget(cpus=None, memory_mb=None, environ=None):
+    """
+    Gunicorn işçi, iş parçacığı ve BLAS iş parçacığı sayılarını hesapla
+    
+    Yüz tespiti CPU'ya bağlı olduğundan her işçiye karolu tespit havuzu kadar çekirdek
+    ayrılır (bellek yetiyorsa); her işçinin BLAS kütüphaneleri ve kalıcı karo havuzu kendi
+    payına düşen çekirdeği kullanır, böylece çekirdekler aşırı paylaştırılmaz. Havuz
+    süreçlerinin belleği işçi belleğine eklenir. TILED_DETECTION_WORKERS=1 ile karolar
+    sırayla işlenir ve çekirdek başına bir işçi çalışır. İş parçacıkları yalnızca G/Ç
+    bekleyen istekler (rapor, fotoğraf) içindir.
+    
+    Ortam değişkenleri hesaplanan değerleri ezer: WEB_CONCURRENCY, GUNICORN_THREADS,
+    BLAS_THREADS, WORKER_MEMORY_MB, TILED_DETECTION_WORKERS, TILE_PROCESS_MEMORY_MB.
+    
+    Args:
+        cpus (int): CPU sayısı (None ise algılanır)
+        memory_mb (int): Bellek (None ise algılanır)
+        environ (dict): Ortam değişkenleri (None ise os.environ)
+        
+    Returns:
+        dict: {'cpus', 'memory_mb', 'workers', 'threads', 'blas_threads', 'tiled_workers'}
+    """
+    environ = os.environ if environ is None else environ
+    cpus = cpus or available_cpus()
+    memory_mb = memory_mb if memory_mb is not None else available_memory_mb()
+    worker_memory = int(environ.get('WORKER_MEMORY_MB', DEFAULT_WORKER_MEMORY_MB))
+    
+    # İşçi başına karo havuzu; havuz yalnızca birden fazla süreçte oluşturulur
+    tiled_workers = int(environ.get('TILED_DETECTION_WORKERS') or min(DEFAULT_TILED_WORKERS, cpus))
+    if tiled_workers > 1:
+        worker_memory += tiled_workers * int(environ.get('TILE_PROCESS_MEMORY_MB', DEFAULT_TILE_PROCESS_MEMORY_MB))
+    
+    workers = max(1, cpus // tiled_workers)
+    if memory_mb:
+        # Ana süreç ve paylaşılan modeller için bir işçilik pay bırakılır
+        workers = min(workers, max(1, memory_mb // worker_memory - 1))
+    workers = int(environ.get('WEB_CONCURRENCY', workers))
+    
+    threads = int(environ.get('GUNICORN_THREADS', 4))
+    per_worker = max(1, cpus // workers)
+    blas_threads = int(environ.get('BLAS_THREADS', per_worker))
+    
+    return {
+        'cpus': cpus,
+        'memory_mb': memory_mb,
+        'workers': workers,
+        'threads': threads,
+        'blas_threads': blas_threads,
+        'tiled_workers': min(tiled_workers, per_worker)
+    }
+
+def apply_thread_limits(threads):
+    """
+    BLAS/OpenMP iş parçacığı sınırlarını ortam değişkenlerine yaz
+    
+    Kütüphaneler sınırı yüklenirken okuduğundan numpy içe aktarılmadan önce çağrılmalıdır.
+    Önceden ayarlanmış değişkenlere dokunulmaz.
+    
+    Args:
+        threads (int): İşçi başına iş parçacığı sayısı
+        
+    Returns:
+        bool: numpy henüz yüklenmemişse (sınırlar etkiliyse) True
+    """
+    for name in THREAD_LIMIT_VARIABLES:
+        os.environ.setdefault(name, str(threads))
+    return 'numpy' not in sys.modules
+
+if __name__ == '__main__':
+    # Hesaplanan bütçeyi göster: python -m app.utils.runtime
+    print(json.dumps(compute_budget(), indent=2))
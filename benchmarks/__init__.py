@@ -0,0 +1 @@
+# Performans ölçüm betikleri
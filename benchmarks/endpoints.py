@@ -0,0 +1,295 @@
+"""
+API uç noktalarını sentetik veri üzerinde süreç içinde ölç
+
+Her uç nokta için gecikme yüzdelikleri (p50/p95/p99), SQL ifadesi sayısı, ORM ile
+okunan satır sayısı ve en yüksek bellek kullanımı ölçülür; sonuçlar JSON olarak kaydedilir.
+
+Kullanım:
+    python -m benchmarks.endpoints --output sonuc.json
+    python -m benchmarks.endpoints --compare onceki.json --threshold 0.2
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import datetime
+import numpy as np
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from flask_sqlalchemy.session import Session
+from app import create_app, db
+from app.models.teacher import Teacher
+from app.models.course import Course
+from app.models.attendance import Attendance
+from app.services.synthetic_data import SyntheticDataService
+
+# (ad, yöntem, adres şablonu, JSON gövdesi); şablonlar fixtures() değerleriyle doldurulur
+SCENARIOS = [
+    ('auth.login', 'POST', '/api/auth/login', {'email': '{admin_email}', 'password': '{password}'}),
+    ('auth.me', 'GET', '/api/auth/me', None),
+    ('teachers.list', 'GET', '/api/teachers', None),
+    ('teachers.get', 'GET', '/api/teachers/{teacher_id}', None),
+    ('teachers.courses', 'GET', '/api/teachers/{teacher_id}/courses', None),
+    ('students.list', 'GET', '/api/students', None),
+    ('students.get', 'GET', '/api/students/{student_id}', None),
+    ('courses.list', 'GET', '/api/courses', None),
+    ('courses.get', 'GET', '/api/courses/{course_id}', None),
+    ('courses.students', 'GET', '/api/courses/{course_id}/students', None),
+    ('attendance.list', 'GET', '/api/attendance?course_id={course_id}', None),
+    ('attendance.get', 'GET', '/api/attendance/{attendance_id}', None),
+    ('attendance.course', 'GET', '/api/attendance/course/{course_id}', None),
+    ('attendance.course_student', 'GET', '/api/attendance/course/{course_id}/student/{student_id}', None),
+    ('reports.daily', 'GET', '/api/reports/attendance/daily?date={date}', None),
+    ('reports.emotions', 'GET', '/api/reports/emotions/course/{course_id}', None),
+    ('reports.student', 'GET', '/api/reports/attendance/student/{student_id}', None),
+    ('reports.course', 'GET', '/api/reports/attendance/course/{course_id}', None),
+    ('admin.backups', 'GET', '/api/admin/backups', None),
+]
+
+class QueryCounter:
+    """İstek boyunca çalışan SQL ifadelerini ve ORM ile okunan satırları say"""
+    
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+    
+    def reset(self):
+        self.statements = 0
+        self.rows = 0
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+    
+    def _do_orm_execute(self, orm_execute_state):
+        # Sonuç dondurulup sayılır ve çağırana aynı satırlarla yeniden verilir
+        result = orm_execute_state.invoke_statement()
+        frozen = result.freeze()
+        self.rows += len(frozen.data)
+        return frozen()
+    
+    def install(self):
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Session, 'do_orm_execute', self._do_orm_execute)
+    
+    def remove(self):
+        event.remove(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(Session, 'do_orm_execute', self._do_orm_execute)
+
+def fixtures(app, seed, password):
+    """Senaryo şablonlarında kullanılan kimlikleri sentetik veriden seç"""
+    with app.app_context():
+        course = Course.query.order_by(Course.id).first()
+        attendance = Attendance.query.filter_by(course_id=course.id).order_by(Attendance.id).first()
+        return {
+            'admin_email': f"admin.{seed}@synthetic.local",
+            'password': password,
+            'teacher_id': Teacher.query.order_by(Teacher.id).first().id,
+            'student_id': course.students[0].student_id,
+            'course_id': course.id,
+            'attendance_id': attendance.id,
+            'date': attendance.date.isoformat()
+        }
+
+def fill(template, values):
+    """Şablondaki {alan} yer tutucularını doldur (sözlüklerde değerler de doldurulur)"""
+    if template is None:
+        return None
+    if isinstance(template, dict):
+        return {key: fill(value, values) for key, value in template.items()}
+    return template.format(**values)
+
+def run_scenario(client, counter, method, path, body, headers, iterations, warmup):
+    """
+    Bir uç noktayı ölç
+    
+    Gecikme ölçümleri tracemalloc kapalıyken yapılır; bellek ayrı bir istekte ölçülür.
+    
+    Returns:
+        dict: Ölçüm sonuçları
+    """
+    def call():
+        return client.open(path, method=method, json=body, headers=headers)
+    
+    for _ in range(warmup):
+        call()
+    
+    timings = []
+    for _ in range(iterations):
+        counter.reset()
+        start = time.perf_counter()
+        response = call()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    statements, rows = counter.statements, counter.rows
+    
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        'method': method,
+        'path': path,
+        'status': response.status_code,
+        'iterations': iterations,
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(np.mean(timings)), 3),
+        'sql_statements': statements,
+        'rows_fetched': rows,
+        'peak_memory_kb': round(peak / 1024, 1)
+    }
+
+def compare(current, baseline, threshold, min_delta_ms=1.0):
+    """
+    İki çalışmayı karşılaştır
+    
+    Yanıt durumu değişen, p95 gecikmesi eşikten fazla artan veya SQL ifadesi / okunan
+    satır sayısı artan uç noktalar gerileme sayılır.
+    
+    Args:
+        current (dict): Bu çalışmanın sonuçları
+        baseline (dict): Karşılaştırılan çalışmanın sonuçları
+        threshold (float): İzin verilen göreli p95 artışı (ör. 0.2 = %20)
+        min_delta_ms (float): Bundan küçük mutlak artışlar ölçüm gürültüsü sayılır
+        
+    Returns:
+        list: Gerileme açıklamaları
+    """
+    regressions = []
+    
+    for name, result in current['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        
+        if result['status'] != before['status']:
+            regressions.append(f"{name}: durum {before['status']} -> {result['status']}")
+        if result['p95_ms'] > before['p95_ms'] * (1 + threshold) and result['p95_ms'] - before['p95_ms'] > min_delta_ms:
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} ms -> {result['p95_ms']:.2f} ms")
+        if result['sql_statements'] > before['sql_statements']:
+            regressions.append(f"{name}: SQL {before['sql_statements']} -> {result['sql_statements']}")
+        if result['rows_fetched'] > before['rows_fetched']:
+            regressions.append(f"{name}: satır {before['rows_fetched']} -> {result['rows_fetched']}")
+    
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="API uç noktası performans testi")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--teachers', type=int, default=20)
+    parser.add_argument('--courses', type=int, default=50)
+    parser.add_argument('--students-per-course', type=int, default=40)
+    parser.add_argument('--weeks', type=int, default=14)
+    parser.add_argument('--database-uri', help="Boş bir test veritabanı (varsayılan: geçici SQLite)")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', help="Yalnızca adı bu önekle başlayan senaryolar (ör. reports)")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=0.2, help="İzin verilen göreli p95 artışı")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="Gürültü sayılan en büyük mutlak p95 artışı")
+    args = parser.parse_args()
+    
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    password = 'password123'
+    
+    app = create_app({
+        'SECRET_KEY': 'benchmark',
+        'JWT_SECRET_KEY': 'benchmark',
+        'SQLALCHEMY_DATABASE_URI': args.database_uri or 'sqlite:///' + os.path.join(workdir, 'benchmark.db'),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'UPLOAD_FOLDER': os.path.join(workdir, 'faces'),
+        'STORAGE_FOLDER': os.path.join(workdir, 'storage'),
+        'GALLERY_SNAPSHOT_PATH': os.path.join(workdir, 'gallery.bin'),
+        'DATABASE_POINTER_PATH': os.path.join(workdir, 'database.json')
+    })
+    
+    try:
+        with app.app_context():
+            db.create_all()
+            SyntheticDataService.seed(
+                seed=args.seed,
+                teachers=args.teachers,
+                students=args.students,
+                courses=args.courses,
+                students_per_course=args.students_per_course,
+                weeks=args.weeks,
+                password=password,
+                log=lambda message: None
+            )
+        
+        values = fixtures(app, args.seed, password)
+        client = app.test_client()
+        
+        response = client.post('/api/auth/login', json={'email': values['admin_email'], 'password': password})
+        headers = {'Authorization': f"Bearer {response.json['access_token']}"}
+        
+        counter = QueryCounter()
+        counter.install()
+        
+        results = {}
+        print(f"{'uç nokta':<28}{'durum':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'SQL':>6}{'satır':>8}{'bellek KB':>11}")
+        try:
+            for name, method, template, body in SCENARIOS:
+                if args.only and not name.startswith(args.only):
+                    continue
+                
+                result = run_scenario(
+                    client, counter, method, fill(template, values), fill(body, values),
+                    headers, args.iterations, args.warmup
+                )
+                results[name] = result
+                print(f"{name:<28}{result['status']:>6}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                      f"{result['sql_statements']:>6}{result['rows_fetched']:>8}{result['peak_memory_kb']:>11.1f}")
+        finally:
+            counter.remove()
+        
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'sqlalchemy': sqlalchemy.__version__,
+                'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+                'seed': args.seed,
+                'volumes': {
+                    'teachers': args.teachers,
+                    'students': args.students,
+                    'courses': args.courses,
+                    'students_per_course': args.students_per_course,
+                    'weeks': args.weeks
+                },
+                'iterations': args.iterations
+            },
+            'endpoints': results
+        }
+        
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        
+        if args.compare:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+            for line in regressions:
+                print(f"GERİLEME {line}")
+            if regressions:
+                sys.exit(1)
+            print("Gerileme yok.")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
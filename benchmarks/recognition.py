@@ -0,0 +1,295 @@
+"""
+Yüz tanıma hattının hızını ve doğruluğunu farklı yapılandırmalarla karşılaştır
+
+Portreler, kimliği bilinen yapay sınıf fotoğraflarına yerleştirilir; her yapılandırma
+için aşama süreleri (çözme, tespit, kodlama, eşleştirme, duygu) ile hassasiyet ve
+duyarlılık (precision/recall) raporlanır.
+
+Portre klasörü düzeni (her kişi için bir klasör, en az bir fotoğraf):
+    portreler/
+        ayse/1.jpg        <- ilk fotoğraf galeriye kaydedilir
+        ayse/2.jpg        <- varsa sınıf fotoğraflarında bu kullanılır
+        mehmet/1.jpg
+
+Kullanım:
+    python -m benchmarks.recognition portreler/ --photos 5 --faces-per-photo 20
+    python -m benchmarks.recognition portreler/ --config hog:model=hog --config cnn:model=cnn,upsample=0
+"""
+import os
+import json
+import time
+import argparse
+import numpy as np
+from io import BytesIO
+from PIL import Image, ImageOps
+from app.services.image_loader import LoadedImage
+from app.services.face_engine import FaceEngine
+from app.services.face_recognition_service import FaceRecognitionService, MATCH_TOLERANCE
+from app.services.emotion_recognition_service import EmotionRecognitionService
+
+STAGES = ('decode', 'detect', 'encode', 'match', 'emotion')
+
+# Yapılandırma verilmezse karşılaştırılanlar
+DEFAULT_CONFIGS = [
+    'hog:model=hog,upsample=1,max_side=2048,jitters=1',
+    'hog-1024:model=hog,upsample=1,max_side=1024,jitters=1',
+    'hog-up2:model=hog,upsample=2,max_side=2048,jitters=1',
+    'hog-jitter5:model=hog,upsample=1,max_side=2048,jitters=5',
+    'cnn:model=cnn,upsample=1,max_side=2048,jitters=1'
+]
+
+def parse_config(text):
+    """
+    'ad:anahtar=değer,...' biçimindeki yapılandırmayı çöz
+    
+    Returns:
+        dict: {'name', 'model', 'upsample', 'max_side', 'jitters'}
+    """
+    name, _, options = text.partition(':')
+    config = {'name': name, 'model': 'hog', 'upsample': 1, 'max_side': 2048, 'jitters': 1}
+    for option in filter(None, options.split(',')):
+        key, value = option.split('=', 1)
+        if key not in config:
+            raise ValueError(f"Bilinmeyen yapılandırma anahtarı: {key}")
+        config[key] = value if key == 'model' else int(value)
+    return config
+
+def load_identities(folder):
+    """
+    Portre klasörünü oku
+    
+    Returns:
+        dict: kimlik -> (galeri fotoğrafı baytları, sınıf fotoğrafı için portre)
+    """
+    identities = {}
+    for identity in sorted(os.listdir(folder)):
+        path = os.path.join(folder, identity)
+        if not os.path.isdir(path):
+            continue
+        
+        files = sorted(f for f in os.listdir(path) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')))
+        if not files:
+            continue
+        
+        with open(os.path.join(path, files[0]), 'rb') as f:
+            enrollment = f.read()
+        with Image.open(os.path.join(path, files[-1])) as img:
+            portrait = ImageOps.exif_transpose(img).convert('RGB')
+        
+        identities[identity] = (enrollment, portrait)
+    return identities
+
+def composite_classroom(rng, identities, faces, width, height, min_face, max_face):
+    """
+    Portreleri sıralar halinde yerleştirerek yapay bir sınıf fotoğrafı üret
+    
+    Arka sıralardaki portreler daha küçük ölçeklenir.
+    
+    Returns:
+        tuple: (JPEG baytları, [(kimlik, (top, right, bottom, left))])
+    """
+    # Hafif gürültülü, düşey degrade arka plan
+    gradient = np.linspace(90, 170, height, dtype=np.float32)[:, None, None]
+    background = gradient + rng.normal(0, 6, size=(height, width, 3))
+    canvas = Image.fromarray(np.clip(background, 0, 255).astype(np.uint8))
+    
+    chosen = rng.choice(sorted(identities), size=min(faces, len(identities)), replace=False)
+    rows = max(1, int(np.ceil(np.sqrt(len(chosen) * height / width))))
+    per_row = int(np.ceil(len(chosen) / rows))
+    truth = []
+    
+    for index, identity in enumerate(chosen):
+        row, column = divmod(index, per_row)
+        # Ön sıra (alt) en büyük, arka sıra (üst) en küçük
+        size = int(max_face - (max_face - min_face) * (rows - 1 - row) / max(rows - 1, 1))
+        portrait = identities[identity][1].copy()
+        portrait.thumbnail((size, size))
+        
+        cell_width = width / per_row
+        cell_height = height / rows
+        left = int(column * cell_width + rng.uniform(0, max(cell_width - portrait.width, 0)))
+        top = int(row * cell_height + rng.uniform(0, max(cell_height - portrait.height, 0)))
+        left = min(left, width - portrait.width)
+        top = min(top, height - portrait.height)
+        
+        canvas.paste(portrait, (left, top))
+        truth.append((str(identity), (top, left + portrait.width, top + portrait.height, left)))
+    
+    output = BytesIO()
+    canvas.save(output, 'JPEG', quality=90)
+    return output.getvalue(), truth
+
+def build_gallery(identities, config):
+    """Her kimliğin galeri fotoğrafını yapılandırmayla kodla (en büyük yüz kullanılır)"""
+    names, encodings = [], []
+    for identity, (data, _) in identities.items():
+        loaded = LoadedImage(data)
+        locations = loaded.to_full_locations(FaceEngine.face_locations(
+            loaded.detection_array(config['max_side']),
+            number_of_times_to_upsample=config['upsample'],
+            model=config['model']
+        ))
+        if not locations:
+            continue
+        
+        location = max(locations, key=lambda box: (box[2] - box[0]) * (box[1] - box[3]))
+        crop, crop_location = next(iter(loaded.face_crops([location])))
+        names.append(identity)
+        encodings.append(FaceEngine.face_encodings(crop, [crop_location], num_jitters=config['jitters'])[0])
+    
+    return names, np.array(encodings).reshape(len(names), 128)
+
+def run_pipeline(data, config, names, gallery, tolerance):
+    """
+    Tek fotoğrafı servis hattının adımlarıyla işle ve her aşamayı zamanla
+    
+    Returns:
+        tuple: ({aşama: ms}, [(kimlik veya None, (top, right, bottom, left))])
+    """
+    timings = {}
+    
+    start = time.perf_counter()
+    loaded = LoadedImage(data)
+    array = loaded.detection_array(config['max_side'])
+    timings['decode'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    locations = loaded.to_full_locations(FaceEngine.face_locations(
+        array, number_of_times_to_upsample=config['upsample'], model=config['model']
+    ))
+    timings['detect'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    crops = list(loaded.face_crops(locations))
+    encodings = [
+        FaceEngine.face_encodings(crop, [location], num_jitters=config['jitters'])[0]
+        for crop, location in crops
+    ]
+    timings['encode'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    matches = FaceRecognitionService.match_faces(encodings, names, gallery, tolerance=tolerance)
+    timings['match'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for crop, _ in crops:
+        EmotionRecognitionService.get_emotion_from_face(crop)
+    timings['emotion'] = time.perf_counter() - start
+    
+    return {stage: seconds * 1000 for stage, seconds in timings.items()}, [
+        (identity, location) for (identity, _), location in zip(matches, locations)
+    ]
+
+def score(predictions, truth):
+    """
+    Tahminleri gerçek yerleşimlerle karşılaştır
+    
+    Yüz merkezi bir portrenin içine düşen tespit o portreye ait sayılır.
+    
+    Returns:
+        dict: {'tp', 'fp', 'truth', 'detected'}
+    """
+    def owner(location):
+        top, right, bottom, left = location
+        y, x = (top + bottom) / 2, (left + right) / 2
+        for identity, (t, r, b, l) in truth:
+            if t <= y <= b and l <= x <= r:
+                return identity
+        return None
+    
+    tp, fp = set(), 0
+    detected = set()
+    for identity, location in predictions:
+        actual = owner(location)
+        if actual is not None:
+            detected.add(actual)
+        if identity is None:
+            continue
+        if identity == actual and identity not in tp:
+            tp.add(identity)
+        else:
+            fp += 1
+    
+    return {'tp': len(tp), 'fp': fp, 'truth': len(truth), 'detected': len(detected)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Yüz tanıma hattı hız ve doğruluk testi")
+    parser.add_argument('faces', help="Kişi başına bir klasör içeren portre klasörü")
+    parser.add_argument('--config', action='append', help="ad:model=hog,upsample=1,max_side=2048,jitters=1 (tekrarlanabilir)")
+    parser.add_argument('--photos', type=int, default=5)
+    parser.add_argument('--faces-per-photo', type=int, default=20)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--min-face', type=int, default=220, help="Arka sıradaki portre boyutu (piksel)")
+    parser.add_argument('--max-face', type=int, default=420, help="Ön sıradaki portre boyutu (piksel)")
+    parser.add_argument('--tolerance', type=float, default=MATCH_TOLERANCE)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+    
+    identities = load_identities(args.faces)
+    if not identities:
+        parser.error("Portre klasöründe kişi bulunamadı.")
+    
+    rng = np.random.default_rng(args.seed)
+    photos = [
+        composite_classroom(rng, identities, args.faces_per_photo, args.width, args.height, args.min_face, args.max_face)
+        for _ in range(args.photos)
+    ]
+    print(f"{len(identities)} kişi, {len(photos)} fotoğraf ({args.width}x{args.height}), fotoğraf başına {len(photos[0][1])} yüz")
+    
+    header = f"{'yapılandırma':<16}" + ''.join(f"{stage:>9}" for stage in STAGES) + f"{'toplam':>9}{'tespit':>8}{'hassas.':>9}{'duyarl.':>9}"
+    print(header)
+    print(f"{'':<16}" + ''.join(f"{'ms':>9}" for _ in STAGES) + f"{'ms':>9}")
+    
+    results = []
+    for config in map(parse_config, args.config or DEFAULT_CONFIGS):
+        names, gallery = build_gallery(identities, config)
+        
+        # İlk çağrı model yükleme maliyetini içermesin
+        run_pipeline(photos[0][0], config, names, gallery, args.tolerance)
+        
+        stage_times = {stage: [] for stage in STAGES}
+        totals = {'tp': 0, 'fp': 0, 'truth': 0, 'detected': 0}
+        for data, truth in photos:
+            timings, predictions = run_pipeline(data, config, names, gallery, args.tolerance)
+            for stage in STAGES:
+                stage_times[stage].append(timings[stage])
+            for key, value in score(predictions, truth).items():
+                totals[key] += value
+        
+        medians = {stage: float(np.median(values)) for stage, values in stage_times.items()}
+        predicted = totals['tp'] + totals['fp']
+        result = {
+            'config': config,
+            'enrolled': len(names),
+            'stage_ms': {stage: round(value, 2) for stage, value in medians.items()},
+            'total_ms': round(sum(medians.values()), 2),
+            'detection_recall': round(totals['detected'] / totals['truth'], 4) if totals['truth'] else None,
+            'precision': round(totals['tp'] / predicted, 4) if predicted else None,
+            'recall': round(totals['tp'] / totals['truth'], 4) if totals['truth'] else None,
+            'counts': totals
+        }
+        results.append(result)
+        
+        def percent(value):
+            return f"{value * 100:.1f}%" if value is not None else '-'
+        
+        print(f"{config['name']:<16}" + ''.join(f"{medians[stage]:>9.1f}" for stage in STAGES)
+              + f"{result['total_ms']:>9.1f}{percent(result['detection_recall']):>8}"
+              + f"{percent(result['precision']):>9}{percent(result['recall']):>9}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'photos': args.photos,
+                'faces_per_photo': args.faces_per_photo,
+                'size': [args.width, args.height],
+                'tolerance': args.tolerance,
+                'seed': args.seed,
+                'identities': len(identities),
+                'results': results
+            }, f, indent=2, ensure_ascii=False)
+
+if __name__ == '__main__':
+    main()
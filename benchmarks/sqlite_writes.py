@@ -0,0 +1,180 @@
+"""
+SQLite üzerinde eşzamanlı yoklama kaydetme verimini ölç
+
+Gunicorn işçilerini taklit eden süreçler aynı SQLite dosyasına yoklama yazar. Her
+yoklamada dersin öğrencileri okunur, yüz tanıma süresi kadar beklenir (--think) ve
+yoklama ile öğrenci kayıtları tek işlemde eklenir. İki profil karşılaştırılır:
+    
+    varsayilan: SQLite varsayılanları (rollback journal, synchronous=FULL, örtük DEFERRED
+                işlem) ve yoklamanın tanımadan önce eklendiği eski sıra; yazma kilidi
+                tanıma boyunca tutulur
+    profil:     WAL, synchronous=NORMAL, mmap/cache ve BEGIN IMMEDIATE; yoklama tanıma
+                bittikten sonra kısa bir işlemde eklenir
+
+Kullanım:
+    python -m benchmarks.sqlite_writes --workers 4 --iterations 25 --think 200
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import datetime
+import multiprocessing
+import numpy as np
+from sqlalchemy.exc import OperationalError
+
+# Profil başına yapılandırma ve yazma sırası
+PROFILES = {
+    'varsayilan': {
+        'config': {
+            'SQLITE_JOURNAL_MODE': 'DELETE',
+            'SQLITE_SYNCHRONOUS': 'FULL',
+            'SQLITE_BUSY_TIMEOUT': 5000,  # pysqlite varsayılanı
+            'SQLITE_MMAP_SIZE': 0,
+            'SQLITE_CACHE_SIZE': -2000,
+            'SQLITE_IMMEDIATE_WRITES': False
+        },
+        'write_first': True
+    },
+    'profil': {
+        'config': {},
+        'write_first': False
+    }
+}
+
+def make_app(database_path, workdir, overrides):
+    from app import create_app
+    config = {
+        'SECRET_KEY': 'benchmark',
+        'JWT_SECRET_KEY': 'benchmark',
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + database_path,
+        'STORAGE_FOLDER': os.path.join(workdir, 'storage'),
+        'DATABASE_POINTER_PATH': os.path.join(workdir, 'database.json'),
+        'METRICS_ENABLED': False,
+        'SLOW_QUERY_MS': 0
+    }
+    config.update(overrides)
+    return create_app(config)
+
+def take_attendance(course_id, lesson_number, think, write_first):
+    """Yoklama rotasının veritabanı adımlarını uygula ve kaydet"""
+    from app import db
+    from app.models.course import CourseStudent
+    from app.models.attendance import Attendance, AttendanceRecord
+    
+    student_ids = [row.student_id for row in CourseStudent.query.filter_by(course_id=course_id)]
+    attendance = Attendance(course_id=course_id, date=datetime.date.today(), lesson_number=lesson_number)
+    
+    if write_first:
+        db.session.add(attendance)
+        db.session.flush()
+        time.sleep(think)
+    else:
+        time.sleep(think)
+        db.session.add(attendance)
+        db.session.flush()
+    
+    db.session.add_all(
+        AttendanceRecord(attendance_id=attendance.id, student_id=student_id, status='PRESENT')
+        for student_id in student_ids
+    )
+    db.session.commit()
+
+def worker(args):
+    """Bir işçi sürecinde yoklamaları sırayla kaydet; gecikmeleri ve hataları döndür"""
+    database_path, workdir, profile, index, iterations, think, course_ids = args
+    app = make_app(database_path, workdir, PROFILES[profile]['config'])
+    
+    from app import db
+    latencies = []
+    errors = 0
+    with app.app_context():
+        for i in range(iterations):
+            course_id = course_ids[(index + i) % len(course_ids)]
+            started = time.perf_counter()
+            try:
+                take_attendance(course_id, index * iterations + i + 1, think, PROFILES[profile]['write_first'])
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+    return latencies, errors
+
+def run_profile(profile, args):
+    """Profili yeni bir veritabanında ölç"""
+    from app import db
+    from app.models.course import Course
+    from app.services.synthetic_data import SyntheticDataService
+    
+    workdir = tempfile.mkdtemp(prefix='bench-sqlite-')
+    database_path = os.path.join(workdir, 'benchmark.db')
+    try:
+        app = make_app(database_path, workdir, PROFILES[profile]['config'])
+        with app.app_context():
+            db.create_all()
+            SyntheticDataService.seed(
+                seed=args.seed, teachers=2, students=args.students_per_course * 2, courses=args.workers,
+                students_per_course=args.students_per_course, weeks=1, encodings=False, log=lambda message: None
+            )
+            course_ids = [course.id for course in Course.query.order_by(Course.id)]
+            db.engine.dispose()
+        
+        tasks = [
+            (database_path, workdir, profile, index, args.iterations, args.think / 1000, course_ids)
+            for index in range(args.workers)
+        ]
+        started = time.perf_counter()
+        with multiprocessing.get_context('spawn').Pool(args.workers) as pool:
+            results = pool.map(worker, tasks)
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+    errors = sum(worker_errors for _, worker_errors in results)
+    return {
+        'committed': len(latencies),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'throughput_per_second': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 1) if latencies else None,
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 1) if latencies else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite eşzamanlı yoklama yazma testi")
+    parser.add_argument('--workers', type=int, default=4, help="Eşzamanlı süreç sayısı")
+    parser.add_argument('--iterations', type=int, default=25, help="Süreç başına yoklama sayısı")
+    parser.add_argument('--think', type=float, default=200, help="Yoklama başına yüz tanıma süresi (ms)")
+    parser.add_argument('--students-per-course', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', choices=sorted(PROFILES), help="Yalnızca bu profili ölç")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+    
+    results = {}
+    print(f"{'profil':<12}{'kayıt':>7}{'hata':>6}{'süre s':>9}{'kayıt/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for profile in PROFILES:
+        if args.only and profile != args.only:
+            continue
+        result = run_profile(profile, args)
+        results[profile] = result
+        print(f"{profile:<12}{result['committed']:>7}{result['errors']:>6}{result['seconds']:>9.2f}"
+              f"{result['throughput_per_second']:>9.2f}{result['p50_ms'] or 0:>9.1f}{result['p95_ms'] or 0:>9.1f}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'workers': args.workers,
+                    'iterations': args.iterations,
+                    'think_ms': args.think,
+                    'students_per_course': args.students_per_course
+                },
+                'results': results
+            }, f, indent=2, ensure_ascii=False)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Uygulama başlangıç süresini ve içe aktarılan ağır modülleri ölç
+
+create_app() her denemede yeni bir Python sürecinde çalıştırılır (flask db upgrade,
+create_tables.py ve gunicorn işçilerinin ödediği maliyet). Yüz tanıma yığını
+(face_recognition, dlib) başlangıçta yüklenmiş ya da medyan süre bütçeyi aşmışsa
+çıkış kodu 1 olur; CI'da başlangıç süresinin gerilemesini yakalamak için kullanılır.
+
+Kullanım:
+    python -m benchmarks.startup --budget 1.5
+    python -m benchmarks.startup --warm-up
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import numpy as np
+
+# Başlangıçta yüklenmemesi gereken modüller
+FORBIDDEN_MODULES = ('face_recognition', 'dlib', 'face_recognition_models')
+
+# Alt süreçte çalışan ölçüm kodu
+PROBE = """
+import sys, json, time
+started = time.perf_counter()
+from app import create_app
+app = create_app()
+elapsed = time.perf_counter() - started
+warm_up = None
+if {warm_up}:
+    from app.services.face_engine import FaceEngine
+    warm_up = FaceEngine.warm_up()
+print(json.dumps({{'seconds': elapsed, 'warm_up': warm_up, 'modules': sorted(sys.modules)}}))
+"""
+
+def run_probe(warm_up=False, importtime=False):
+    """
+    create_app() süresini yeni bir süreçte ölç
+    
+    Returns:
+        tuple: (ölçüm sözlüğü, -X importtime çıktısı veya None)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', PROBE.format(warm_up=warm_up)]
+    
+    result = subprocess.run(command, capture_output=True, text=True, check=True, cwd=os.getcwd())
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr if importtime else None
+
+def slowest_imports(importtime_output, count):
+    """
+    -X importtime çıktısından toplam süresi en uzun üst düzey paketleri seç
+    
+    Returns:
+        list: (paket, ms) çiftleri
+    """
+    totals = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith(' ' * 2):
+            continue  # Yalnızca üst düzey içe aktarmalar
+        totals[name.strip()] = int(cumulative) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Uygulama başlangıç süresi testi")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=2.0, help="İzin verilen en uzun medyan create_app süresi (saniye)")
+    parser.add_argument('--top', type=int, default=10, help="Listelenecek en yavaş içe aktarma sayısı")
+    parser.add_argument('--warm-up', action='store_true', help="Model ısıtma süresini de ölç")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+    
+    timings = []
+    for _ in range(args.runs):
+        measurement, _ = run_probe()
+        timings.append(measurement['seconds'])
+    
+    loaded = [name for name in FORBIDDEN_MODULES if name in measurement['modules']]
+    median = float(np.median(timings))
+    print(f"create_app: medyan {median:.3f} s, en iyi {min(timings):.3f} s ({args.runs} deneme, bütçe {args.budget:.2f} s)")
+    
+    _, importtime = run_probe(importtime=True)
+    print(f"{'paket':<32}{'ms':>10}")
+    for name, ms in slowest_imports(importtime, args.top):
+        print(f"{name:<32}{ms:>10.1f}")
+    
+    warm_up = None
+    if args.warm_up:
+        warm_up = run_probe(warm_up=True)[0]['warm_up']
+        print(f"Model ısıtma: {warm_up:.3f} s")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'runs': timings,
+                'median_seconds': round(median, 4),
+                'budget_seconds': args.budget,
+                'warm_up_seconds': warm_up,
+                'forbidden_loaded': loaded
+            }, f, indent=2, ensure_ascii=False)
+    
+    failed = False
+    if loaded:
+        print(f"HATA başlangıçta yüklenen ağır modüller: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget:
+        print(f"HATA başlangıç süresi bütçeyi aştı: {median:.3f} s > {args.budget:.2f} s")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("Başlangıç bütçe içinde.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Karolu paralel yüz tespitinin çekirdek sayısına göre ölçeklenmesini ölç
+
+Kullanım:
+    python -m benchmarks.tiled_detection sinif.jpg --max-workers 8
+"""
+import os
+import time
+import argparse
+from app.services.face_engine import FaceEngine
+from app.services.tiled_detection import detect_faces_tiled, shutdown_executors
+
+def measure(fn, repeat):
+    """En iyi süreyi ve son sonucu döndür"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Karolu yüz tespiti ölçeklenme testi")
+    parser.add_argument('photo', help="Büyük grup fotoğrafı")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--tile-size', type=int, default=1024)
+    parser.add_argument('--overlap', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    image = FaceEngine.load_image_file(args.photo)
+    height, width = image.shape[:2]
+    print(f"Görüntü: {width}x{height} ({width * height / 1e6:.1f} MP)")
+    
+    # Referans: tüm görüntü tek çekirdekte
+    baseline, faces = measure(lambda: FaceEngine.face_locations(image), args.repeat)
+    print(f"{'mod':<10}{'işçi':>6}{'süre (s)':>12}{'hızlanma':>12}{'yüz':>8}")
+    print(f"{'full':<10}{1:>6}{baseline:>12.3f}{1.0:>12.2f}{len(faces):>8}")
+    
+    workers = 1
+    while workers <= args.max_workers:
+        # Süreç havuzu başlatma maliyeti ölçüme girmesin diye bir kez ısıt
+        detect_faces_tiled(image, args.tile_size, args.overlap, workers=workers)
+        elapsed, faces = measure(
+            lambda: detect_faces_tiled(image, args.tile_size, args.overlap, workers=workers),
+            args.repeat
+        )
+        print(f"{'tiled':<10}{workers:>6}{elapsed:>12.3f}{baseline / elapsed:>12.2f}{len(faces):>8}")
+        workers *= 2
+    
+    shutdown_executors()
+
+if __name__ == '__main__':
+    main()
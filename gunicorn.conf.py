@@ -0,0 +1,77 @@
+# Gunicorn yapılandırması: gunicorn -c gunicorn.conf.py run:app
+#
+# İşçi/iş parçacığı sayıları CPU ve bellekten hesaplanır (bkz. app/utils/runtime.py);
+# uygulama ana süreçte yüklenip modeller ısıtılır, işçiler fork ile belleği paylaşır.
+import os
+import gc
+import glob
+import tempfile
+from app.utils.runtime import compute_budget, apply_thread_limits
+
+budget = compute_budget()
+
+# BLAS/OpenMP sınırları numpy ve dlib yüklenmeden (preload'dan önce) ayarlanmalı
+apply_thread_limits(budget['blas_threads'])
+# Karolu tespit havuzu işçinin çekirdek payıyla sınırlı (işçi sayısı havuza göre hesaplanır)
+os.environ.setdefault('TILED_DETECTION_WORKERS', str(budget['tiled_workers']))
+
+# Üretim yapılandırması (bağlantı havuzu boyutları işçi başına iş parçacığı sayısından)
+os.environ.setdefault('FLASK_CONFIG', 'production')
+os.environ.setdefault('GUNICORN_THREADS', str(budget['threads']))
+
+# Prometheus çok süreçli modu: metrik modülü içe aktarılmadan önce ayarlanır ve önceki
+# çalışmadan kalan dosyalar temizlenir
+prometheus_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'face_attendance_prometheus')
+)
+os.makedirs(prometheus_dir, exist_ok=True)
+for path in glob.glob(os.path.join(prometheus_dir, '*.db')):
+    os.unlink(path)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = budget['workers']
+threads = budget['threads']
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Büyük sınıf fotoğraflarında tanıma saniyeler sürebilir
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Bellek büyümesini sınırlamak için işçiler belirli sayıda istekten sonra yenilenir;
+# sapma, tüm işçilerin aynı anda yeniden başlamasını önler
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 500))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 50))
+
+# Uygulama ve modeller ana süreçte bir kez yüklenir (copy-on-write paylaşım)
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# İşçi kalp atışı dosyaları diske değil belleğe yazılır
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+
+def on_starting(server):
+    server.log.info(
+        "Çalışma bütçesi: %(cpus)s CPU, %(memory_mb)s MB, %(workers)s işçi x %(threads)s iş parçacığı, "
+        "BLAS %(blas_threads)s iş parçacığı, karo havuzu %(tiled_workers)s süreç", budget
+    )
+    if not preload_app:
+        return
+    
+    # Modeller fork'tan önce yüklenir; işçiler ilk istekte yükleme süresini ödemez
+    from app.services.face_engine import FaceEngine
+    try:
+        server.log.info("Yüz tanıma modelleri %.2f saniyede yüklendi", FaceEngine.warm_up())
+    except Exception as e:
+        server.log.warning("Yüz tanıma modelleri ısıtılamadı: %s", e)
+    
+    # Ana süreçteki nesneler çöp toplayıcının dışında tutulur; böylece işçilerde
+    # referans sayımı sırasında paylaşılan sayfalar kopyalanmaz
+    gc.freeze()
+
+def child_exit(server, worker):
+    # Sonlanan işçinin canlı gösterge (livesum) değerleri metriklerden çıkarılır
+    from app.services.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
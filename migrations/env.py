@@ -11,17 +11,17 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-fileConfig(config.config_file_name)
+# (Skipped when called from the running app, e.g. a restore, which passes
+# its own connection and has no ini file.)
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
 logger = logging.getLogger('alembic.env')
 
 
 def get_engine():
-    try:
-        # this works with Flask-SQLAlchemy<3 and Alchemical
-        return current_app.extensions['migrate'].db.get_engine()
-    except TypeError:
-        # this works with Flask-SQLAlchemy>=3
-        return current_app.extensions['migrate'].db.engine
+    # Engine of the active database (switched after a restore)
+    from app.services.database_switch import DatabaseSwitch
+    return DatabaseSwitch.engine()
 
 
 def get_engine_url():
@@ -90,9 +90,7 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
-    connectable = get_engine()
-
-    with connectable.connect() as connection:
+    def run(connection):
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -103,6 +101,16 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+    # A connection passed through Config.attributes (e.g. a staged restore)
+    # is migrated instead of the app's database
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        run(connection)
+        return
+
+    with get_engine().connect() as connection:
+        run(connection)
+
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,81 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Tüm yolları geçici klasörde tutan test uygulaması"""
+    monkeypatch.setenv('FLASK_CONFIG', 'testing')
+    upload_folder = tmp_path / 'faces'
+    upload_folder.mkdir()
+    
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'live.db'}",
+        'UPLOAD_FOLDER': str(upload_folder),
+        'DATABASE_POINTER_PATH': str(tmp_path / 'database.json'),
+        'RESTORED_FACES_FOLDER': str(tmp_path / 'restored_faces'),
+        'STORAGE_FOLDER': str(tmp_path / 'storage'),
+        'ANALYSIS_CACHE_FOLDER': str(tmp_path / 'analysis_cache'),
+        'IDEMPOTENCY_FOLDER': str(tmp_path / 'idempotency'),
+        'GALLERY_SNAPSHOT_PATH': str(tmp_path / 'gallery.bin'),
+        'PROFILE_FOLDER': str(tmp_path / 'profiles'),
+        'METRICS_ENABLED': False
+    })
+    
+    with app.app_context():
+        db.create_all()
+    
+    yield app
+    
+    with app.app_context():
+        db.session.remove()
+        from app.services.database_switch import DatabaseSwitch
+        DatabaseSwitch.engine().dispose()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def make_user(app):
+    """Kullanıcı oluşturup (user, Authorization başlığı) döndüren yardımcı"""
+    def make_user(email, role='admin', first_name='Test', last_name='Kullanıcı'):
+        with app.app_context():
+            user = User(email=email, password='password', first_name=first_name, last_name=last_name, role=role)
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(identity=user.id)
+            return user.id, {'Authorization': f'Bearer {token}'}
+    return make_user
+
+@pytest.fixture
+def course(app, make_user):
+    """Öğretmeni ve kayıtlı iki öğrencisi olan ders"""
+    from app.models.teacher import Teacher
+    from app.models.student import Student
+    from app.models.course import Course, CourseStudent
+    
+    teacher_user_id, teacher_headers = make_user('teacher@example.com', role='teacher')
+    student_user_ids = [make_user(f'student{i}@example.com', role='student')[0] for i in range(2)]
+    
+    with app.app_context():
+        teacher = Teacher(user_id=teacher_user_id, department='Bilgisayar')
+        db.session.add(teacher)
+        db.session.flush()
+        
+        course = Course(code='BLM101', name='Programlama', semester='2024-GÜZ', teacher_id=teacher.id)
+        db.session.add(course)
+        db.session.flush()
+        
+        student_ids = []
+        for i, user_id in enumerate(student_user_ids):
+            student = Student(user_id=user_id, student_number=f'2024{i:04d}', department='Bilgisayar')
+            db.session.add(student)
+            db.session.flush()
+            db.session.add(CourseStudent(course_id=course.id, student_id=student.id))
+            student_ids.append(student.id)
+        
+        db.session.commit()
+        return {'id': course.id, 'teacher_id': teacher.id, 'student_ids': student_ids, 'headers': teacher_headers}
@@ -0,0 +1,49 @@
+import datetime
+from types import SimpleNamespace
+from app import db
+from app.models.attendance import AttendanceRecord
+from app.utils.bulk import _copy_rows, _copy_value, bulk_insert
+
+class FakeCursor:
+    """copy_expert'e verilen komutu ve CSV gövdesini saklayan psycopg2 imleci yerine geçen nesne"""
+    
+    def __init__(self):
+        self.statement = None
+        self.body = None
+    
+    def copy_expert(self, statement, buffer):
+        self.statement = statement
+        self.body = buffer.read()
+    
+    def close(self):
+        pass
+
+def test_copy_value_keeps_empty_string_distinct_from_null():
+    # PostgreSQL CSV COPY: tırnaksız boş alan NULL, tırnaklı boş alan boş metindir
+    assert _copy_value(None) == ''
+    assert _copy_value('') == '""'
+    assert _copy_value('a "b", c') == '"a ""b"", c"'
+    assert _copy_value(b'\x00\xff') == '"\\x00ff"'
+    assert _copy_value(True) == '"t"'
+    assert _copy_value(datetime.date(2024, 9, 30)) == '"2024-09-30"'
+
+def test_copy_rows_writes_one_csv_line_per_row():
+    cursor = FakeCursor()
+    connection = SimpleNamespace(connection=SimpleNamespace(driver_connection=SimpleNamespace(cursor=lambda: cursor)))
+    
+    _copy_rows(connection, AttendanceRecord.__table__, ['attendance_id', 'student_id', 'note'], [(1, 2, None), (1, 3, ''), (1, 4, 'satır\nsonu')])
+    
+    assert cursor.statement == 'COPY "attendance_records" ("attendance_id", "student_id", "note") FROM STDIN WITH (FORMAT csv)'
+    assert cursor.body == '"1","2",\n"1","3",""\n"1","4","satır\nsonu"\n'
+
+def test_executemany_path_keeps_empty_string(app):
+    now = datetime.datetime.utcnow()
+    columns = ['attendance_id', 'student_id', 'status', 'emotion', 'note', 'created_at', 'updated_at']
+    rows = [(1, 1, 'PRESENT', None, None, now, now), (1, 2, 'ABSENT', None, '', now, now)]
+    
+    with app.app_context():
+        with db.engine.begin() as connection:
+            assert bulk_insert(connection, AttendanceRecord.__table__, columns, rows) == 2
+        
+        notes = dict(db.session.query(AttendanceRecord.student_id, AttendanceRecord.note))
+    assert notes == {1: None, 2: ''}
@@ -0,0 +1,101 @@
+import os
+from sqlalchemy import text
+from app import db
+from app.models.user import User
+from app.services.backup_service import BackupService
+from app.services.database_switch import DatabaseSwitch
+
+def backup_and_restore(client, headers):
+    response = client.post('/api/admin/backup-database', headers=headers)
+    assert response.status_code == 200
+    name = response.get_json()['backup_file']
+    
+    response = client.post('/api/admin/restore-database', headers=headers, json={'backup_file': name})
+    assert response.status_code == 200, response.get_json()
+    return name
+
+def stamp_previous_revision(app):
+    """Canlı veritabanını duygu durumu sütunundan önceki migration sürümüne getir"""
+    with app.app_context():
+        db.session.execute(text('DROP INDEX ix_attendances_emotion_status'))
+        db.session.execute(text('ALTER TABLE attendances DROP COLUMN emotion_status'))
+        db.session.execute(text('CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)'))
+        db.session.execute(text("INSERT INTO alembic_version VALUES ('e5f68fe23b12')"))
+        db.session.commit()
+
+def test_restore_migrates_and_switches_every_worker(app, client, make_user):
+    stamp_previous_revision(app)
+    _, headers = make_user('admin@example.com', first_name='Önce')
+    other_worker = app.test_client()
+    
+    response = client.post('/api/admin/backup-database', headers=headers)
+    name = response.get_json()['backup_file']
+    with app.app_context():
+        User.query.first().first_name = 'Sonra'
+        db.session.commit()
+        live_database = db.engine.url.database
+    
+    response = client.post('/api/admin/restore-database', headers=headers, json={'backup_file': name})
+    assert response.status_code == 200, response.get_json()
+    
+    with app.app_context():
+        engine = DatabaseSwitch.engine()
+        assert engine.url.database != live_database
+        assert User.query.first().first_name == 'Önce'
+        # Geri yüklenen veritabanı alembic ile son sürüme taşınır
+        with engine.connect() as connection:
+            assert connection.execute(text('SELECT version_num FROM alembic_version')).scalar() != 'e5f68fe23b12'
+            columns = [row[1] for row in connection.execute(text('PRAGMA table_info(attendances)'))]
+        assert 'emotion_status' in columns
+    
+    # İşaretçi dosyası diğer işçilerin de yeni veritabanına geçmesini sağlar
+    pointer = DatabaseSwitch.read_pointer(app.config['DATABASE_POINTER_PATH'])
+    assert pointer['snapshot'] == name
+    assert other_worker.get('/api/auth/me', headers=headers).get_json()['first_name'] == 'Önce'
+
+def test_reset_after_restore_clears_active_database(app, client, make_user):
+    _, headers = make_user('admin@example.com')
+    backup_and_restore(client, headers)
+    
+    response = client.post('/api/admin/reset-database', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    
+    with app.app_context():
+        assert User.query.count() == 0
+        with DatabaseSwitch.engine().connect() as connection:
+            assert connection.execute(text('SELECT COUNT(*) FROM users')).scalar() == 0
+
+def test_restore_stages_legacy_faces_with_pointer(app, client, make_user):
+    _, headers = make_user('admin@example.com')
+    upload_folder = app.config['UPLOAD_FOLDER']
+    with open(os.path.join(upload_folder, 'eski.jpg'), 'wb') as f:
+        f.write(b'yedekteki')
+    
+    name = backup_and_restore(client, headers)
+    
+    # Canlı klasöre yazılmaz; yedekteki fotoğraflar ayrı klasörde işaretçiyle etkinleşir
+    with open(os.path.join(upload_folder, 'eski.jpg'), 'wb') as f:
+        f.write(b'sonradan')
+    pointer = DatabaseSwitch.read_pointer(app.config['DATABASE_POINTER_PATH'])
+    assert os.path.dirname(pointer['faces']) == app.config['RESTORED_FACES_FOLDER']
+    assert os.path.basename(pointer['faces']).startswith(name)
+    assert not [n for n in os.listdir(app.config['RESTORED_FACES_FOLDER']) if n.endswith('.tmp')]
+    
+    response = app.test_client().get('/static/faces/eski.jpg')
+    assert response.status_code == 200
+    assert response.get_data() == b'yedekteki'
+
+def test_failed_restore_removes_staged_faces(app, client, make_user, monkeypatch):
+    _, headers = make_user('admin@example.com')
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'eski.jpg'), 'wb') as f:
+        f.write(b'yedekteki')
+    name = client.post('/api/admin/backup-database', headers=headers).get_json()['backup_file']
+    
+    def fail(url):
+        raise RuntimeError("şema doğrulanamadı")
+    monkeypatch.setattr(BackupService, 'migrate_staged', staticmethod(fail))
+    
+    response = client.post('/api/admin/restore-database', headers=headers, json={'backup_file': name})
+    assert response.status_code == 500
+    assert os.listdir(app.config['RESTORED_FACES_FOLDER']) == []
+    assert DatabaseSwitch.read_pointer(app.config['DATABASE_POINTER_PATH']) is None
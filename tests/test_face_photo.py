@@ -0,0 +1,50 @@
+import io
+import numpy as np
+import pytest
+from PIL import Image
+from app.services.face_engine import FaceEngine
+from app.services.face_recognition_service import FaceRecognitionService
+from app.services.photo_upload import UploadedPhoto
+
+def make_photo(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (200, 150), color).save(buffer, 'JPEG')
+    return UploadedPhoto(buffer.getvalue(), filename='yuz.jpg')
+
+@pytest.fixture
+def engine(monkeypatch):
+    """FaceEngine'i verilen kutuları döndüren, çağrıları sayan sahte motorla değiştir"""
+    calls = {'locations': 0, 'encodings': 0, 'boxes': []}
+    
+    def face_locations(image, number_of_times_to_upsample=1, model='hog'):
+        calls['locations'] += 1
+        return list(calls['boxes'])
+    
+    def face_encodings(image, known_face_locations=None, num_jitters=1):
+        calls['encodings'] += 1
+        return [np.full(128, 0.5)]
+    
+    monkeypatch.setattr(FaceEngine, 'face_locations', staticmethod(face_locations))
+    monkeypatch.setattr(FaceEngine, 'face_encodings', staticmethod(face_encodings))
+    return calls
+
+def test_multi_face_photo_is_rejected_without_encoding(app, engine):
+    engine['boxes'] = [(10, 60, 60, 10), (10, 160, 60, 110)]
+    
+    with app.test_request_context():
+        success, message = FaceRecognitionService.save_face_photo(make_photo((10, 20, 30)))
+    
+    assert not success
+    assert "birden fazla yüz" in message
+    assert engine['encodings'] == 0
+
+def test_single_face_is_detected_once_and_encoded_once(app, engine):
+    engine['boxes'] = [(10, 60, 60, 10)]
+    
+    with app.test_request_context():
+        success, (photo_url, face_encoding) = FaceRecognitionService.save_face_photo(make_photo((40, 50, 60)))
+    
+    assert success
+    assert face_encoding.shape == (128,)
+    assert engine['locations'] == 1
+    assert engine['encodings'] == 1
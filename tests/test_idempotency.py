@@ -0,0 +1,108 @@
+import io
+import os
+import time
+import pytest
+from app import db
+from app.models.attendance import Attendance
+from app.models.teacher import Teacher
+from app.services.admission import Overloaded
+from app.services.emotion_recognition_service import EmotionRecognitionService
+from app.services.face_recognition_service import FaceRecognitionService
+from app.services.idempotency_service import IdempotencyService
+from app.services.photo_upload import UploadedPhoto
+
+@pytest.fixture
+def recognition(app, course, monkeypatch):
+    """Yüz tanımayı sayaçlı sahte sonuçla değiştir"""
+    calls = []
+    
+    def recognize_faces(photo, students, detection_mode='auto'):
+        calls.append(photo.digest)
+        return True, ([course['student_ids'][0]], [])
+    
+    monkeypatch.setattr(FaceRecognitionService, 'recognize_faces', staticmethod(recognize_faces))
+    monkeypatch.setattr(FaceRecognitionService, 'save_attendance_photo', staticmethod(lambda photo: (False, None)))
+    monkeypatch.setattr(EmotionRecognitionService, 'analyze_emotions', staticmethod(lambda photo, detection_mode='auto': (False, None)))
+    app.config['EMOTION_ANALYSIS_MODE'] = 'inline'
+    return calls
+
+def take_attendance(client, course, key, photo=b'sinif-fotografi'):
+    return client.post(
+        f"/api/attendance/course/{course['id']}",
+        headers=dict(course['headers'], **{'Idempotency-Key': key}),
+        data={'photo': (io.BytesIO(photo), 'sinif.jpg')},
+        content_type='multipart/form-data'
+    )
+
+def scope(app, course):
+    with app.app_context():
+        user_id = db.session.get(Teacher, course['teacher_id']).user_id
+    return f"{user_id}:take_attendance:{course['id']}"
+
+def test_retry_returns_stored_response(app, client, course, recognition):
+    first = take_attendance(client, course, 'anahtar-1')
+    second = take_attendance(client, course, 'anahtar-1')
+    
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.get_json() == first.get_json()
+    assert len(recognition) == 1
+    with app.app_context():
+        assert Attendance.query.count() == 1
+
+def test_retry_is_answered_before_admission(app, client, course, recognition, monkeypatch):
+    first = take_attendance(client, course, 'anahtar-1')
+    
+    # Yüz tanıma kapasitesi dolu olsa da saklanan yanıt döner
+    def acquire(timeout):
+        raise Overloaded('queue_full')
+    monkeypatch.setattr(app.extensions['admission'], 'acquire', acquire)
+    
+    second = take_attendance(client, course, 'anahtar-1')
+    assert second.status_code == 201
+    assert second.get_json() == first.get_json()
+
+def test_concurrent_retry_gets_conflict(app, client, course, recognition):
+    photo = b'sinif-fotografi'
+    with app.test_request_context():
+        assert IdempotencyService.claim(scope(app, course), 'anahtar-1', UploadedPhoto(photo).digest)
+    
+    response = take_attendance(client, course, 'anahtar-1', photo)
+    assert response.status_code == 409
+    assert recognition == []
+    with app.app_context():
+        assert Attendance.query.count() == 0
+
+def test_key_reused_with_different_photo(client, course, recognition):
+    assert take_attendance(client, course, 'anahtar-1', b'birinci').status_code == 201
+    assert take_attendance(client, course, 'anahtar-1', b'ikinci').status_code == 422
+
+def test_failed_request_releases_key(app, client, course, recognition, monkeypatch):
+    def acquire(timeout):
+        raise Overloaded('queue_full')
+    monkeypatch.setattr(app.extensions['admission'], 'acquire', acquire)
+    assert take_attendance(client, course, 'anahtar-1').status_code == 503
+    
+    monkeypatch.undo()
+    assert os.listdir(app.config['IDEMPOTENCY_FOLDER']) == []
+
+def test_expired_entry_is_deleted(app):
+    with app.test_request_context():
+        IdempotencyService.save_response('kapsam', 'anahtar', 'ozet', {'ok': True}, 201)
+        path = IdempotencyService._path('kapsam', 'anahtar')
+        app.config['IDEMPOTENCY_TTL'] = -1
+        
+        assert IdempotencyService.get_response('kapsam', 'anahtar', 'ozet') == (False, None)
+        assert not os.path.exists(path)
+
+def test_prune_removes_expired_entries(app):
+    with app.test_request_context():
+        IdempotencyService.save_response('kapsam', 'eski', 'ozet', {'ok': True}, 201)
+        IdempotencyService.save_response('kapsam', 'yeni', 'ozet', {'ok': True}, 201)
+        old_path = IdempotencyService._path('kapsam', 'eski')
+        expired = time.time() - app.config['IDEMPOTENCY_TTL'] - 1
+        os.utime(old_path, (expired, expired))
+        
+        assert IdempotencyService.prune() == 1
+        assert not os.path.exists(old_path)
+        assert os.path.exists(IdempotencyService._path('kapsam', 'yeni'))
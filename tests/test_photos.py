@@ -0,0 +1,40 @@
+import io
+import hashlib
+import pytest
+from PIL import Image
+from app.services.photo_store import PhotoStore
+from app.services.storage import get_storage
+
+@pytest.fixture
+def digest(app):
+    """Depoya yazılmış küçük bir JPEG fotoğrafın özeti"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), (200, 120, 40)).save(buffer, 'JPEG')
+    data = buffer.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+    
+    with app.app_context():
+        PhotoStore.store(get_storage(), digest, data)
+    return digest
+
+@pytest.mark.parametrize('accept, mimetype', [
+    ('image/webp,image/*,*/*;q=0.8', 'image/webp'),
+    ('*/*', 'image/jpeg'),
+    ('image/*', 'image/jpeg'),
+    ('image/webp;q=0, */*', 'image/jpeg'),
+    (None, 'image/jpeg'),
+])
+def test_webp_only_when_explicitly_accepted(client, digest, accept, mimetype):
+    headers = {'Accept': accept} if accept else {}
+    response = client.get(f'/api/photos/{digest}/thumb', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    assert 'Accept' in response.vary
+
+def test_original_does_not_vary_on_accept(client, digest):
+    response = client.get(f'/api/photos/{digest}/original')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'image/jpeg'
+    assert 'Accept' not in response.vary
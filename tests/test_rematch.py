@@ -0,0 +1,49 @@
+import datetime
+import pytest
+from app import db
+from app.models.attendance import Attendance
+from app.models.teacher import Teacher
+from app.services.face_recognition_service import FaceRecognitionService
+
+@pytest.fixture
+def attendance_id(app, course, monkeypatch):
+    with app.app_context():
+        attendance = Attendance(course_id=course['id'], date=datetime.date.today(), lesson_number=1)
+        db.session.add(attendance)
+        db.session.commit()
+        attendance_id = attendance.id
+    
+    # Eşleştirme sonucu: derse kayıtlı ilk öğrenci tanınır
+    monkeypatch.setattr(
+        FaceRecognitionService, 'rematch_attendance',
+        staticmethod(lambda attendance, students: (True, (set(), {course['student_ids'][0]})))
+    )
+    return attendance_id
+
+def rematch(client, attendance_id, headers):
+    return client.post(f'/api/attendance/{attendance_id}/rematch', headers=headers)
+
+def test_course_teacher_can_rematch(client, course, attendance_id):
+    response = rematch(client, attendance_id, course['headers'])
+    
+    assert response.status_code == 200
+    statuses = {record['student_id']: record['status'] for record in response.get_json()['attendance']['records']}
+    assert statuses == {course['student_ids'][0]: 'PRESENT', course['student_ids'][1]: 'ABSENT'}
+
+def test_admin_can_rematch(client, make_user, attendance_id):
+    _, headers = make_user('admin@example.com', role='admin')
+    
+    assert rematch(client, attendance_id, headers).status_code == 200
+
+def test_other_teacher_cannot_rematch(app, client, make_user, attendance_id):
+    user_id, headers = make_user('other@example.com', role='teacher')
+    with app.app_context():
+        db.session.add(Teacher(user_id=user_id, department='Matematik'))
+        db.session.commit()
+    
+    assert rematch(client, attendance_id, headers).status_code == 403
+
+def test_student_cannot_rematch(client, make_user, attendance_id):
+    _, headers = make_user('ogrenci@example.com', role='student')
+    
+    assert rematch(client, attendance_id, headers).status_code == 403
@@ -0,0 +1,35 @@
+import json
+import logging
+from sqlalchemy import text
+from app import db
+from app.services.request_timing import describe_parameters, redact_parameters
+
+SECRET = 'pbkdf2:sha256:1000$' + 'a' * 64
+
+def slow_query_records(app, caplog, **config):
+    # Her sorgu yavaş sayılır
+    app.config.update(SLOW_QUERY_MS=1e-6, **config)
+    with app.app_context(), caplog.at_level(logging.WARNING, logger='app.slow_query'):
+        db.session.execute(text('SELECT :secret, :short'), {'secret': SECRET, 'short': 'kısa'})
+    return [json.loads(record.getMessage()) for record in caplog.records if record.name == 'app.slow_query']
+
+def test_slow_query_log_omits_parameter_values(app, caplog):
+    records = slow_query_records(app, caplog)
+    
+    assert records
+    assert SECRET not in json.dumps(records)
+    assert 'param_values' not in records[-1]
+    assert records[-1]['params'] == {'count': 2, 'types': ['str', 'str']}
+
+def test_opt_in_parameter_values_are_masked(app, caplog):
+    records = slow_query_records(app, caplog, SLOW_QUERY_LOG_PARAMS=True)
+    
+    assert SECRET not in json.dumps(records)
+    assert f"<str:{len(SECRET)}>" in records[-1]['param_values']
+    assert 'kısa' in records[-1]['param_values']
+
+def test_executemany_parameters():
+    rows = [(1, b'\x00' * 1024), (2, b'\x01' * 1024)]
+    
+    assert describe_parameters(rows) == {'count': 2, 'types': ['int', 'bytes']}
+    assert redact_parameters(rows) == repr([(1, '<bytes:1024>'), (2, '<bytes:1024>')])
@@ -0,0 +1,26 @@
+from app.utils.runtime import compute_budget
+
+def test_tile_pool_stays_within_worker_share():
+    budget = compute_budget(cpus=8, memory_mb=16000, environ={})
+    
+    assert budget['tiled_workers'] > 1
+    assert budget['workers'] * budget['tiled_workers'] <= budget['cpus']
+
+def test_tile_pool_memory_reduces_workers():
+    environ = {'WORKER_MEMORY_MB': '400', 'TILE_PROCESS_MEMORY_MB': '300', 'TILED_DETECTION_WORKERS': '2'}
+    budget = compute_budget(cpus=8, memory_mb=4000, environ=environ)
+    
+    # (400 + 2 * 300) MB işçi başına; ana süreç için bir işçilik pay bırakılır
+    assert budget['workers'] == 3
+    assert budget['tiled_workers'] == 2
+
+def test_serial_tiles_keep_one_worker_per_core():
+    budget = compute_budget(cpus=8, memory_mb=16000, environ={'TILED_DETECTION_WORKERS': '1'})
+    
+    assert budget['workers'] == 8
+    assert budget['tiled_workers'] == 1
+
+def test_web_concurrency_override_shrinks_tile_pool():
+    budget = compute_budget(cpus=8, memory_mb=16000, environ={'WEB_CONCURRENCY': '8'})
+    
+    assert budget['tiled_workers'] == 1
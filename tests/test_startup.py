@@ -0,0 +1,17 @@
+import os
+from benchmarks.startup import run_probe, FORBIDDEN_MODULES
+
+# benchmarks/startup.py ile aynı varsayılan bütçe; yavaş CI makinelerinde ortamdan artırılabilir
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET', 2.0))
+
+def test_create_app_skips_face_stack_and_fits_budget(tmp_path, monkeypatch):
+    # Alt süreç create_app() ile depo dışındaki geçici yolları kullanır
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    monkeypatch.setenv('FLASK_CONFIG', 'testing')
+    for name in ('DATABASE_POINTER_PATH', 'STORAGE_FOLDER', 'ANALYSIS_CACHE_FOLDER', 'IDEMPOTENCY_FOLDER', 'GALLERY_SNAPSHOT_PATH', 'PROFILE_FOLDER'):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+    
+    measurement, _ = run_probe()
+    
+    assert [name for name in FORBIDDEN_MODULES if name in measurement['modules']] == []
+    assert measurement['seconds'] < STARTUP_BUDGET
@@ -0,0 +1,16 @@
+from app.models.attendance import Attendance, AttendanceRecord
+from app.services.load_shedding import EmotionBackfill
+from app.services.synthetic_data import SyntheticDataService
+
+def test_seeded_attendances_have_emotion_status(app):
+    with app.app_context():
+        counts = SyntheticDataService.seed(
+            teachers=2, students=10, courses=2, students_per_course=5,
+            lessons_per_week=1, weeks=2, encodings=False, log=lambda message: None
+        )
+        
+        assert counts
+        assert Attendance.query.count() == 4
+        assert AttendanceRecord.query.count() == 20
+        assert {status for (status,) in Attendance.query.with_entities(Attendance.emotion_status)} == {'failed'}
+        assert EmotionBackfill.pending_ids() == []